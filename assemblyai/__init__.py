@@ -0,0 +1,26 @@
+from importlib import import_module
+from typing import Any
+
+# Top-level names and the module defining them. They are imported on first access, so `import assemblyai` stays cheap.
+_EXPORTS = {
+    "Client": "assemblyai.client",
+    "AsyncClient": "assemblyai.client",
+    "Transcript": "assemblyai.model",
+    "TranscriptStatus": "assemblyai.model",
+    "Upload": "assemblyai.model",
+    "StreamPayload": "assemblyai.model",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> Any:
+    return sorted(list(globals()) + __all__)
@@ -1,17 +1,35 @@
 """AssemblyAI API endpoints"""
 
-import codecs
-import json
-from typing import Any, Dict, Optional, List, TYPE_CHECKING
+import asyncio
+import itertools
+import os
+import queue
+import threading
+import time
+from dataclasses import replace
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, List, Tuple, TYPE_CHECKING, Union
 from datetime import date
 
 from httpx import Response
 
+from assemblyai import splitting, transfer
+from assemblyai.batch import AsyncBatchJob, BatchJob
+from assemblyai.bundle import BUNDLE_PARTS, TranscriptBundle, check_parts
+from assemblyai.columnar import WordArray
+from assemblyai.decoding import decode, decoder_for, loads
+from assemblyai.instrumentation import DecodeTimer
+from assemblyai.jsonstream import ObjectStream
+from assemblyai.lazy import decode_lazy
 from assemblyai.model import StreamPayload, Transcript, TranscriptStatus, Upload, Utterance, UtteredWord
+from assemblyai.poller import AsyncTranscriptPoller, TranscriptPoller
+from assemblyai.splitting import AudioSource, Segment
+from assemblyai.streaming import AudioFormat, aframe_pcm, encode_frame, frame_pcm, is_wav, read_wav
+from assemblyai.transfer import ProgressMeter, UploadProgress
 
 
 if TYPE_CHECKING:
-    from assemblyai.client import Client
+    from assemblyai.client import AsyncClient, Client
 
 
 class Endpoint:
@@ -20,201 +38,1147 @@ class Endpoint:
         self.parent = parent
 
 
-    def _read_binary_file(self, filename, chunk_size=5242880):
-        """Reads data from a binary file in chunks."""
+    def _read_binary_file(self, filename, chunk_size=5242880, hasher=None):
+        """Reads data from a binary file in chunks. Each chunk is fed to `hasher`, if given, as it is read."""
         with open(filename, 'rb') as _file:
             while True:
                 data = _file.read(chunk_size)
                 if not data:
                     break
+                if hasher is not None:
+                    hasher.update(data)
                 yield data
 
-class TranscriptEndpoint(Endpoint):
-    """ API Operations related to the model.Transcript object.
-    
+    async def _aread_binary_file(self, filename, chunk_size=5242880, hasher=None):
+        """Reads data from a binary file in chunks, without blocking the event loop. Each chunk is fed to `hasher`, if given."""
+        loop = asyncio.get_running_loop()
+        with open(filename, 'rb') as _file:
+            while True:
+                data = await loop.run_in_executor(None, _file.read, chunk_size)
+                if not data:
+                    break
+                if hasher is not None:
+                    hasher.update(data)
+                yield data
+
+
+class BaseTranscriptEndpoint(Endpoint):
+    """ Request building and response parsing shared by TranscriptEndpoint and AsyncTranscriptEndpoint.
+
         *[Endpoint reference](https://www.assemblyai.com/docs/reference#transcript)*
     """
     PREFIX="transcript"
 
+    def _create_request(self, transcript: Transcript) -> Dict[str, Any]:
+        """Builds the request arguments for create()."""
+        if not transcript.audio_url:
+            raise ValueError("audio_url is required to create a Transcript")
+
+        return {"operation": "", "method": "POST", "body": self._clean_body(transcript.to_dict(encode_json=True))}
+
+    def _all_request(self, limit: Optional[int] = None, status: Optional[TranscriptStatus] = None, created_on: Optional[date] = None, before_id: Optional[str]=None, after_id: Optional[str]=None, throttled_only: bool = False) -> Dict[str, Any]:
+        """Builds the request arguments for the first page of all(). Filters are sent as query parameters."""
+        return {"operation": "", "method": "GET", "query": self._clean_body({
+            "limit": limit,
+            "status": status.value if isinstance(status, TranscriptStatus) else status,
+            "created_on": created_on.isoformat() if created_on else None,
+            "before_id": before_id,
+            "after_id": after_id,
+            "throttled_only": "true" if throttled_only else None,
+        })}
+
+    def _handle_request(self, operation: str, method: str, query: Optional[Dict[Any, Any]] = None, body: Optional[Dict[Any, Any]] = None, stream: bool = False):
+        """Handles sending a request to the transcript endpoints.
+
+        Returns the parent client's response, which is awaitable for an AsyncClient. With `stream`, its body is not read.
+        """
+        if operation:
+            url = f"{BaseTranscriptEndpoint.PREFIX}/{operation}"
+        else:
+            url = BaseTranscriptEndpoint.PREFIX
+        return self.parent.request(url, method, body = body, query=query, headers={"content-type": 'application/json'}, stream=stream)
+
+    def _clean_body(self, body: Optional[Dict[Any, Any]]) -> Optional[Dict[Any, Any]]:
+        """Cleans a json body of pythonic values and unnecessary keys."""
+        if not body:
+            return body
+
+        # Remove key-value with null values
+        body_items = filter(lambda x: x[1] is not None, body.items())
+
+        return dict(body_items)
+
+    def _cache_get(self, operation: str) -> Optional[bytes]:
+        """Returns the cached response body of a GET operation, None if not cached or no cache is configured."""
+        if self.parent.cache is None:
+            return None
+        return self.parent.cache.get(f"{BaseTranscriptEndpoint.PREFIX}/{operation}")
+
+    def _cache_set(self, operation: str, content: bytes) -> None:
+        """Caches the response body of a GET operation. Only call this for completed transcripts."""
+        if self.parent.cache is not None:
+            self.parent.cache.set(f"{BaseTranscriptEndpoint.PREFIX}/{operation}", content)
+
+    def _cache_invalidate(self, transcript_id: str) -> None:
+        """Removes a transcript and its sentences and paragraphs from the cache."""
+        if self.parent.cache is not None:
+            for operation in (transcript_id, f"{transcript_id}/sentences", f"{transcript_id}/paragraphs"):
+                self.parent.cache.delete(f"{BaseTranscriptEndpoint.PREFIX}/{operation}")
+
+    def _flight_key(self, operation: str, *options: Any) -> Tuple[Any, ...]:
+        """Key of a GET operation for the client's SingleFlight. It includes the API key, so clients of different accounts sharing one SingleFlight never share results."""
+        return (self.parent.api_key, operation) + options
+
+    def _parse_transcript(self, content: bytes, compact_words: bool = False, lazy: bool = False) -> Transcript:
+        """Parses a single Transcript from a response body."""
+        with self.parent.instrumentation.decoding("Transcript", len(content)):
+            if lazy:
+                return decode_lazy(loads(content), compact_words)
+            return decode(Transcript, loads(content), compact_words)
+
+    def _parse_sentences(self, content: bytes) -> List[UtteredWord]:
+        """For a response body from sentences(), parse all sentences from this response."""
+        with self.parent.instrumentation.decoding("sentences", len(content)):
+            sentences = loads(content).get("sentences", [])
+            decode_word = decoder_for(UtteredWord)
+            return [decode_word(u) for u in sentences]
+
+    def _parse_paragraphs(self, content: bytes, compact_words: bool = False) -> List[Utterance]:
+        """For a response body from paragraphs(), parse all paragraphs from this response."""
+        with self.parent.instrumentation.decoding("paragraphs", len(content)):
+            paragraphs = loads(content).get("paragraphs", [])
+            decode_utterance = decoder_for(Utterance, compact_words)
+            return [decode_utterance(u) for u in paragraphs]
+
+    def _parse_all_page(self, response: Response) -> Tuple[List[Transcript], Optional[str]]:
+        """For a response from self.all(), parse the transcripts of this page and the url of the next page.
+
+        The body is decoded once. If the url is None, no more results are present.
+        """
+        with self.parent.instrumentation.decoding("page", len(response.content)):
+            page = loads(response.content)
+            decode_transcript = decoder_for(Transcript)
+            transcripts = [decode_transcript(t) for t in page.get("transcripts") or []]
+
+        page_details = page.get("page_details") or {}
+        next_url = page_details.get("next_url", None)
+        if next_url == page_details.get("current_url", None):
+            next_url = None
+        return transcripts, next_url
+
+    STREAMED_FIELDS = ("words", "utterances")
+    STREAM_CHUNK_SIZE = 65536
+
+    def _stream_decoders(self, fields: Iterable[str], compact_words: bool) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+        """Decoders of the elements of each field streamed by iter_get()."""
+        decoders = {"words": decoder_for(UtteredWord), "utterances": decoder_for(Utterance, compact_words)}
+        fields = tuple(fields)
+        if any(f not in decoders for f in fields):
+            raise ValueError(f"fields must be a selection of {self.STREAMED_FIELDS}, got {fields!r}")
+        return {f: decoders[f] for f in fields}
+
+    def _stream_cache(self, cached: Optional[bytes]) -> Optional[List[bytes]]:
+        """The list keeping the chunks of a streamed body to cache, None if it is cached already or no cache is configured."""
+        return [] if cached is None and self.parent.cache is not None else None
+
+    def _feed_stream(self, stream: ObjectStream, decoders: Dict[str, Callable[[Dict[str, Any]], Any]], chunk: bytes, timer: DecodeTimer, body: Optional[List[bytes]]) -> List[Tuple[str, Any]]:
+        """The (field, element) pairs completed by the next chunk of a streamed body."""
+        if body is not None:
+            body.append(chunk)
+        with timer:
+            timer.nbytes += len(chunk)
+            return [(key, decoders[key](value)) for key, value in stream.feed(chunk)]
+
+    def _finish_stream(self, transcript_id: str, stream: ObjectStream, decoders: Dict[str, Callable[[Dict[str, Any]], Any]], compact_words: bool, timer: DecodeTimer, body: Optional[List[bytes]]) -> List[Tuple[str, Any]]:
+        """The remaining (field, element) pairs of a streamed body, then ("transcript", Transcript). Caches a completed transcript."""
+        with timer:
+            pairs = [(key, decoders[key](value)) for key, value in stream.close()]
+            transcript = decode(Transcript, stream.fields, compact_words)
+        timer.finish()
+        if body is not None and transcript.status == TranscriptStatus.completed:
+            self._cache_set(transcript_id, b"".join(body))
+        pairs.append(("transcript", transcript))
+        return pairs
+
+    @staticmethod
+    def _with_streamed(transcript: Transcript, words: Any, utterances: Optional[List[Utterance]]) -> Transcript:
+        """The Transcript of get_streaming(), with the words and utterances it collected."""
+        if words is not None:
+            transcript.words = words
+        if utterances is not None:
+            transcript.utterances = utterances
+        return transcript
+
+    def _bundle_fetchers(self, parts: Iterable[str], compact_words: bool) -> List[Tuple[str, Callable[[str], Any]]]:
+        """The (part, fetch function) pairs for the requested bundle parts. Fetch functions are coroutines on the async endpoint."""
+        fetch: Dict[str, Callable[[str], Any]] = {
+            "transcript": lambda transcript_id: self.get(transcript_id, compact_words),  # type: ignore[attr-defined]
+            "sentences": self.sentences,  # type: ignore[attr-defined]
+            "paragraphs": lambda transcript_id: self.paragraphs(transcript_id, compact_words),  # type: ignore[attr-defined]
+        }
+        return [(part, fetch[part]) for part in check_parts(parts)]
+
+    @staticmethod
+    def _fill_bundle(bundle: TranscriptBundle, part: str, result: Any, error: Optional[BaseException]) -> None:
+        if error is None:
+            setattr(bundle, part, result)
+        elif bundle.error is None:
+            bundle.error = error
+
+    def _next_page_request(self, next_url: str):
+        """Requests the page at a `page_details.next_url`.
+
+        Returns the parent client's response, which is awaitable for an AsyncClient.
+        """
+        # Take only url suffix path
+        return self.parent.request(self.parent.path_from_full_url(next_url), "GET")
+
+
+class TranscriptEndpoint(BaseTranscriptEndpoint):
+    """ API Operations related to the model.Transcript object.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#transcript)*
+    """
+
     def create(self, transcript: Transcript) -> Transcript:
         """ Create a new Transcript object.
-        
+
         Results in AsssemblyAI running core transcription (and possibly audio intelligence) on the audio referenced.
         Note: Maximum file size for audio is 10 hours.
-        
+
         *[Reference](https://www.assemblyai.com/docs/reference#create-a-transcript)*
         """
-        
-        if not transcript.audio_url:
-            raise ValueError("audio_url is required to create a Transcript")
+        response = self._handle_request(**self._create_request(transcript))
+        return self._parse_transcript(response.content)
+
+    def create_many(self, transcripts: Iterable[Transcript], max_concurrency: int = 8) -> BatchJob:
+        """ Create many Transcript objects, with at most max_concurrency requests in flight.
+
+        Results are kept in input order. A failure to create one transcript is recorded on its BatchItem rather than aborting the batch.
+        Use BatchJob.wait() to block until every transcript is completed or errored.
+        """
+        return BatchJob.submit(self, transcripts, max_concurrency)
 
-        response = self._handle_request("", "POST", body=transcript.to_json())
-        return Transcript.from_dict(response.json())
+    def create_split(self, filename: str, transcript: Optional[Transcript] = None, audio_format: Optional[AudioFormat] = None, segment_ms: int = splitting.DEFAULT_SEGMENT_MS, overlap_ms: int = splitting.DEFAULT_OVERLAP_MS, max_concurrency: int = 4, timeout: Optional[float] = None) -> Transcript:
+        """ Transcribe a long local WAV or raw PCM file as overlapping segments in parallel, and merge their transcripts into one.
 
-    def get(self, transcript_id: str) -> Transcript:
+        Segments are uploaded and submitted with at most max_concurrency at once, then polled together. See
+        assemblyai.splitting for how the segment transcripts are merged.
+
+        Args:
+            transcript: options of every segment transcript, e.g. Transcript(speaker_labels=True). Its audio_url is ignored.
+            audio_format: the format of a raw PCM file. WAV files carry their own.
+            segment_ms: length of each segment.
+            overlap_ms: how much each segment overlaps the previous one. Should be longer than any word.
+
+        Throws:
+            ValueError: If a segment transcript errored.
+            TimeoutError: If segments are still pending after `timeout` seconds.
+        """
+        source = AudioSource.open(filename, audio_format)
+        segments = splitting.plan_segments(source, segment_ms, overlap_ms)
+        template = transcript or Transcript()
+
+        def submit(segment: Segment) -> Transcript:
+            upload = self.parent.upload.upload_bytes(splitting.segment_chunks(source, segment), read_ahead=2)
+            return self.create(replace(template, audio_url=upload.upload_url))
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            futures = [pool.submit(submit, segment) for segment in segments]
+            try:
+                created = [future.result() for future in futures]
+            finally:
+                for future in futures:
+                    future.cancel()
+        with TranscriptPoller(self, max_concurrency=max_concurrency) as poller:
+            parts = poller.wait([t.id for t in created], timeout=timeout)
+        return splitting.merge([parts[t.id] for t in created], segments)
+
+    def _coalesce(self, key: Tuple[Any, ...], fetch: Callable[[], Any]) -> Any:
+        """Runs a GET operation through the client's SingleFlight, if it has one, so identical concurrent calls share one request."""
+        flight = self.parent.single_flight
+        return fetch() if flight is None else flight.do(key, fetch)
+
+    def get(self, transcript_id: str, compact_words: bool = False, lazy: bool = False) -> Transcript:
         """ Retrieve a specific transcript
-        
+
+        Args:
+            compact_words: store `words` of the transcript and its utterances as a columnar.WordArray
+            lazy: return a lazy.LazyTranscript, which decodes words, utterances and audio intelligence results on first access
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
+        """
+        return self._coalesce(self._flight_key(transcript_id, compact_words, lazy), lambda: self._get(transcript_id, compact_words, lazy))
+
+    def _get(self, transcript_id: str, compact_words: bool, lazy: bool) -> Transcript:
+        cached = self._cache_get(transcript_id)
+        content = cached if cached is not None else self._handle_request(transcript_id, "GET").content
+        transcript = self._parse_transcript(content, compact_words, lazy)
+        if cached is None and transcript.status == TranscriptStatus.completed:
+            self._cache_set(transcript_id, content)
+        return transcript
+
+    def iter_get(self, transcript_id: str, fields: Iterable[str] = BaseTranscriptEndpoint.STREAMED_FIELDS, compact_words: bool = False) -> Iterator[Tuple[str, Any]]:
+        """ Retrieve a transcript, decoding the response body as it arrives.
+
+        Yields a ("words", UtteredWord) or ("utterances", Utterance) pair for each element of the requested `fields` as soon as
+        it is decoded, then ("transcript", Transcript) with every other field; the streamed fields of that Transcript are left
+        empty. Neither the body nor its parsed JSON is held in memory at once, so memory does not grow with the audio length.
+        With a cache on the client, the raw body of a completed transcript is kept until the end to cache it for get().
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
+        """
+        decoders = self._stream_decoders(fields, compact_words)
+        stream = ObjectStream(stream_keys=decoders)
+        timer = self.parent.instrumentation.decode_timer("Transcript")
+        cached = self._cache_get(transcript_id)
+        body = self._stream_cache(cached)
+        response = self._handle_request(transcript_id, "GET", stream=True) if cached is None else None
+        try:
+            for chunk in response.iter_bytes(self.STREAM_CHUNK_SIZE) if response is not None else [cached]:
+                yield from self._feed_stream(stream, decoders, chunk, timer, body)
+        finally:
+            if response is not None:
+                response.close()
+        yield from self._finish_stream(transcript_id, stream, decoders, compact_words, timer, body)
+
+    def get_streaming(self, transcript_id: str, on_word: Optional[Callable[[UtteredWord], Any]] = None, on_utterance: Optional[Callable[[Utterance], Any]] = None, compact_words: bool = False) -> Transcript:
+        """ Retrieve a transcript, decoding the response body as it arrives.
+
+        Words and utterances are passed to `on_word` and `on_utterance` as they are decoded and are left out of the returned
+        Transcript. Without a callback they are collected on it, `words` into a columnar.WordArray with `compact_words`, so
+        the raw body, its parsed JSON and the decoded transcript are never all in memory at once as they are with get().
+
         *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
         """
-        response = self._handle_request(transcript_id, "GET")
-        return Transcript.from_dict(response.json())
+        words = None if on_word else WordArray() if compact_words else []
+        utterances = None if on_utterance else []
+        for key, value in self.iter_get(transcript_id, compact_words=compact_words):
+            if key == "words":
+                if on_word is not None:
+                    on_word(value)
+                elif compact_words:
+                    words.append(value.start, value.end, value.text, value.confidence, value.speaker)
+                else:
+                    words.append(value)
+            elif key == "utterances":
+                if on_utterance is not None:
+                    on_utterance(value)
+                else:
+                    utterances.append(value)
+            else:
+                transcript = value
+        return self._with_streamed(transcript, words, utterances)
+
+    def wait_for_completion(self, transcript_id: str, timeout: Optional[float] = None) -> Transcript:
+        """ Block until a transcript is completed or errored, then return it.
+
+        Use a poller.TranscriptPoller directly to wait for many transcripts at once.
+        """
+        with TranscriptPoller(self) as poller:
+            return poller.wait([transcript_id], timeout=timeout)[transcript_id]
 
     def sentences(self, transcript_id: str) -> List[UtteredWord]:
         """ Retrieve the sentences of a transcript.
-        
+
         *[Reference](https://www.assemblyai.com/docs/reference#get-all-sentences-of-a-transcript)*
         """
-        response = self._handle_request(f"{transcript_id}/sentences", "GET")
-        sentences = response.json().get("sentences", [])
-        return [UtteredWord.from_dict(u) for u in sentences]
+        return self._coalesce(self._flight_key(f"{transcript_id}/sentences"), lambda: self._sentences(transcript_id))
+
+    def _sentences(self, transcript_id: str) -> List[UtteredWord]:
+        content = self._cache_get(f"{transcript_id}/sentences")
+        if content is None:
+            # Only completed transcripts have sentences, so the response can always be cached.
+            content = self._handle_request(f"{transcript_id}/sentences", "GET").content
+            self._cache_set(f"{transcript_id}/sentences", content)
+        return self._parse_sentences(content)
 
-    def paragraphs(self, transcript_id: str) -> List[Utterance]:
+    def paragraphs(self, transcript_id: str, compact_words: bool = False) -> List[Utterance]:
         """ Retrieve the paragraphs of a transcript.
-        
+
+        Args:
+            compact_words: store `words` of each paragraph as a columnar.WordArray
+
         *[Reference](https://www.assemblyai.com/docs/reference#get-all-paragraphs-of-a-transcript)*
         """
-        response = self._handle_request(f"{transcript_id}/paragraphs", "GET")
-        paragraphs = response.json().get("paragraphs", [])
-        return [Utterance.from_dict(u) for u in paragraphs]
+        return self._coalesce(self._flight_key(f"{transcript_id}/paragraphs", compact_words), lambda: self._paragraphs(transcript_id, compact_words))
+
+    def _paragraphs(self, transcript_id: str, compact_words: bool) -> List[Utterance]:
+        content = self._cache_get(f"{transcript_id}/paragraphs")
+        if content is None:
+            # Only completed transcripts have paragraphs, so the response can always be cached.
+            content = self._handle_request(f"{transcript_id}/paragraphs", "GET").content
+            self._cache_set(f"{transcript_id}/paragraphs", content)
+        return self._parse_paragraphs(content, compact_words)
+
+    def fetch_bundle(self, transcript_ids: Iterable[str], parts: Iterable[str] = BUNDLE_PARTS, max_concurrency: int = 8, compact_words: bool = False) -> Iterator[TranscriptBundle]:
+        """ Retrieve transcripts together with their sentences and/or paragraphs, yielding each bundle once all its parts arrived.
+
+        All parts are requested concurrently over the client's connection pool, with at most max_concurrency requests in flight,
+        so a bundle takes about one round trip rather than one per part. Bundles are yielded in completion order, and at most
+        max_concurrency bundles are fetched ahead of the consumer. A failure is recorded on TranscriptBundle.error rather than raised.
+
+        Args:
+            parts: any of "transcript", "sentences" and "paragraphs"
+            compact_words: store `words` of the transcript, its utterances and its paragraphs as a columnar.WordArray
+        """
+        fetchers = self._bundle_fetchers(parts, compact_words)
+        numbered = enumerate(transcript_ids)
+        bundles: Dict[int, TranscriptBundle] = {}
+        remaining: Dict[int, int] = {}
+        in_flight: Dict[Future, Tuple[int, str]] = {}
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            def start(index: int, transcript_id: str) -> None:
+                bundles[index], remaining[index] = TranscriptBundle(transcript_id), len(fetchers)
+                for part, fetch in fetchers:
+                    in_flight[pool.submit(fetch, transcript_id)] = (index, part)
+
+            for index, transcript_id in itertools.islice(numbered, max_concurrency):
+                start(index, transcript_id)
+            try:
+                while in_flight:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index, part = in_flight.pop(future)
+                        error = future.exception()
+                        self._fill_bundle(bundles[index], part, None if error else future.result(), error)
+                        remaining[index] -= 1
+                        if remaining[index]:
+                            continue
+                        del remaining[index]
+                        bundle = bundles.pop(index)
+                        # Keep the pool busy while the consumer handles this bundle.
+                        for next_index, transcript_id in itertools.islice(numbered, 1):
+                            start(next_index, transcript_id)
+                        yield bundle
+            finally:
+                for future in in_flight:
+                    future.cancel()
 
     def delete(self, transcript_id: str):
         """ Delete a specific transcript.
 
-        Note: The record of the transcript will exist and remain queryable, however, all fields 
+        Note: The record of the transcript will exist and remain queryable, however, all fields
         containing sensitive data (like text transcriptions) will be permanently deleted.
-        
+
         *[Reference](https://www.assemblyai.com/docs/reference#delete-a-transcript)*
         """
         self._handle_request(transcript_id, "DELETE")
+        self._cache_invalidate(transcript_id)
 
     def all(self, limit: Optional[int] = None, status: Optional[TranscriptStatus] = None, created_on: Optional[date] = None, before_id: Optional[str]=None, after_id: Optional[str]=None, throttled_only: bool = False, first_page_only: bool = True) -> List[Transcript]:
         """Retrieve all transcripts.
-        
+
+        Use iter_all() to stream through many pages in constant memory.
+
         *[Reference](https://www.assemblyai.com/docs/reference#get-all-transcripts)*
         """
-        response = self._handle_request("", "GET", body = {
-            "limit": limit,
-            "status": status,
-            "created_on": created_on.isoformat() if created_on else None,
-            "before_id": before_id,
-            "after_id": after_id,
-            "throttled_only": throttled_only
-        })
-        result = self._parse_all_response(response)
+        pages = self._iter_pages(self._all_request(limit, status, created_on, before_id, after_id, throttled_only), prefetch=False)
+        if first_page_only:
+            return next(pages)
+        return [t for page in pages for t in page]
 
-        next_url = self._all_next_url(response)
-        if not next_url or first_page_only:
-            return result
+    def iter_all(self, limit: Optional[int] = None, status: Optional[TranscriptStatus] = None, created_on: Optional[date] = None, before_id: Optional[str]=None, after_id: Optional[str]=None, throttled_only: bool = False, prefetch: bool = True) -> Iterator[Transcript]:
+        """Iterate over all transcripts, page by page.
 
-        while next_url:
-            # Take only url suffix path
-            path = self.parent.path_from_full_url(next_url)
-            response = self._handle_request(path, "GET")
+        Only the current page is held in memory. With `prefetch`, the next page is requested in the background while the current one is consumed.
 
-            result.extend(self._parse_all_response(response))
-            next_url = self._all_next_url(response)
+        *[Reference](https://www.assemblyai.com/docs/reference#get-all-transcripts)*
+        """
+        for page in self._iter_pages(self._all_request(limit, status, created_on, before_id, after_id, throttled_only), prefetch=prefetch):
+            yield from page
 
-        return result
+    def _iter_pages(self, first_request: Dict[str, Any], prefetch: bool) -> Iterator[List[Transcript]]:
+        """Yields each page of transcripts, starting from `first_request` and following `page_details.next_url`."""
+        transcripts, next_url = self._parse_all_page(self._handle_request(**first_request))
+        if not prefetch:
+            yield transcripts
+            while next_url:
+                transcripts, next_url = self._parse_all_page(self._next_page_request(next_url))
+                yield transcripts
+            return
 
-    def _handle_request(self, operation: str, method: str, query: Optional[Dict[Any, Any]] = None, body: Optional[Dict[Any, Any]] = None):
-        """Handles sending a request to the transcript endpoints."""
-        if operation:
-            url = f"{TranscriptEndpoint.PREFIX}/{operation}"
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            while True:
+                upcoming = pool.submit(lambda url: self._parse_all_page(self._next_page_request(url)), next_url) if next_url else None
+                yield transcripts
+                if upcoming is None:
+                    return
+                transcripts, next_url = upcoming.result()
+
+
+class AsyncTranscriptEndpoint(BaseTranscriptEndpoint):
+    """ Asyncio API Operations related to the model.Transcript object. Mirrors TranscriptEndpoint.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#transcript)*
+    """
+    parent: "AsyncClient"
+
+    async def create(self, transcript: Transcript) -> Transcript:
+        """ Create a new Transcript object.
+
+        Results in AsssemblyAI running core transcription (and possibly audio intelligence) on the audio referenced.
+        Note: Maximum file size for audio is 10 hours.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#create-a-transcript)*
+        """
+        response = await self._handle_request(**self._create_request(transcript))
+        return self._parse_transcript(response.content)
+
+    async def create_many(self, transcripts: Iterable[Transcript], max_concurrency: int = 8) -> AsyncBatchJob:
+        """ Create many Transcript objects, with at most max_concurrency requests in flight.
+
+        Results are kept in input order. A failure to create one transcript is recorded on its BatchItem rather than aborting the batch.
+        Use AsyncBatchJob.wait() to wait until every transcript is completed or errored.
+        """
+        return await AsyncBatchJob.submit(self, transcripts, max_concurrency)
+
+    async def create_split(self, filename: str, transcript: Optional[Transcript] = None, audio_format: Optional[AudioFormat] = None, segment_ms: int = splitting.DEFAULT_SEGMENT_MS, overlap_ms: int = splitting.DEFAULT_OVERLAP_MS, max_concurrency: int = 4, timeout: Optional[float] = None) -> Transcript:
+        """ Transcribe a long local WAV or raw PCM file as overlapping segments in parallel, and merge their transcripts into one. Mirrors TranscriptEndpoint.create_split()."""
+        source = AudioSource.open(filename, audio_format)
+        segments = splitting.plan_segments(source, segment_ms, overlap_ms)
+        template = transcript or Transcript()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def submit(segment: Segment) -> Transcript:
+            async with semaphore:
+                upload = await self.parent.upload.upload_bytes(splitting.segment_chunks(source, segment), read_ahead=2)
+                return await self.create(replace(template, audio_url=upload.upload_url))
+
+        tasks = [asyncio.ensure_future(submit(segment)) for segment in segments]
+        try:
+            created = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+        parts = await AsyncTranscriptPoller(self, max_concurrency=max_concurrency).wait([t.id for t in created], timeout=timeout)
+        return splitting.merge([parts[t.id] for t in created], segments)
+
+    async def _coalesce(self, key: Tuple[Any, ...], fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs a GET operation through the client's SingleFlight, if it has one, so identical concurrent calls share one request."""
+        flight = self.parent.single_flight
+        return await fetch() if flight is None else await flight.ado(key, fetch)
+
+    async def get(self, transcript_id: str, compact_words: bool = False, lazy: bool = False) -> Transcript:
+        """ Retrieve a specific transcript
+
+        Args:
+            compact_words: store `words` of the transcript and its utterances as a columnar.WordArray
+            lazy: return a lazy.LazyTranscript, which decodes words, utterances and audio intelligence results on first access
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
+        """
+        return await self._coalesce(self._flight_key(transcript_id, compact_words, lazy), lambda: self._get(transcript_id, compact_words, lazy))
+
+    async def _get(self, transcript_id: str, compact_words: bool, lazy: bool) -> Transcript:
+        cached = self._cache_get(transcript_id)
+        content = cached if cached is not None else (await self._handle_request(transcript_id, "GET")).content
+        transcript = self._parse_transcript(content, compact_words, lazy)
+        if cached is None and transcript.status == TranscriptStatus.completed:
+            self._cache_set(transcript_id, content)
+        return transcript
+
+    async def iter_get(self, transcript_id: str, fields: Iterable[str] = BaseTranscriptEndpoint.STREAMED_FIELDS, compact_words: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """ Retrieve a transcript, decoding the response body as it arrives. Mirrors TranscriptEndpoint.iter_get().
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
+        """
+        decoders = self._stream_decoders(fields, compact_words)
+        stream = ObjectStream(stream_keys=decoders)
+        timer = self.parent.instrumentation.decode_timer("Transcript")
+        cached = self._cache_get(transcript_id)
+        body = self._stream_cache(cached)
+        if cached is not None:
+            for pair in self._feed_stream(stream, decoders, cached, timer, body):
+                yield pair
         else:
-            url = TranscriptEndpoint.PREFIX
-        return self.parent.request(url, method, body = body, query=query, headers={"content-type": 'application/json'})
+            response = await self._handle_request(transcript_id, "GET", stream=True)
+            try:
+                async for chunk in response.aiter_bytes(self.STREAM_CHUNK_SIZE):
+                    for pair in self._feed_stream(stream, decoders, chunk, timer, body):
+                        yield pair
+            finally:
+                await response.aclose()
+        for pair in self._finish_stream(transcript_id, stream, decoders, compact_words, timer, body):
+            yield pair
 
-    def _clean_body(self, body: Optional[Dict[Any, Any]]) -> Optional[Dict[Any, Any]]:
-        """Cleans a json body of pythonic values and unnecessary keys."""
-        if not body:
-            return body
+    async def get_streaming(self, transcript_id: str, on_word: Optional[Callable[[UtteredWord], Any]] = None, on_utterance: Optional[Callable[[Utterance], Any]] = None, compact_words: bool = False) -> Transcript:
+        """ Retrieve a transcript, decoding the response body as it arrives. Mirrors TranscriptEndpoint.get_streaming().
 
-        # Remove key-value with null values
-        body_items = filter(lambda x: x[1] is not None, body.items())
+        *[Reference](https://www.assemblyai.com/docs/reference#get-a-transcript)*
+        """
+        words = None if on_word else WordArray() if compact_words else []
+        utterances = None if on_utterance else []
+        async for key, value in self.iter_get(transcript_id, compact_words=compact_words):
+            if key == "words":
+                if on_word is not None:
+                    on_word(value)
+                elif compact_words:
+                    words.append(value.start, value.end, value.text, value.confidence, value.speaker)
+                else:
+                    words.append(value)
+            elif key == "utterances":
+                if on_utterance is not None:
+                    on_utterance(value)
+                else:
+                    utterances.append(value)
+            else:
+                transcript = value
+        return self._with_streamed(transcript, words, utterances)
 
-        return dict(body_items)
+    async def wait_for_completion(self, transcript_id: str, timeout: Optional[float] = None) -> Transcript:
+        """ Wait until a transcript is completed or errored, then return it.
 
-    def _all_next_url(self, response: Response) -> Optional[str]:
-        """For a response from self.all(), retrieve the url for the next set of paginated results. 
-        
-        If None, no more results are present.
+        Use a poller.AsyncTranscriptPoller directly to wait for many transcripts at once.
         """
-        resp_json = response.json()
-        page_details = resp_json.get("page_details")
-        if not page_details:
-            return None
+        return (await AsyncTranscriptPoller(self).wait([transcript_id], timeout=timeout))[transcript_id]
 
-        next_url = page_details.get("next_url", None)
-        current_url = page_details.get("current_url", None)
-        if next_url == current_url:
-            return None
-        return next_url
+    async def sentences(self, transcript_id: str) -> List[UtteredWord]:
+        """ Retrieve the sentences of a transcript.
 
-    def _parse_all_response(self, response: Response) -> List[Transcript]:
-        """For a response from self.all(), parse all transcripts from this response."""
-        if not response.json().get("transcripts"):
-            return []
+        *[Reference](https://www.assemblyai.com/docs/reference#get-all-sentences-of-a-transcript)*
+        """
+        return await self._coalesce(self._flight_key(f"{transcript_id}/sentences"), lambda: self._sentences(transcript_id))
 
-        # Convert transcripts back to JSON to use dataclass JSON parsing.
-        raw_transcripts = json.dumps(response.json().get("transcripts"))
+    async def _sentences(self, transcript_id: str) -> List[UtteredWord]:
+        content = self._cache_get(f"{transcript_id}/sentences")
+        if content is None:
+            # Only completed transcripts have sentences, so the response can always be cached.
+            content = (await self._handle_request(f"{transcript_id}/sentences", "GET")).content
+            self._cache_set(f"{transcript_id}/sentences", content)
+        return self._parse_sentences(content)
 
-        return Transcript.schema().loads(raw_transcripts, many=True)
+    async def paragraphs(self, transcript_id: str, compact_words: bool = False) -> List[Utterance]:
+        """ Retrieve the paragraphs of a transcript.
 
-class UploadEndpoint(Endpoint):
-    """ API Operations related to the model.Upload object.
+        Args:
+            compact_words: store `words` of each paragraph as a columnar.WordArray
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-all-paragraphs-of-a-transcript)*
+        """
+        return await self._coalesce(self._flight_key(f"{transcript_id}/paragraphs", compact_words), lambda: self._paragraphs(transcript_id, compact_words))
+
+    async def _paragraphs(self, transcript_id: str, compact_words: bool) -> List[Utterance]:
+        content = self._cache_get(f"{transcript_id}/paragraphs")
+        if content is None:
+            # Only completed transcripts have paragraphs, so the response can always be cached.
+            content = (await self._handle_request(f"{transcript_id}/paragraphs", "GET")).content
+            self._cache_set(f"{transcript_id}/paragraphs", content)
+        return self._parse_paragraphs(content, compact_words)
+
+    async def fetch_bundle(self, transcript_ids: Iterable[str], parts: Iterable[str] = BUNDLE_PARTS, max_concurrency: int = 8, compact_words: bool = False) -> AsyncIterator[TranscriptBundle]:
+        """ Retrieve transcripts together with their sentences and/or paragraphs, yielding each bundle once all its parts arrived.
+
+        All parts are requested concurrently, with at most max_concurrency requests in flight, so a bundle takes about one
+        round trip rather than one per part. Bundles are yielded in completion order, and at most max_concurrency bundles
+        are fetched ahead of the consumer. A failure is recorded on TranscriptBundle.error rather than raised.
+
+        Args:
+            parts: any of "transcript", "sentences" and "paragraphs"
+            compact_words: store `words` of the transcript, its utterances and its paragraphs as a columnar.WordArray
+        """
+        fetchers = self._bundle_fetchers(parts, compact_words)
+        numbered = enumerate(transcript_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        bundles: Dict[int, TranscriptBundle] = {}
+        remaining: Dict[int, int] = {}
+        in_flight: Dict["asyncio.Future[Any]", Tuple[int, str]] = {}
+
+        async def fetch_part(fetch: Callable[[str], Any], transcript_id: str) -> Any:
+            async with semaphore:
+                return await fetch(transcript_id)
+
+        def start(index: int, transcript_id: str) -> None:
+            bundles[index], remaining[index] = TranscriptBundle(transcript_id), len(fetchers)
+            for part, fetch in fetchers:
+                in_flight[asyncio.ensure_future(fetch_part(fetch, transcript_id))] = (index, part)
+
+        for index, transcript_id in itertools.islice(numbered, max_concurrency):
+            start(index, transcript_id)
+        try:
+            while in_flight:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, part = in_flight.pop(task)
+                    error = task.exception()
+                    self._fill_bundle(bundles[index], part, None if error else task.result(), error)
+                    remaining[index] -= 1
+                    if remaining[index]:
+                        continue
+                    del remaining[index]
+                    bundle = bundles.pop(index)
+                    for next_index, transcript_id in itertools.islice(numbered, 1):
+                        start(next_index, transcript_id)
+                    yield bundle
+        finally:
+            for task in in_flight:
+                task.cancel()
+
+    async def delete(self, transcript_id: str):
+        """ Delete a specific transcript.
+
+        Note: The record of the transcript will exist and remain queryable, however, all fields
+        containing sensitive data (like text transcriptions) will be permanently deleted.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#delete-a-transcript)*
+        """
+        await self._handle_request(transcript_id, "DELETE")
+        self._cache_invalidate(transcript_id)
+
+    async def all(self, limit: Optional[int] = None, status: Optional[TranscriptStatus] = None, created_on: Optional[date] = None, before_id: Optional[str]=None, after_id: Optional[str]=None, throttled_only: bool = False, first_page_only: bool = True) -> List[Transcript]:
+        """Retrieve all transcripts.
+
+        Use iter_all() to stream through many pages in constant memory.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-all-transcripts)*
+        """
+        result = []
+        async for page in self._iter_pages(self._all_request(limit, status, created_on, before_id, after_id, throttled_only), prefetch=False):
+            if first_page_only:
+                return page
+            result.extend(page)
+        return result
+
+    async def iter_all(self, limit: Optional[int] = None, status: Optional[TranscriptStatus] = None, created_on: Optional[date] = None, before_id: Optional[str]=None, after_id: Optional[str]=None, throttled_only: bool = False, prefetch: bool = True) -> AsyncIterator[Transcript]:
+        """Iterate over all transcripts, page by page.
+
+        Only the current page is held in memory. With `prefetch`, the next page is requested concurrently while the current one is consumed.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#get-all-transcripts)*
+        """
+        async for page in self._iter_pages(self._all_request(limit, status, created_on, before_id, after_id, throttled_only), prefetch=prefetch):
+            for transcript in page:
+                yield transcript
+
+    async def _iter_pages(self, first_request: Dict[str, Any], prefetch: bool) -> AsyncIterator[List[Transcript]]:
+        """Yields each page of transcripts, starting from `first_request` and following `page_details.next_url`."""
+        async def fetch(url: str) -> Tuple[List[Transcript], Optional[str]]:
+            return self._parse_all_page(await self._next_page_request(url))
+
+        transcripts, next_url = self._parse_all_page(await self._handle_request(**first_request))
+        while True:
+            upcoming = asyncio.ensure_future(fetch(next_url)) if next_url and prefetch else None
+            try:
+                yield transcripts
+            except GeneratorExit:
+                if upcoming is not None:
+                    upcoming.cancel()
+                raise
+            if not next_url:
+                return
+            transcripts, next_url = await upcoming if upcoming is not None else await fetch(next_url)
+
+
+class BaseUploadEndpoint(Endpoint):
+    """ Request building and response parsing shared by UploadEndpoint and AsyncUploadEndpoint.
 
         *[Endpoint reference](https://www.assemblyai.com/docs/reference#upload)*
     """
     PREFIX="upload"
+    CHUNK_SIZE=5242880
+
+    def _handle_request(self, content: Any):
+        """Handles sending raw audio to the upload endpoint.
+
+        Returns the parent client's response, which is awaitable for an AsyncClient.
+        """
+        return self.parent.request(BaseUploadEndpoint.PREFIX, "POST", data=content, headers={"Transfer-Encoding": "chunked"})
+
+    def _parse_upload(self, response: Response) -> Upload:
+        """Parses an Upload from a response."""
+        with self.parent.instrumentation.decoding("Upload", len(response.content)):
+            return decode(Upload, loads(response.content))
+
+    def _cached_upload(self, content: Any) -> Tuple[Optional[str], Optional[Upload]]:
+        """For in-memory content and a client with an upload_cache, returns its hash and any cached Upload of it."""
+        uploads = self.parent.upload_cache
+        if uploads is None or not isinstance(content, (bytes, bytearray, memoryview)):
+            return None, None
+        digest = uploads.digest_bytes(content)
+        return digest, uploads.get(digest)
 
-    def upload_bytes(self, content: bytes) -> Upload:
+    def _store_upload(self, digest: Optional[str], upload: Upload, hasher: Any = None) -> None:
+        """Records an Upload in the upload_cache. With a hasher of the streamed content, only if the content still had the hash `digest`."""
+        if digest is not None and (hasher is None or hasher.hexdigest() == digest):
+            self.parent.upload_cache.set(digest, upload)
+
+    def _file_chunks(self, filename: str, chunk_size: int, use_mmap: bool, hasher: Any) -> Iterator[Any]:
+        """Chunks of a file, read with buffered reads or as zero-copy slices of a memory map."""
+        if use_mmap:
+            return transfer.mmap_chunks(filename, chunk_size, hasher)
+        return self._read_binary_file(filename, chunk_size, hasher=hasher)
+
+
+class UploadEndpoint(BaseUploadEndpoint):
+    """ API Operations related to the model.Upload object.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#upload)*
+    """
+
+    def upload_bytes(self, content: Union[bytes, Iterable[bytes]], progress: Optional[Callable[[UploadProgress], Any]] = None, read_ahead: int = 0, retries: int = 3, backoff: float = 1.0, chunk_size: int = BaseUploadEndpoint.CHUNK_SIZE) -> Upload:
         """Upload bytes of raw audio to AssemblyAI servers.
-        
+
         Note: does not run transcription or any audio intelligence.
-        
+
+        With an upload_cache on the client, bytes that were uploaded before are not sent again.
+
+        Args:
+            content: the audio, or an iterable of chunks of it such as a pipe reader. An iterable can only be sent once, so it is never retried.
+            progress: called with an UploadProgress after each chunk is sent and once the upload completes.
+            read_ahead: chunks of an iterable to read ahead on a background thread. 0 reads each chunk when it is sent.
+            retries: times a failed upload of bytes is retried after connection errors, throttling or 5xx responses.
+            backoff: base delay in seconds of the jittered, exponential backoff between retries.
+            chunk_size: size of the chunks bytes are sent in.
+
         *[Reference](https://www.assemblyai.com/docs/reference#creating-an-upload)*
         """
-        response = self.parent.request(UploadEndpoint.PREFIX, "POST", data=content, headers={"Transfer-Encoding": "chunked"})
-        return Upload.from_dict(response.json())
+        digest, cached = self._cached_upload(content)
+        if cached is not None:
+            return cached
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            upload = self._send(lambda: transfer.split(content, chunk_size), len(content), retries, backoff, progress)
+        else:
+            source = transfer.read_ahead(content, read_ahead) if read_ahead else content
+            upload = self._send(lambda: source, None, 0, backoff, progress)
+        self._store_upload(digest, upload)
+        return upload
 
-    def upload_file(self, filename: str) -> Upload:
+    def upload_file(self, filename: str, progress: Optional[Callable[[UploadProgress], Any]] = None, read_ahead: int = 2, use_mmap: bool = False, retries: int = 3, backoff: float = 1.0, chunk_size: int = BaseUploadEndpoint.CHUNK_SIZE) -> Upload:
         """Upload file from raw audio to AssemblyAI servers.
-        
+
         Note: does not run transcription or any audio intelligence.
-        
+
+        The file is read on a background thread while earlier chunks are sent. After a transient failure the upload
+        is restarted from the beginning of the file, as the API has no way to resume a partial upload.
+
+        With an upload_cache on the client, the file is hashed first and not sent again if its content was uploaded before.
+        The file is hashed again while it is streamed, and the upload is only cached if the file did not change meanwhile.
+
+        Args:
+            progress: called with an UploadProgress after each chunk is sent and once the upload completes.
+            read_ahead: chunks to keep read ahead of the upload. 0 reads each chunk when it is sent.
+            use_mmap: send zero-copy slices of a memory map of the file instead of buffered reads.
+            retries: times the upload is retried after connection errors, throttling or 5xx responses.
+            backoff: base delay in seconds of the jittered, exponential backoff between retries.
+            chunk_size: size of the chunks the file is read and sent in.
+
         *[Reference](https://www.assemblyai.com/docs/reference#creating-an-upload)*
         """
-        return self.upload_bytes(self._read_binary_file(filename))
+        uploads = self.parent.upload_cache
+        digest = None
+        if uploads is not None:
+            digest = uploads.digest_file(filename)
+            cached = uploads.get(digest)
+            if cached is not None:
+                return cached
 
+        hashers: List[Any] = []
+
+        def chunks() -> Iterator[Any]:
+            hashers.append(uploads.hasher() if uploads is not None else None)
+            source = self._file_chunks(filename, chunk_size, use_mmap, hashers[-1])
+            return transfer.read_ahead(source, read_ahead) if read_ahead else source
+
+        upload = self._send(chunks, os.path.getsize(filename), retries, backoff, progress)
+        self._store_upload(digest, upload, hashers[-1])
+        return upload
+
+    def _send(self, chunks: Callable[[], Iterable[Any]], total_bytes: Optional[int], retries: int, backoff: float, progress: Optional[Callable[[UploadProgress], Any]]) -> Upload:
+        """Sends the chunks returned by `chunks()`, calling it again for each retry."""
+        attempt = 0
+        while True:
+            meter = ProgressMeter(progress, total_bytes, attempt)
+            try:
+                upload = self._parse_upload(self._handle_request(meter.wrap(chunks())))
+            except Exception as error:
+                # An upload is safe to send again, and waits out throttling with every request sharing the policy.
+                delay = self.parent.policy.retry_delay("POST", attempt, True, error=error, retries=retries, backoff=backoff, idempotent=True)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            meter.report(done=True)
+            return upload
+
+
+class AsyncUploadEndpoint(BaseUploadEndpoint):
+    """ Asyncio API Operations related to the model.Upload object. Mirrors UploadEndpoint.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#upload)*
+    """
+    parent: "AsyncClient"
+
+    async def upload_bytes(self, content: Union[bytes, Iterable[bytes], AsyncIterable[bytes]], progress: Optional[Callable[[UploadProgress], Any]] = None, read_ahead: int = 0, retries: int = 3, backoff: float = 1.0, chunk_size: int = BaseUploadEndpoint.CHUNK_SIZE) -> Upload:
+        """Upload bytes of raw audio to AssemblyAI servers.
 
-class StreamEndpoint(Endpoint):
+        Note: does not run transcription or any audio intelligence.
+
+        With an upload_cache on the client, bytes that were uploaded before are not sent again.
+
+        Args:
+            content: the audio, or an iterable or async iterable of chunks of it. Blocking iterables are read in the default executor.
+                An iterable can only be sent once, so it is never retried.
+            progress: called with an UploadProgress after each chunk is sent and once the upload completes.
+            read_ahead: chunks of an iterable to read ahead in the background. 0 reads each chunk when it is sent.
+            retries: times a failed upload of bytes is retried after connection errors, throttling or 5xx responses.
+            backoff: base delay in seconds of the jittered, exponential backoff between retries.
+            chunk_size: size of the chunks bytes are sent in.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#creating-an-upload)*
+        """
+        digest, cached = self._cached_upload(content)
+        if cached is not None:
+            return cached
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            upload = await self._send(lambda: transfer.aiter_split(content, chunk_size), len(content), retries, backoff, progress)
+        elif hasattr(content, "__aiter__"):
+            source = transfer.aread_ahead(content, read_ahead) if read_ahead else content
+            upload = await self._send(lambda: source, None, 0, backoff, progress)
+        else:
+            source = transfer.aiter_sync(transfer.read_ahead(content, read_ahead) if read_ahead else content)
+            upload = await self._send(lambda: source, None, 0, backoff, progress)
+        self._store_upload(digest, upload)
+        return upload
+
+    async def upload_file(self, filename: str, progress: Optional[Callable[[UploadProgress], Any]] = None, read_ahead: int = 2, use_mmap: bool = False, retries: int = 3, backoff: float = 1.0, chunk_size: int = BaseUploadEndpoint.CHUNK_SIZE) -> Upload:
+        """Upload file from raw audio to AssemblyAI servers.
+
+        Note: does not run transcription or any audio intelligence.
+
+        The file is read on a background thread while earlier chunks are sent. After a transient failure the upload
+        is restarted from the beginning of the file, as the API has no way to resume a partial upload.
+
+        With an upload_cache on the client, the file is hashed first (in a worker thread) and not sent again if its content
+        was uploaded before. The upload is only cached if the file did not change while it was streamed.
+
+        Args: same as UploadEndpoint.upload_file.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#creating-an-upload)*
+        """
+        uploads = self.parent.upload_cache
+        digest = None
+        if uploads is not None:
+            digest = await asyncio.get_running_loop().run_in_executor(None, uploads.digest_file, filename)
+            cached = uploads.get(digest)
+            if cached is not None:
+                return cached
+
+        hashers: List[Any] = []
+
+        def chunks() -> AsyncIterator[Any]:
+            hashers.append(uploads.hasher() if uploads is not None else None)
+            if not read_ahead and not use_mmap:
+                return self._aread_binary_file(filename, chunk_size, hasher=hashers[-1])
+            source = self._file_chunks(filename, chunk_size, use_mmap, hashers[-1])
+            return transfer.aiter_sync(transfer.read_ahead(source, read_ahead) if read_ahead else source)
+
+        upload = await self._send(chunks, os.path.getsize(filename), retries, backoff, progress)
+        self._store_upload(digest, upload, hashers[-1])
+        return upload
+
+    async def _send(self, chunks: Callable[[], AsyncIterable[Any]], total_bytes: Optional[int], retries: int, backoff: float, progress: Optional[Callable[[UploadProgress], Any]]) -> Upload:
+        """Sends the chunks returned by `chunks()`, calling it again for each retry."""
+        attempt = 0
+        while True:
+            meter = ProgressMeter(progress, total_bytes, attempt)
+            try:
+                upload = self._parse_upload(await self._handle_request(meter.awrap(chunks())))
+            except Exception as error:
+                # An upload is safe to send again, and waits out throttling with every request sharing the policy.
+                delay = self.parent.policy.retry_delay("POST", attempt, True, error=error, retries=retries, backoff=backoff, idempotent=True)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            meter.report(done=True)
+            return upload
+
+
+class BaseStreamEndpoint(Endpoint):
+    """ Request building and response parsing shared by StreamEndpoint and AsyncStreamEndpoint.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#stream)*
+    """
+    PREFIX="stream"
+
+    def _handle_request(self, base64_raw_audio: str, format_text: bool = False, punctuate: bool = False):
+        """Handles sending base64 encoded audio to the stream endpoint.
+
+        Returns the parent client's response, which is awaitable for an AsyncClient.
+        """
+        return self.parent.request(BaseStreamEndpoint.PREFIX, "POST", body={"audio_data": base64_raw_audio, "format_text": format_text, "punctuate": punctuate})
+
+    def _parse_stream(self, response: Response) -> StreamPayload:
+        """Parses a StreamPayload from a response."""
+        with self.parent.instrumentation.decoding("StreamPayload", len(response.content)):
+            return decode(StreamPayload, loads(response.content))
+
+    def _file_source(self, filename: str, audio_format: Optional[AudioFormat]) -> Tuple[AudioFormat, Iterator[bytes]]:
+        """The format and PCM data of a WAV file, or of a raw PCM file in `audio_format`."""
+        if is_wav(filename):
+            return read_wav(filename)
+        return audio_format or AudioFormat(), self._read_binary_file(filename, 65536)
+
+
+class StreamEndpoint(BaseStreamEndpoint):
     """ API Operations related to the model.Stream object. Stream raw audio for transcription.
 
     NOTE: upload endpoint `v2/stream/` is not operation as per documentation.
-    
+
         *[Endpoint reference](https://www.assemblyai.com/docs/reference#stream)*
     """
-    PREFIX="stream"
 
     def stream_raw(self, base64_raw_audio: str, format_text: bool = False, punctuate: bool = False) -> StreamPayload:
         """ Stream raw audio to AssemblyAI for transcription.
-        
+
         Args:
             format_text: add auto formatting of text
             punctuate: add auto punctuation
 
         *[Reference](https://www.assemblyai.com/docs/reference#stream)*
         """
-        self.parent.request(StreamEndpoint.PREFIX, "POST", body={"audio_data": base64_raw_audio, "format_text": format_text, "punctuate": punctuate})
+        response = self._handle_request(base64_raw_audio, format_text=format_text, punctuate=punctuate)
+        return self._parse_stream(response)
 
-    def stream_file(self, filename: str, format_text: bool = False, punctuate: bool = False) -> StreamPayload:
-        """ Stream raw audio, from a file, to AssemblyAI for transcription.
+    def stream(self, audio: Iterable[bytes], audio_format: Optional[AudioFormat] = None, frame_ms: int = 1000, max_in_flight: int = 4, format_text: bool = False, punctuate: bool = False) -> Iterator[StreamPayload]:
+        """ Stream PCM audio to AssemblyAI for transcription, frame by frame.
+
+        The audio, in chunks of any size (e.g. from a microphone or socket), is cut into frames of `frame_ms` and each frame
+        is sent as soon as it is complete, over the client's keep-alive connections. At most `max_in_flight` frames are sent
+        or waiting to be consumed at a time; beyond that, reading the audio pauses until the caller catches up.
 
         Args:
+            audio: chunks of PCM audio.
+            audio_format: layout of the PCM audio, by default 16 bit, 8 kHz, mono.
+            frame_ms: duration of each frame.
+            max_in_flight: frames sent concurrently and not yet consumed.
             format_text: add auto formatting of text
             punctuate: add auto punctuation
 
+        Returns: the StreamPayload of each frame, in frame order, as it arrives.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#stream)*
+        """
+        frames = frame_pcm(audio, (audio_format or AudioFormat()).frame_bytes(frame_ms))
+        slots = threading.Semaphore(max_in_flight)
+        pending: "queue.Queue[Any]" = queue.Queue()
+        stopped = threading.Event()
+        end = object()
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+            def feed() -> None:
+                item: Any = end
+                try:
+                    for frame in frames:
+                        slots.acquire()
+                        if stopped.is_set():
+                            return
+                        pending.put(pool.submit(self.stream_raw, encode_frame(frame), format_text, punctuate))
+                except BaseException as error:
+                    item = error
+                pending.put(item)
+
+            feeder = threading.Thread(target=feed, name="assemblyai-stream", daemon=True)
+            feeder.start()
+            try:
+                while True:
+                    item = pending.get()
+                    if item is end:
+                        return
+                    if isinstance(item, BaseException):
+                        raise item
+                    payload = item.result()
+                    slots.release()
+                    yield payload
+            finally:
+                stopped.set()
+                slots.release()
+
+    def stream_file(self, filename: str, audio_format: Optional[AudioFormat] = None, frame_ms: int = 1000, max_in_flight: int = 4, format_text: bool = False, punctuate: bool = False) -> Iterator[StreamPayload]:
+        """ Stream audio, from a WAV or raw PCM file, to AssemblyAI for transcription. See stream().
+
+        Args:
+            audio_format: layout of a raw PCM file. WAV files use the format in their header.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#stream)*
+        """
+        audio_format, chunks = self._file_source(filename, audio_format)
+        return self.stream(chunks, audio_format, frame_ms=frame_ms, max_in_flight=max_in_flight, format_text=format_text, punctuate=punctuate)
+
+
+class AsyncStreamEndpoint(BaseStreamEndpoint):
+    """ Asyncio API Operations related to the model.Stream object. Mirrors StreamEndpoint.
+
+    NOTE: upload endpoint `v2/stream/` is not operation as per documentation.
+
+        *[Endpoint reference](https://www.assemblyai.com/docs/reference#stream)*
+    """
+    parent: "AsyncClient"
+
+    async def stream_raw(self, base64_raw_audio: str, format_text: bool = False, punctuate: bool = False) -> StreamPayload:
+        """ Stream raw audio to AssemblyAI for transcription.
+
+        Args:
+            format_text: add auto formatting of text
+            punctuate: add auto punctuation
+
+        *[Reference](https://www.assemblyai.com/docs/reference#stream)*
+        """
+        response = await self._handle_request(base64_raw_audio, format_text=format_text, punctuate=punctuate)
+        return self._parse_stream(response)
+
+    async def stream(self, audio: Union[Iterable[bytes], AsyncIterable[bytes]], audio_format: Optional[AudioFormat] = None, frame_ms: int = 1000, max_in_flight: int = 4, format_text: bool = False, punctuate: bool = False) -> AsyncIterator[StreamPayload]:
+        """ Stream PCM audio to AssemblyAI for transcription, frame by frame. See StreamEndpoint.stream().
+
+        Args:
+            audio: chunks of PCM audio, as an async iterable or a blocking iterable, which is read in the default executor.
+
+        *[Reference](https://www.assemblyai.com/docs/reference#stream)*
+        """
+        source = audio if hasattr(audio, "__aiter__") else transfer.aiter_sync(audio)
+        frames = aframe_pcm(source, (audio_format or AudioFormat()).frame_bytes(frame_ms))
+        slots = asyncio.Semaphore(max_in_flight)
+        pending: "asyncio.Queue[Any]" = asyncio.Queue()
+        end = object()
+
+        async def feed() -> None:
+            item: Any = end
+            try:
+                async for frame in frames:
+                    await slots.acquire()
+                    pending.put_nowait(asyncio.ensure_future(self.stream_raw(encode_frame(frame), format_text, punctuate)))
+            except Exception as error:
+                item = error
+            pending.put_nowait(item)
+
+        feeder = asyncio.ensure_future(feed())
+        try:
+            while True:
+                item = await pending.get()
+                if item is end:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                payload = await item
+                slots.release()
+                yield payload
+        finally:
+            feeder.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if isinstance(item, asyncio.Future):
+                    item.cancel()
+
+    def stream_file(self, filename: str, audio_format: Optional[AudioFormat] = None, frame_ms: int = 1000, max_in_flight: int = 4, format_text: bool = False, punctuate: bool = False) -> AsyncIterator[StreamPayload]:
+        """ Stream audio, from a WAV or raw PCM file, to AssemblyAI for transcription. See stream().
+
+        Args:
+            audio_format: layout of a raw PCM file. WAV files use the format in their header.
+
         *[Reference](https://www.assemblyai.com/docs/reference#stream)*
         """
-        raw_audio = self._read_binary_file(filename).__next__()
-        return self.stream_raw(str(codecs.encode(raw_audio, "base64")), format_text=format_text, punctuate=punctuate)
+        audio_format, chunks = self._file_source(filename, audio_format)
+        return self.stream(chunks, audio_format, frame_ms=frame_ms, max_in_flight=max_in_flight, format_text=format_text, punctuate=punctuate)
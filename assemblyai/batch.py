@@ -0,0 +1,163 @@
+"""Bulk transcript submission with bounded concurrency."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from assemblyai.model import Transcript, TranscriptStatus
+from assemblyai.poller import FINAL_STATUSES, AsyncTranscriptPoller, TranscriptPoller
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import AsyncTranscriptEndpoint, TranscriptEndpoint
+
+
+@dataclass
+class BatchItem:
+    """The outcome of one transcript within a batch.
+
+    `transcript` holds the latest known state of the transcript, `error` the exception raised while submitting or polling it.
+    """
+    request: Transcript
+    transcript: Optional[Transcript] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns True iff the transcript was submitted and has not failed."""
+        return self.error is None and self.transcript is not None and self.transcript.status != TranscriptStatus.error
+
+    @property
+    def done(self) -> bool:
+        """Returns True iff no further state change is expected for this item."""
+        return self.error is not None or (self.transcript is not None and self.transcript.status in FINAL_STATUSES)
+
+
+class BaseBatchJob:
+    """Results of a create_many() call, in the order the transcripts were given."""
+
+    def __init__(self, items: List[BatchItem], max_concurrency: int) -> None:
+        self.items = items
+        self.max_concurrency = max_concurrency
+
+    @property
+    def transcripts(self) -> List[Optional[Transcript]]:
+        """Latest known transcript for each item, None where submission failed."""
+        return [item.transcript for item in self.items]
+
+    @property
+    def failed(self) -> List[BatchItem]:
+        """Items that failed to submit, failed while polling or finished with TranscriptStatus.error."""
+        return [item for item in self.items if item.done and not item.ok]
+
+    @property
+    def pending(self) -> List[BatchItem]:
+        """Items that were submitted and are not yet completed or errored."""
+        return [item for item in self.items if not item.done]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def _collect(self, tracked: List[Tuple[BatchItem, Any]]) -> None:
+        """Stores the outcome of every resolved poller future on its item."""
+        for item, future in tracked:
+            if not future.done() or future.cancelled():
+                continue
+            if future.exception() is not None:
+                item.error = future.exception()
+            else:
+                item.transcript = future.result()
+
+
+class BatchJob(BaseBatchJob):
+    """Handle on a batch of transcripts submitted through TranscriptEndpoint.create_many()."""
+
+    def __init__(self, endpoint: "TranscriptEndpoint", items: List[BatchItem], max_concurrency: int) -> None:
+        super().__init__(items, max_concurrency)
+        self.endpoint = endpoint
+
+    @classmethod
+    def submit(cls, endpoint: "TranscriptEndpoint", transcripts: Iterable[Transcript], max_concurrency: int) -> "BatchJob":
+        """Creates every transcript, with at most max_concurrency requests in flight."""
+        items = [BatchItem(request=t) for t in transcripts]
+        job = cls(endpoint, items, max_concurrency)
+        job._run_each(items, lambda item: endpoint.create(item.request))
+        return job
+
+    def wait(self, timeout: Optional[float] = None, poller: Optional[TranscriptPoller] = None) -> List[BatchItem]:
+        """Blocks until every submitted transcript reaches TranscriptStatus.completed or TranscriptStatus.error.
+
+        All pending transcripts are polled together through one TranscriptPoller. A poller passed in is left open.
+
+        Throws:
+            TimeoutError: If transcripts are still pending after `timeout` seconds.
+        """
+        own_poller = poller is None
+        poller = poller or TranscriptPoller(self.endpoint, max_concurrency=self.max_concurrency)
+        tracked = [(item, poller.track(item.transcript.id, item.transcript.audio_duration)) for item in self.pending]
+        try:
+            poller.run([f for _, f in tracked], timeout=timeout)
+        finally:
+            self._collect(tracked)
+            if own_poller:
+                poller.close()
+        return self.items
+
+    def _run_each(self, items: List[BatchItem], fn: Callable[[BatchItem], Transcript]) -> None:
+        """Runs fn for every item on a bounded worker pool, storing its result or exception on the item."""
+        def run(item: BatchItem) -> None:
+            try:
+                item.transcript = fn(item)
+            except Exception as e:
+                item.error = e
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            list(pool.map(run, items))
+
+
+class AsyncBatchJob(BaseBatchJob):
+    """Handle on a batch of transcripts submitted through AsyncTranscriptEndpoint.create_many()."""
+
+    def __init__(self, endpoint: "AsyncTranscriptEndpoint", items: List[BatchItem], max_concurrency: int) -> None:
+        super().__init__(items, max_concurrency)
+        self.endpoint = endpoint
+
+    @classmethod
+    async def submit(cls, endpoint: "AsyncTranscriptEndpoint", transcripts: Iterable[Transcript], max_concurrency: int) -> "AsyncBatchJob":
+        """Creates every transcript, with at most max_concurrency requests in flight."""
+        items = [BatchItem(request=t) for t in transcripts]
+        job = cls(endpoint, items, max_concurrency)
+        await job._run_each(items, lambda item: endpoint.create(item.request))
+        return job
+
+    async def wait(self, timeout: Optional[float] = None, poller: Optional[AsyncTranscriptPoller] = None) -> List[BatchItem]:
+        """Waits until every submitted transcript reaches TranscriptStatus.completed or TranscriptStatus.error.
+
+        All pending transcripts are polled together through one AsyncTranscriptPoller.
+
+        Throws:
+            TimeoutError: If transcripts are still pending after `timeout` seconds.
+        """
+        poller = poller or AsyncTranscriptPoller(self.endpoint, max_concurrency=self.max_concurrency)
+        tracked = [(item, poller.track(item.transcript.id, item.transcript.audio_duration)) for item in self.pending]
+        try:
+            await poller.run([f for _, f in tracked], timeout=timeout)
+        finally:
+            self._collect(tracked)
+        return self.items
+
+    async def _run_each(self, items: List[BatchItem], fn: Callable[[BatchItem], Awaitable[Transcript]]) -> None:
+        """Awaits fn for every item with at most max_concurrency in flight, storing its result or exception on the item."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item: BatchItem) -> None:
+            async with semaphore:
+                try:
+                    item.transcript = await fn(item)
+                except Exception as e:
+                    item.error = e
+
+        await asyncio.gather(*[run(item) for item in items])
@@ -0,0 +1,45 @@
+"""A transcript fetched together with its sentences and paragraphs."""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from assemblyai.model import Transcript, Utterance, UtteredWord
+
+BUNDLE_PARTS = ("transcript", "sentences", "paragraphs")
+
+
+@dataclass
+class TranscriptBundle:
+    """The parts of one transcript requested from fetch_bundle().
+
+    Parts that were not requested are None. `error` holds the first exception raised while fetching any part, in which case
+    the other parts may be missing too.
+    """
+    transcript_id: str
+    transcript: Optional[Transcript] = None
+    sentences: Optional[List[UtteredWord]] = None
+    paragraphs: Optional[List[Utterance]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        """Returns True iff every requested part was fetched."""
+        return self.error is None
+
+    def raise_for_error(self) -> "TranscriptBundle":
+        """Raises the error of a failed part, returns the bundle otherwise."""
+        if self.error is not None:
+            raise self.error
+        return self
+
+
+def check_parts(parts: Iterable[str]) -> Tuple[str, ...]:
+    """Returns the requested parts without duplicates, in the given order.
+
+    Throws:
+        ValueError: If a part is not one of BUNDLE_PARTS.
+    """
+    requested = tuple(parts)
+    if not requested or any(part not in BUNDLE_PARTS for part in requested):
+        raise ValueError(f"parts must be a non-empty selection of {BUNDLE_PARTS}, got {requested!r}")
+    return tuple(dict.fromkeys(requested))
@@ -0,0 +1,314 @@
+"""Local caches for completed transcripts, keyed by API path and storing raw response bodies, and for uploads, keyed by content hash."""
+
+import abc
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Optional, TYPE_CHECKING
+from urllib.parse import quote, unquote
+
+if TYPE_CHECKING:
+    from assemblyai.model import Upload
+
+
+@dataclass
+class CacheStats:
+    """Counters of a Cache. `entries` and `bytes` describe its current contents."""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class Cache(abc.ABC):
+    """Abstract cache of response bodies. Implementations are safe to share across threads.
+
+    A cache should not be shared between clients of different API keys.
+    """
+
+    def __init__(self) -> None:
+        self._stats = CacheStats()
+        self._lock = threading.RLock()
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of the cache counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached value of key, None on a miss."""
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes) -> None:
+        """Stores a value, evicting least recently used entries to stay within the limits."""
+        with self._lock:
+            self._stats.stores += 1
+            self._set(key, value)
+
+    def delete(self, key: str) -> None:
+        """Removes a key, if present."""
+        with self._lock:
+            self._delete(key)
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> Optional[bytes]:
+        """Returns the stored value of key, None if absent. Called with the lock held."""
+
+    @abc.abstractmethod
+    def _set(self, key: str, value: bytes) -> None:
+        """Stores a value. Called with the lock held."""
+
+    @abc.abstractmethod
+    def _delete(self, key: str) -> None:
+        """Removes a key, if present. Called with the lock held."""
+
+
+class MemoryCache(Cache):
+    """In-memory LRU cache bounded by entry count and total bytes."""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 256 * 1024 * 1024) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def _get(self, key: str) -> Optional[bytes]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        self._delete(key)
+        if len(value) > self.max_bytes:
+            return
+        self._entries[key] = value
+        self._stats.entries += 1
+        self._stats.bytes += len(value)
+        while self._stats.entries > self.max_entries or self._stats.bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._stats.entries -= 1
+            self._stats.bytes -= len(evicted)
+            self._stats.evictions += 1
+
+    def _delete(self, key: str) -> None:
+        value = self._entries.pop(key, None)
+        if value is not None:
+            self._stats.entries -= 1
+            self._stats.bytes -= len(value)
+
+
+class DiskCache(Cache):
+    """On-disk LRU cache bounded by entry count and total bytes. Each entry is one file in `directory`.
+
+    Existing entries are picked up on start, ordered by last use. Entries written later by other processes sharing the
+    directory are picked up when first read, so several worker processes can share one cache.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory: str, max_entries: int = 100000, max_bytes: int = 10 * 1024 * 1024 * 1024) -> None:
+        super().__init__()
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizes: "OrderedDict[str, int]" = OrderedDict()
+
+        os.makedirs(directory, exist_ok=True)
+        found = []
+        for name in os.listdir(directory):
+            if name.endswith(self.SUFFIX):
+                stat = os.stat(os.path.join(directory, name))
+                found.append((stat.st_mtime, unquote(name[:-len(self.SUFFIX)]), stat.st_size))
+        for _, key, size in sorted(found):
+            self._sizes[key] = size
+            self._stats.entries += 1
+            self._stats.bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, quote(key, safe="") + self.SUFFIX)
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                value = f.read()
+        except FileNotFoundError:
+            if key in self._sizes:
+                self._forget(key)
+            return None
+        if key in self._sizes:
+            self._sizes.move_to_end(key)
+        else:
+            # Written by another process since this cache was opened.
+            self._sizes[key] = len(value)
+            self._stats.entries += 1
+            self._stats.bytes += len(value)
+        now = time.time()
+        try:
+            os.utime(self._path(key), (now, now))
+        except FileNotFoundError:
+            # Evicted by another process since it was read.
+            self._forget(key)
+            return value
+        except OSError:
+            # The modification time only orders entries for eviction on the next start.
+            pass
+        self._evict()
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        self._delete(key)
+        if len(value) > self.max_bytes:
+            return
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(value)
+        os.replace(tmp, self._path(key))
+        self._sizes[key] = len(value)
+        self._stats.entries += 1
+        self._stats.bytes += len(value)
+        self._evict()
+
+    def _delete(self, key: str) -> None:
+        if key in self._sizes:
+            self._forget(key)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _forget(self, key: str) -> None:
+        size = self._sizes.pop(key)
+        self._stats.entries -= 1
+        self._stats.bytes -= size
+
+    def _evict(self) -> None:
+        while self._stats.entries > self.max_entries or self._stats.bytes > self.max_bytes:
+            key = next(iter(self._sizes))
+            self._delete(key)
+            self._stats.evictions += 1
+
+
+class TieredCache(Cache):
+    """A MemoryCache in front of a DiskCache. Disk hits are promoted to memory."""
+
+    def __init__(self, memory: MemoryCache, disk: DiskCache) -> None:
+        super().__init__()
+        self.memory = memory
+        self.disk = disk
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            stats = replace(self._stats)
+        disk = self.disk.stats
+        stats.evictions, stats.entries, stats.bytes = disk.evictions, disk.entries, disk.bytes
+        return stats
+
+    def _get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def _set(self, key: str, value: bytes) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def _delete(self, key: str) -> None:
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+
+class UploadCache:
+    """Maps the content hash of uploaded audio to its upload_url, so the same audio is not uploaded twice.
+
+    Entries are kept in `store` (a DiskCache makes them survive restarts and shareable between processes on one machine)
+    and expire `ttl` seconds after the upload. Keep `ttl` below the lifetime of upload URLs on the API side.
+
+    Args:
+        store: where entries are kept. Defaults to a MemoryCache.
+        ttl: seconds an upload_url is reused for.
+        algorithm: hashlib algorithm used to hash the content.
+        mmap_threshold: files of at least this many bytes are hashed through a memory map instead of buffered reads.
+    """
+
+    PREFIX = "upload"
+
+    def __init__(self, store: Optional[Cache] = None, ttl: float = 12 * 60 * 60, algorithm: str = "sha256", mmap_threshold: int = 16 * 1024 * 1024) -> None:
+        self.store = store if store is not None else MemoryCache()
+        self.ttl = ttl
+        self.algorithm = algorithm
+        self.mmap_threshold = mmap_threshold
+
+    def hasher(self) -> Any:
+        """A new, empty hashlib object of the configured algorithm."""
+        return hashlib.new(self.algorithm)
+
+    def digest_bytes(self, content: bytes) -> str:
+        """The content hash of an in-memory payload."""
+        hasher = self.hasher()
+        hasher.update(content)
+        return hasher.hexdigest()
+
+    def digest_file(self, filename: str, chunk_size: int = 64 * 1024 * 1024) -> str:
+        """The content hash of a file. Large files are memory-mapped, so they are hashed without copying them into Python."""
+        hasher = self.hasher()
+        with open(filename, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size and size >= self.mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, size, chunk_size):
+                            hasher.update(view[offset:offset + chunk_size])
+                    finally:
+                        view.release()
+            else:
+                for data in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(data)
+        return hasher.hexdigest()
+
+    def _key(self, digest: str) -> str:
+        return f"{UploadCache.PREFIX}/{self.algorithm}/{digest}"
+
+    def get(self, digest: str) -> Optional["Upload"]:
+        """Returns the Upload of previously uploaded content, None if unknown or expired."""
+        value = self.store.get(self._key(digest))
+        if value is None:
+            return None
+        entry = json.loads(value)
+        if time.time() - entry["uploaded_at"] >= self.ttl:
+            self.store.delete(self._key(digest))
+            return None
+        from assemblyai.model import Upload
+
+        return Upload(upload_url=entry["upload_url"])
+
+    def set(self, digest: str, upload: "Upload") -> None:
+        """Records the Upload of content with the given hash."""
+        entry = {"upload_url": upload.upload_url, "uploaded_at": time.time()}
+        self.store.set(self._key(digest), json.dumps(entry).encode())
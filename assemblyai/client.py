@@ -1,46 +1,422 @@
-from typing import Any, Dict, Optional
+import importlib
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar, Union, TYPE_CHECKING
 
 import httpx
 
-from assemblyai.api_endpoints import StreamEndpoint, TranscriptEndpoint, UploadEndpoint
+from assemblyai.cache import Cache, UploadCache
+from assemblyai.instrumentation import ByteCounter, Instrumentation, RequestTimer
+from assemblyai.policy import RequestPolicy
+from assemblyai.pool import DEFAULT_TIMEOUT, AsyncConnectionPool, ConnectionPool
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import (AsyncStreamEndpoint, AsyncTranscriptEndpoint, AsyncUploadEndpoint, StreamEndpoint,
+                                          TranscriptEndpoint, UploadEndpoint)
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from assemblyai.singleflight import SingleFlight
 
 BASE_URL_V2 = "https://api.assemblyai.com/v2/"
 JSON_CONTENT_TYPE = "application/json"
+DEFAULT_MAX_WORKERS = 16
 
+T = TypeVar("T")
+R = TypeVar("R")
 
-class Client:
-    """Basic Client for AssemblyAI APIs"""
 
-    def __init__(self, api_key: str) -> None:
-        self.client = httpx.Client()
+async def _sleep(delay: float) -> None:
+    # asyncio is imported on first use, so that sync-only users do not pay for importing it.
+    import asyncio
+
+    await asyncio.sleep(delay)
+
+
+def _release_on_close(response: httpx.Response, release: Callable[[], None]) -> None:
+    """Calls release once a streamed response is closed, by close() or aclose(), including when reading it to the end."""
+    if response.is_closed:
+        # The body was in memory already, e.g. from an httpx.MockTransport.
+        release()
+        return
+    close, aclose = response.close, response.aclose
+    lock = threading.Lock()
+    held = [True]
+
+    def release_once() -> None:
+        with lock:
+            if not held:
+                return
+            held.clear()
+        release()
+
+    def closing() -> None:
+        try:
+            close()
+        finally:
+            release_once()
+
+    async def aclosing() -> None:
+        try:
+            await aclose()
+        finally:
+            release_once()
+
+    response.close = closing  # type: ignore[method-assign]
+    response.aclose = aclosing  # type: ignore[method-assign]
 
-        self.client.headers =  httpx.Headers({
-            'authorization': api_key,
-        })
-        self.base_url = BASE_URL_V2
 
-        self.transcript = TranscriptEndpoint(self)
-        self.upload = UploadEndpoint(self)
-        self.stream = StreamEndpoint(self)
+class _LazyEndpoint:
+    """Creates an endpoint of a client on first access, so importing the client does not import the endpoints and models."""
+
+    _lock = threading.Lock()
+
+    def __init__(self, class_name: str) -> None:
+        self.class_name = class_name
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        with self._lock:
+            endpoint = obj.__dict__.get(self.name)
+            if endpoint is None:
+                endpoint_class = getattr(importlib.import_module("assemblyai.api_endpoints"), self.class_name)
+                endpoint = obj.__dict__[self.name] = endpoint_class(obj)
+        return endpoint
+
+
+class BaseClient:
+    """Request building and response parsing shared by Client and AsyncClient.
+
+    Args:
+        cache: cache for completed transcripts and their sentences and paragraphs. See assemblyai.cache.
+        upload_cache: content-hash cache of uploads, so the same audio is only uploaded once. See assemblyai.cache.UploadCache.
+        policy: rate limit, concurrency limit and retries applied to every request. Share one policy between clients
+            of the same account to keep all of them within its limits. Defaults to retries only. See assemblyai.policy.
+        instrumentation: hooks around every request and response decode, e.g. `Instrumentation(Metrics())`.
+            See assemblyai.instrumentation.
+        single_flight: coalesces concurrent identical retrievals of a transcript, its sentences or its paragraphs into one
+            request whose decoded result all callers share, e.g. `SingleFlight(negative_ttl=5)` to also remember 404s for
+            five seconds. Callers must then treat results as read-only. See assemblyai.singleflight.
+        timeout: httpx timeout of each request attempt, in seconds or as a httpx.Timeout.
+        max_workers: size of the worker pool used by map().
+    """
+
+    def __init__(self, api_key: str, cache: Optional[Cache] = None, upload_cache: Optional[UploadCache] = None, policy: Optional[RequestPolicy] = None, instrumentation: Optional[Instrumentation] = None, single_flight: Optional["SingleFlight"] = None, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        self.api_key = api_key
+        self.base_url = BASE_URL_V2
+        self.cache = cache
+        self.upload_cache = upload_cache
+        self.policy = policy or RequestPolicy()
+        self.instrumentation = instrumentation or Instrumentation()
+        self.single_flight = single_flight
+        self.max_workers = max_workers
+        self.headers = {"authorization": api_key}
 
     def _parse_response(self, response: httpx.Response) -> httpx.Response:
         """Parses the response from a client request. Throws a httpx.HTTPStatusError if an error status code is returned."""
         response.raise_for_status()
         return response
 
-    def request(self, path: str, method: str, query: Optional[Dict[Any, Any]] = None, data: Optional[Dict[Any, Any]] = None, body: Optional[Dict[Any, Any]] = None, headers: Optional[Dict[str, str]]=None) -> httpx.Response:
-        """ Sends a JSON-encoded, HTTP request with required authorization to AssemblyAI api.
+    def _build_request(self, http_client: Any, path: str, method: str, query: Optional[Dict[Any, Any]] = None, data: Optional[Any] = None, body: Optional[Dict[Any, Any]] = None, headers: Optional[Dict[str, str]]=None) -> httpx.Request:
+        """Builds a JSON-encoded, HTTP request for the AssemblyAI api.
 
-        Throws:
-            httpx.HTTPStatusError: If the response was unsuccessful.
-            httpx.TimeoutException: If a timeout occured on the request.
+        Raw (non-form) payloads passed as `data` are sent as the request content.
         """
-        request = self.client.build_request(method, f"{self.base_url}{path}", params=query, json=body, headers=headers, data=data)
-        response = self.client.send(request)
-        return self._parse_response(response)
+        content = None
+        if data is not None and not isinstance(data, dict):
+            content, data = data, None
+        return http_client.build_request(method, f"{self.base_url}{path}", params=query, json=body, headers=headers, data=data, content=content)
+
+    def _prepare_request(self, http_client: Any, path: str, method: str, query: Optional[Dict[Any, Any]], data: Optional[Any], body: Optional[Dict[Any, Any]], headers: Optional[Dict[str, str]], replayable: bool) -> Tuple[httpx.Request, RequestTimer]:
+        """Builds one attempt of a request and starts instrumenting it."""
+        counter = None
+        if self.instrumentation.active and not replayable:
+            data, counter = ByteCounter.wrap_content(data)
+        request = self._build_request(http_client, path, method, query=query, data=data, body=body, headers=headers)
+        return request, self.instrumentation.start(request, path, counter)
+
+    def _replayable(self, data: Optional[Any]) -> bool:
+        """Whether a request payload can be sent again. Streamed payloads are consumed by the first attempt."""
+        return data is None or isinstance(data, (bytes, bytearray, str, dict))
 
     def path_from_full_url(self, full_url: str) -> str:
         start_index = full_url.find(self.base_url)
         if start_index == -1:
             raise ValueError(f"full_url: {full_url} has unexpected based url. Expected {self.base_url}.")
-        return full_url[len(self.base_url):]
\ No newline at end of file
+        return full_url[len(self.base_url):]
+
+
+class Client(BaseClient):
+    """Basic Client for AssemblyAI APIs
+
+    A Client and its endpoints are safe to share between threads: requests go through one connection pool, and the cache,
+    policy, instrumentation and single flight serialize access to their own state. Use map() to run many calls through a
+    worker pool owned by the client.
+
+    Args:
+        transport: send requests through this transport, e.g. a httpx.MockTransport in tests.
+        pool: send requests through this pool, shared with other clients, e.g. of other API keys. By default the client
+            creates its own pool, closed with the client. See assemblyai.pool.
+    """
+
+    transcript: "TranscriptEndpoint" = _LazyEndpoint("TranscriptEndpoint")  # type: ignore[assignment]
+    upload: "UploadEndpoint" = _LazyEndpoint("UploadEndpoint")  # type: ignore[assignment]
+    stream: "StreamEndpoint" = _LazyEndpoint("StreamEndpoint")  # type: ignore[assignment]
+
+    def __init__(self, api_key: str, transport: Optional[httpx.BaseTransport] = None, cache: Optional[Cache] = None, upload_cache: Optional[UploadCache] = None, policy: Optional[RequestPolicy] = None, instrumentation: Optional[Instrumentation] = None, single_flight: Optional["SingleFlight"] = None, pool: Optional[ConnectionPool] = None, timeout: Union[float, httpx.Timeout, None] = DEFAULT_TIMEOUT, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        super().__init__(api_key, cache=cache, upload_cache=upload_cache, policy=policy, instrumentation=instrumentation, single_flight=single_flight, max_workers=max_workers)
+        if pool is not None and transport is not None:
+            raise ValueError("Pass either a transport or a pool, not both")
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else ConnectionPool(transport=transport)
+        self.client = httpx.Client(transport=self.pool.borrow(), headers=self.headers, timeout=timeout)
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._executor_lock = threading.Lock()
+
+    def request(self, path: str, method: str, query: Optional[Dict[Any, Any]] = None, data: Optional[Any] = None, body: Optional[Dict[Any, Any]] = None, headers: Optional[Dict[str, str]]=None, stream: bool = False) -> httpx.Response:
+        """ Sends a JSON-encoded, HTTP request with required authorization to AssemblyAI api.
+
+        Requests are rate limited and retried according to the client's policy.
+        With `stream`, the body of the returned response is not read: the caller reads it and must close the response,
+        which holds a slot of the policy's concurrency limit until then.
+
+        Throws:
+            httpx.HTTPStatusError: If the response was unsuccessful.
+            httpx.TimeoutException: If a timeout occured on the request.
+        """
+        replayable = self._replayable(data)
+        attempt = 0
+        while True:
+            self.policy.acquire()
+            # A streamed response keeps its slot of the policy until the caller closes it.
+            held = True
+            try:
+                request, timer = self._prepare_request(self.client, path, method, query, data, body, headers, replayable)
+                try:
+                    response = self.client.send(request, stream=stream)
+                except httpx.TransportError as error:
+                    timer.finish(attempt, error=error)
+                    raise
+                timer.finish(attempt, response=response)
+            except httpx.TransportError as error:
+                delay = self.policy.retry_delay(method, attempt, replayable, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.retry_delay(method, attempt, replayable, response=response)
+                if delay is None:
+                    if stream and response.is_error:
+                        response.close()
+                    elif stream:
+                        _release_on_close(response, self.policy.release)
+                        held = False
+                    return self._parse_response(response)
+                response.close()
+            finally:
+                if held:
+                    self.policy.release()
+            time.sleep(delay)
+            attempt += 1
+
+    @property
+    def executor(self) -> "ThreadPoolExecutor":
+        """The worker pool of map(), with max_workers threads, created on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="assemblyai")
+            return self._executor
+
+    def map(self, fn: Callable[[T], R], items: Iterable[T], workers: Optional[int] = None, ordered: bool = True) -> Iterator[R]:
+        """ Calls fn on every item from the client's worker pool, keeping `workers` calls in flight, and yields the results.
+
+        E.g. `client.map(client.transcript.get, transcript_ids, workers=8)`. Items are consumed lazily once iteration starts.
+        Results are yielded in input order, or as they complete if not `ordered`; completed results wait for the earlier ones
+        for at most as many calls again. A call that raised raises when its result is reached, and calls not started yet
+        are then cancelled.
+
+        Args:
+            workers: calls in flight at once, at most max_workers. Defaults to max_workers.
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        executor = self.executor
+        limit = min(workers or self.max_workers, self.max_workers)
+        pending = enumerate(items)
+        in_flight: Dict["Future[R]", int] = {}
+        done: Dict[int, "Future[R]"] = {}
+        next_index = 0
+
+        def refill() -> None:
+            while len(in_flight) < limit and len(in_flight) + len(done) < 2 * limit:
+                item = next(pending, None)
+                if item is None:
+                    return
+                in_flight[executor.submit(fn, item[1])] = item[0]
+
+        try:
+            refill()
+            while in_flight or done:
+                if (next_index not in done) if ordered else not done:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        done[in_flight.pop(future)] = future
+                ready = [next_index] if ordered else list(done)
+                while ready:
+                    index = ready.pop()
+                    if index not in done:
+                        break
+                    result = done.pop(index).result()
+                    next_index = index + 1
+                    if ordered:
+                        ready.append(next_index)
+                    refill()
+                    yield result
+                refill()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    def close(self) -> None:
+        """Closes the underlying HTTP connection pool, unless it is shared, and the worker pool of map()."""
+        self.client.close()
+        if self._owns_pool:
+            self.pool.close()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class AsyncClient(BaseClient):
+    """Asyncio Client for AssemblyAI APIs.
+
+    Mirrors Client, but every endpoint operation is awaitable. A single AsyncClient can drive many concurrent requests from one event loop.
+    Use it from that event loop only.
+
+    Args:
+        transport: send requests through this transport, e.g. a httpx.MockTransport in tests.
+        pool: send requests through this pool, shared with other clients on the same event loop. By default the client
+            creates its own pool, closed with the client. See assemblyai.pool.
+    """
+
+    transcript: "AsyncTranscriptEndpoint" = _LazyEndpoint("AsyncTranscriptEndpoint")  # type: ignore[assignment]
+    upload: "AsyncUploadEndpoint" = _LazyEndpoint("AsyncUploadEndpoint")  # type: ignore[assignment]
+    stream: "AsyncStreamEndpoint" = _LazyEndpoint("AsyncStreamEndpoint")  # type: ignore[assignment]
+
+    def __init__(self, api_key: str, transport: Optional[httpx.AsyncBaseTransport] = None, cache: Optional[Cache] = None, upload_cache: Optional[UploadCache] = None, policy: Optional[RequestPolicy] = None, instrumentation: Optional[Instrumentation] = None, single_flight: Optional["SingleFlight"] = None, pool: Optional[AsyncConnectionPool] = None, timeout: Union[float, httpx.Timeout, None] = DEFAULT_TIMEOUT, max_workers: int = DEFAULT_MAX_WORKERS) -> None:
+        super().__init__(api_key, cache=cache, upload_cache=upload_cache, policy=policy, instrumentation=instrumentation, single_flight=single_flight, max_workers=max_workers)
+        if pool is not None and transport is not None:
+            raise ValueError("Pass either a transport or a pool, not both")
+        self._owns_pool = pool is None
+        self.pool = pool if pool is not None else AsyncConnectionPool(transport=transport)
+        self.client = httpx.AsyncClient(transport=self.pool.borrow(), headers=self.headers, timeout=timeout)
+
+    async def request(self, path: str, method: str, query: Optional[Dict[Any, Any]] = None, data: Optional[Any] = None, body: Optional[Dict[Any, Any]] = None, headers: Optional[Dict[str, str]]=None, stream: bool = False) -> httpx.Response:
+        """ Sends a JSON-encoded, HTTP request with required authorization to AssemblyAI api.
+
+        Requests are rate limited and retried according to the client's policy.
+        With `stream`, the body of the returned response is not read: the caller reads it and must close the response,
+        which holds a slot of the policy's concurrency limit until then.
+
+        Throws:
+            httpx.HTTPStatusError: If the response was unsuccessful.
+            httpx.TimeoutException: If a timeout occured on the request.
+        """
+        replayable = self._replayable(data)
+        attempt = 0
+        while True:
+            await self.policy.aacquire()
+            # A streamed response keeps its slot of the policy until the caller closes it.
+            held = True
+            try:
+                request, timer = self._prepare_request(self.client, path, method, query, data, body, headers, replayable)
+                try:
+                    response = await self.client.send(request, stream=stream)
+                except httpx.TransportError as error:
+                    timer.finish(attempt, error=error)
+                    raise
+                timer.finish(attempt, response=response)
+            except httpx.TransportError as error:
+                delay = self.policy.retry_delay(method, attempt, replayable, error=error)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.retry_delay(method, attempt, replayable, response=response)
+                if delay is None:
+                    if stream and response.is_error:
+                        await response.aclose()
+                    elif stream:
+                        _release_on_close(response, self.policy.release)
+                        held = False
+                    return self._parse_response(response)
+                await response.aclose()
+            finally:
+                if held:
+                    self.policy.release()
+            await _sleep(delay)
+            attempt += 1
+
+    async def map(self, fn: Callable[[T], Awaitable[R]], items: Iterable[T], workers: Optional[int] = None, ordered: bool = True) -> AsyncIterator[R]:
+        """ Awaits fn on every item as tasks, keeping `workers` calls in flight, and yields the results. Mirrors Client.map().
+
+        Args:
+            workers: calls in flight at once. Defaults to max_workers.
+        """
+        import asyncio
+
+        limit = workers or self.max_workers
+        pending = enumerate(items)
+        in_flight: Dict["asyncio.Future[R]", int] = {}
+        done: Dict[int, "asyncio.Future[R]"] = {}
+        next_index = 0
+
+        def refill() -> None:
+            while len(in_flight) < limit and len(in_flight) + len(done) < 2 * limit:
+                item = next(pending, None)
+                if item is None:
+                    return
+                in_flight[asyncio.ensure_future(fn(item[1]))] = item[0]
+
+        try:
+            refill()
+            while in_flight or done:
+                if (next_index not in done) if ordered else not done:
+                    finished, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for future in finished:
+                        done[in_flight.pop(future)] = future
+                ready = [next_index] if ordered else list(done)
+                while ready:
+                    index = ready.pop()
+                    if index not in done:
+                        break
+                    result = done.pop(index).result()
+                    next_index = index + 1
+                    if ordered:
+                        ready.append(next_index)
+                    refill()
+                    yield result
+                refill()
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP connection pool, unless it is shared."""
+        await self.client.aclose()
+        if self._owns_pool:
+            await self.pool.aclose()
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,156 @@
+"""Compact, array-backed storage for transcript words."""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from assemblyai.model import UtteredWord
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - optional dependency
+    numpy = None
+
+
+class WordArray(Sequence[UtteredWord]):
+    """An append-only sequence of UtteredWord stored column by column.
+
+    `start`/`end` live in int32 arrays, `confidence` in a float64 array, all text in one string with offsets
+    and speakers as codes into a small table. Indexing builds a new UtteredWord from the columns, so changes to it
+    are not stored back. Uses a few tens of bytes per word instead of a dataclass instance each.
+    """
+
+    __slots__ = ("_starts", "_ends", "_confidences", "_offsets", "_speaker_codes", "_speaker_table", "_speaker_index", "_text", "_text_parts")
+
+    def __init__(self) -> None:
+        self._starts = array("i")
+        self._ends = array("i")
+        self._confidences = array("d")
+        self._offsets = array("I", [0])
+        self._speaker_codes = array("H")
+        # Code 0 is reserved for words without a speaker.
+        self._speaker_table: List[Optional[str]] = [None]
+        self._speaker_index: Dict[Optional[str], int] = {None: 0}
+        self._text = ""
+        self._text_parts: List[str] = []
+
+    @classmethod
+    def from_dicts(cls, words: Iterable[Dict[str, Any]]) -> "WordArray":
+        """Builds a WordArray from word dicts, as returned by the API."""
+        result = cls()
+        append = result.append
+        for w in words:
+            append(w["start"], w["end"], w["text"], w["confidence"], w["speaker"])
+        return result
+
+    @classmethod
+    def from_words(cls, words: Iterable[UtteredWord]) -> "WordArray":
+        """Builds a WordArray from UtteredWord objects."""
+        result = cls()
+        append = result.append
+        for w in words:
+            append(w.start, w.end, w.text, w.confidence, w.speaker)
+        return result
+
+    def append(self, start: int, end: int, text: str, confidence: float, speaker: Optional[str]) -> None:
+        """Adds a word to the end of the array."""
+        code = self._speaker_index.get(speaker)
+        if code is None:
+            code = self._speaker_index[speaker] = len(self._speaker_table)
+            self._speaker_table.append(speaker)
+        text = str(text)
+        self._starts.append(start)
+        self._ends.append(end)
+        self._confidences.append(confidence)
+        self._speaker_codes.append(code)
+        self._offsets.append(self._offsets[-1] + len(text))
+        self._text_parts.append(text)
+
+    def _buffer(self) -> str:
+        """The text of every word, concatenated."""
+        if self._text_parts:
+            self._text += "".join(self._text_parts)
+            self._text_parts = []
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @overload
+    def __getitem__(self, index: int) -> UtteredWord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "WordArray": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[UtteredWord, "WordArray"]:
+        if isinstance(index, slice):
+            return WordArray.from_words(self[i] for i in range(*index.indices(len(self))))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("WordArray index out of range")
+        offsets = self._offsets
+        return UtteredWord(
+            start=self._starts[index],
+            end=self._ends[index],
+            text=self._buffer()[offsets[index]:offsets[index + 1]],
+            confidence=self._confidences[index],
+            speaker=self._speaker_table[self._speaker_codes[index]],
+        )
+
+    def __iter__(self) -> Iterator[UtteredWord]:
+        text, offsets, table, codes = self._buffer(), self._offsets, self._speaker_table, self._speaker_codes
+        for i, (start, end, confidence) in enumerate(zip(self._starts, self._ends, self._confidences)):
+            yield UtteredWord(start, end, text[offsets[i]:offsets[i + 1]], confidence, table[codes[i]])
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, WordArray):
+            return (self._starts == other._starts and self._ends == other._ends and self._confidences == other._confidences
+                    and self.texts() == other.texts() and self.speakers() == other.speakers())
+        if isinstance(other, Sequence):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"WordArray({len(self)} words)"
+
+    def starts(self) -> Any:
+        """Start times in ms, as a numpy int32 array when numpy is installed, otherwise an array.array."""
+        return self._column(self._starts)
+
+    def ends(self) -> Any:
+        """End times in ms, as a numpy int32 array when numpy is installed, otherwise an array.array."""
+        return self._column(self._ends)
+
+    def confidences(self) -> Any:
+        """Confidences, as a numpy float64 array when numpy is installed, otherwise an array.array."""
+        return self._column(self._confidences)
+
+    def texts(self) -> List[str]:
+        """The text of every word."""
+        text, offsets = self._buffer(), self._offsets
+        return [text[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+
+    def speakers(self) -> List[Optional[str]]:
+        """The speaker of every word."""
+        table = self._speaker_table
+        return [table[c] for c in self._speaker_codes]
+
+    def speaker_codes(self) -> Any:
+        """Speaker codes indexing speaker_table(), in the same form as starts()."""
+        return self._column(self._speaker_codes)
+
+    def speaker_table(self) -> List[Optional[str]]:
+        """Speaker of each code returned by speaker_codes(). Code 0 means no speaker."""
+        return list(self._speaker_table)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the columns, in bytes."""
+        columns = (self._starts, self._ends, self._confidences, self._offsets, self._speaker_codes)
+        return sum(c.itemsize * len(c) for c in columns) + len(self._buffer())
+
+    def _column(self, column: array) -> Any:
+        if numpy is not None:
+            return numpy.frombuffer(column, dtype=column.typecode).copy()
+        return array(column.typecode, column)
@@ -0,0 +1,135 @@
+"""Fast decoding of API responses into model dataclasses.
+
+`decode(cls, data)` builds the same objects as `cls.from_dict(data)`, including dataclasses_json's coercion of
+primitive values, but through a decoder generated once per class instead of walking type hints for every object.
+With `compact_words=True`, every `List[UtteredWord]` field is decoded into a columnar.WordArray instead.
+"""
+
+import dataclasses
+import enum
+import json
+import typing
+from typing import Any, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from assemblyai.columnar import WordArray
+from assemblyai.model import UtteredWord
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+T = TypeVar("T")
+
+_PRIMITIVES = (int, float, str, bool)
+_decoders: Dict[Tuple[type, bool], Callable[[Any], Any]] = {}
+
+
+def loads(content: bytes) -> Any:
+    """Parses a JSON response body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def decode(cls: Type[T], data: Dict[str, Any], compact_words: bool = False) -> T:
+    """Decodes a dict into an instance of the dataclass `cls`."""
+    return decoder_for(cls, compact_words)(data)
+
+
+def decoder_for(cls: Type[T], compact_words: bool = False) -> Callable[[Dict[str, Any]], T]:
+    """Returns the decoder for the dataclass `cls`, generating it on first use."""
+    decoder = _decoders.get((cls, compact_words))
+    if decoder is None:
+        decoder = _decoders[(cls, compact_words)] = _generate_decoder(cls, compact_words)
+    return decoder
+
+
+def _coerce(tp: type, value: Any) -> Any:
+    return value if isinstance(value, tp) else tp(value)
+
+
+def _converter(tp: Any, compact_words: bool) -> Optional[Callable[[Any], Any]]:
+    """Returns a function converting a non-None JSON value to `tp`, None if the value is used as-is."""
+    origin = getattr(tp, "__origin__", None)
+    args = [a for a in getattr(tp, "__args__", ()) if not isinstance(a, TypeVar)]
+
+    if origin is typing.Union:
+        non_none = [a for a in args if a is not type(None)]
+        return _converter(non_none[0], compact_words) if len(non_none) == 1 else None
+    if isinstance(tp, type) and issubclass(tp, enum.Enum):
+        return tp
+    if isinstance(tp, type) and issubclass(tp, _PRIMITIVES):
+        return lambda value: _coerce(tp, value)
+    if dataclasses.is_dataclass(tp):
+        return decoder_for(tp, compact_words)
+    if origin is list and compact_words and args == [UtteredWord]:
+        return WordArray.from_dicts
+    if origin is list:
+        item = _converter(args[0], compact_words) if args else None
+        if item is None:
+            return list
+        return lambda value: [item(x) for x in value]
+    if origin is dict:
+        key = _converter(args[0], compact_words) if args else None
+        val = _converter(args[1], compact_words) if len(args) > 1 else None
+        if key is None and val is None:
+            return dict
+        key = key or (lambda x: x)
+        val = val or (lambda x: x)
+        return lambda value: {key(k): val(v) for k, v in value.items()}
+    return None
+
+
+def _generate_decoder(cls: type, compact_words: bool) -> Callable[[Dict[str, Any]], Any]:
+    """Generates the source of a decoder for `cls` and compiles it."""
+    hints = typing.get_type_hints(cls)
+    namespace: Dict[str, Any] = {"cls": cls, "new": object.__new__, "coerce": _coerce}
+    direct = not hasattr(cls, "__post_init__") and all(f.init for f in dataclasses.fields(cls))
+    lines = [
+        "def decode(d):",
+        "    if d.__class__ is cls:",
+        "        return d",
+        "    r = {}",
+    ]
+
+    for i, f in enumerate(dataclasses.fields(cls)):
+        if not f.init:
+            continue
+        tp = hints[f.name]
+        if f.default is not dataclasses.MISSING:
+            namespace[f"default_{i}"] = f.default
+            missing = f"default_{i}"
+        elif f.default_factory is not dataclasses.MISSING:  # type: ignore
+            namespace[f"factory_{i}"] = f.default_factory  # type: ignore
+            missing = f"factory_{i}()"
+        else:
+            missing = None
+
+        if missing is None:
+            indent = "    "
+            lines.append(f"{indent}v = d[{f.name!r}]")
+        else:
+            indent = "        "
+            lines += [f"    if {f.name!r} in d:", f"{indent}v = d[{f.name!r}]"]
+
+        convert = _converter(tp, compact_words)
+        if isinstance(tp, type) and issubclass(tp, _PRIMITIVES) and not issubclass(tp, enum.Enum):
+            # Inline the common case of a value that already has the right type.
+            namespace[f"type_{i}"] = tp
+            lines.append(f"{indent}if v is not None and v.__class__ is not type_{i}: v = coerce(type_{i}, v)")
+        elif convert is not None:
+            namespace[f"convert_{i}"] = convert
+            lines.append(f"{indent}if v is not None: v = convert_{i}(v)")
+        lines.append(f"{indent}r[{f.name!r}] = v")
+
+        if missing is not None:
+            lines += ["    else:", f"        r[{f.name!r}] = {missing}"]
+
+    if direct:
+        lines += ["    o = new(cls)", "    o.__dict__.update(r)", "    return o"]
+    else:
+        lines += ["    return cls(**r)"]
+
+    exec("\n".join(lines), namespace)
+    return namespace["decode"]
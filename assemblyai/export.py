@@ -0,0 +1,164 @@
+"""Exports of transcripts to captions (SRT, WebVTT), JSON Lines and length-limited text chunks.
+
+Every export is a generator of strings built from the words, sentences or utterances it is given, one caption or record at
+a time, so a 10 hour transcript is exported in constant memory on top of the transcript itself. write() sends those
+strings to a file, a path or a socket in buffered batches as they are produced.
+
+    with open("episode.srt", "w") as f:
+        export.write(export.srt(transcript.words, max_chars_per_line=32), f)
+"""
+
+import io
+import json
+from dataclasses import dataclass
+from typing import IO, Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from assemblyai import decoding
+
+# Attributes exported by jsonl() by default. Nested `words` are left out, as they are exported separately.
+JSONL_FIELDS = ("start", "end", "text", "confidence", "speaker")
+
+
+@dataclass
+class Caption:
+    """One caption cue. Times are in milliseconds."""
+    index: int
+    start: int
+    end: int
+    lines: List[str]
+    speaker: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+@dataclass
+class TextChunk:
+    """A piece of an utterance's text no longer than the requested maximum. `first` is True for the first piece of each utterance."""
+    text: str
+    speaker: Optional[str] = None
+    first: bool = True
+
+
+def captions(words: Iterable[Any], max_chars_per_line: int = 42, max_lines: int = 2, max_duration: int = 7000, max_gap: int = 1500, split_on_speaker: bool = True) -> Iterator[Caption]:
+    """Groups timed words (UtteredWord, or anything with start, end, text and speaker) into caption cues.
+
+    A cue ends when its lines are full, when it would last longer than `max_duration` ms, after a silence longer than
+    `max_gap` ms, and, with `split_on_speaker`, when the speaker changes. Words are never split across lines; a word
+    longer than a line gets a line of its own.
+    """
+    index = 0
+    lines: List[str] = []
+    line: List[str] = []
+    line_length = 0
+    start = end = 0
+    speaker = None
+
+    for word in words:
+        text = word.text
+        if line or lines:
+            if (word.end - start > max_duration or word.start - end > max_gap
+                    or (split_on_speaker and word.speaker != speaker)
+                    or (line_length + 1 + len(text) > max_chars_per_line and len(lines) + 1 >= max_lines)):
+                index += 1
+                yield Caption(index, start, end, lines + [" ".join(line)], speaker)
+                lines, line, line_length = [], [], 0
+            elif line_length + 1 + len(text) > max_chars_per_line:
+                lines.append(" ".join(line))
+                line, line_length = [], 0
+        if not line and not lines:
+            start, speaker = word.start, word.speaker
+        line_length += len(text) + (1 if line else 0)
+        line.append(text)
+        end = word.end
+
+    if line:
+        yield Caption(index + 1, start, end, lines + [" ".join(line)], speaker)
+
+
+def _timestamp(ms: int, separator: str) -> str:
+    seconds, ms = divmod(max(0, int(ms)), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def srt(words: Iterable[Any], **caption_options: Any) -> Iterator[str]:
+    """SubRip captions of timed words, one cue per string. Takes the options of captions()."""
+    for cue in captions(words, **caption_options):
+        yield f"{cue.index}\n{_timestamp(cue.start, ',')} --> {_timestamp(cue.end, ',')}\n{cue.text}\n\n"
+
+
+def webvtt(words: Iterable[Any], speaker_tags: bool = True, **caption_options: Any) -> Iterator[str]:
+    """WebVTT captions of timed words, one cue per string. With `speaker_tags`, cues carry a <v> voice tag for their speaker.
+
+    Takes the options of captions().
+    """
+    yield "WEBVTT\n\n"
+    for cue in captions(words, **caption_options):
+        text = cue.text
+        if speaker_tags and cue.speaker is not None:
+            text = f"<v Speaker {cue.speaker}>{text}"
+        yield f"{_timestamp(cue.start, '.')} --> {_timestamp(cue.end, '.')}\n{text}\n\n"
+
+
+def jsonl(items: Iterable[Any], fields: Sequence[str] = JSONL_FIELDS) -> Iterator[str]:
+    """JSON Lines of words, sentences or utterances, one object with the given attributes per line."""
+    if decoding.orjson is not None:
+        dumps = decoding.orjson.dumps
+        for item in items:
+            yield dumps({name: getattr(item, name, None) for name in fields}).decode() + "\n"
+        return
+    encoder = json.JSONEncoder(ensure_ascii=False)
+    for item in items:
+        yield encoder.encode({name: getattr(item, name, None) for name in fields}) + "\n"
+
+
+def text_chunks(utterances: Iterable[Any], max_chars: int = 2000) -> Iterator[TextChunk]:
+    """Splits the text of each utterance (or sentence, or paragraph) into chunks of at most `max_chars` characters.
+
+    Chunks are split at whitespace where possible, e.g. to fit the 2000 character limit of a Notion paragraph.
+    """
+    for utterance in utterances:
+        text, speaker, first = utterance.text, getattr(utterance, "speaker", None), True
+        while len(text) > max_chars:
+            cut = text.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            yield TextChunk(text[:cut], speaker, first)
+            text, first = text[cut:].lstrip(" "), False
+        if text or first:
+            yield TextChunk(text, speaker, first)
+
+
+def write(chunks: Iterable[str], target: Union[str, IO[Any], Any], buffer_size: int = 1 << 16, encoding: str = "utf-8") -> int:
+    """Writes exported strings to `target` as they are produced, returning the number of characters written.
+
+    `target` is a path, a text or binary file object, or a socket. Strings are joined into writes of about `buffer_size`
+    characters, so output starts before the export finishes and memory stays bounded.
+    """
+    if isinstance(target, str):
+        with open(target, "w", encoding=encoding, newline="") as f:
+            return write(chunks, f, buffer_size, encoding)
+
+    if hasattr(target, "sendall"):
+        send = lambda s: target.sendall(s.encode(encoding))  # noqa: E731
+    elif isinstance(target, (io.BufferedIOBase, io.RawIOBase)):
+        send = lambda s: target.write(s.encode(encoding))  # noqa: E731
+    else:
+        send = target.write
+
+    written = pending_size = 0
+    pending: List[str] = []
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= buffer_size:
+            send("".join(pending))
+            written += pending_size
+            pending, pending_size = [], 0
+    if pending:
+        send("".join(pending))
+        written += pending_size
+    return written
@@ -0,0 +1,426 @@
+"""Hooks around the requests and response decoding of a client, with metrics and span exporters built on them."""
+
+import bisect
+import contextlib
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def route_template(path: str) -> str:
+    """The endpoint of an API path with the resource id replaced, e.g. "transcript/{id}/sentences"."""
+    parts = path.split("?")[0].strip("/").split("/")
+    return "/".join("{id}" if i == 1 else p for i, p in enumerate(parts))
+
+
+@dataclass
+class RequestEvent:
+    """One attempt of a request, as passed to after_request hooks. Times are in seconds."""
+    method: str
+    endpoint: str
+    url: str
+    attempt: int
+    started: float
+    duration: float
+    status_code: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    pool_wait: Optional[float] = None
+    error: Optional[BaseException] = None
+
+
+@dataclass
+class DecodeEvent:
+    """Decoding of one response body into model objects, as passed to after_decode hooks."""
+    model: str
+    started: float
+    duration: float
+    nbytes: int
+
+
+class Instrumentation:
+    """Hooks called around every request attempt and response decode of a client.
+
+    - before_request(request: httpx.Request): called with each attempt before it is sent; may add headers.
+    - after_request(event: RequestEvent): called once each attempt finished or failed.
+    - after_decode(event: DecodeEvent): called once a response body was decoded.
+
+    Observers passed in, such as Metrics or SpanRecorder, are registered for whichever of these methods they define.
+    With no hooks, requests are not timed at all.
+    """
+
+    def __init__(self, *observers: Any) -> None:
+        self.before_request: List[Callable[[httpx.Request], Any]] = []
+        self.after_request: List[Callable[[RequestEvent], Any]] = []
+        self.after_decode: List[Callable[[DecodeEvent], Any]] = []
+        for observer in observers:
+            self.add(observer)
+
+    def add(self, observer: Any) -> None:
+        """Registers the before_request, after_request and after_decode methods of an observer."""
+        for name in ("before_request", "after_request", "after_decode"):
+            hook = getattr(observer, name, None)
+            if hook is not None:
+                getattr(self, name).append(hook)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.before_request or self.after_request)
+
+    def start(self, request: httpx.Request, path: str, counter: Optional["ByteCounter"] = None) -> "RequestTimer":
+        """Calls the before_request hooks and starts timing an attempt of a request to the API `path`."""
+        if not self.active:
+            return NULL_TIMER
+        for hook in self.before_request:
+            hook(request)
+        return RequestTimer(self, request, route_template(path), counter)
+
+    def decode_timer(self, model: str) -> "DecodeTimer":
+        """A DecodeTimer for a body decoded piece by piece, a no-op without after_decode hooks."""
+        return DecodeTimer(self if self.after_decode else None, model)
+
+    def decoding(self, model: str, nbytes: int) -> Any:
+        """Context manager timing the decoding of a response body, a no-op without after_decode hooks."""
+        if not self.after_decode:
+            return contextlib.nullcontext()
+        return self._timed_decode(model, nbytes)
+
+    @contextlib.contextmanager
+    def _timed_decode(self, model: str, nbytes: int) -> Iterator[None]:
+        started = time.perf_counter()
+        yield
+        duration = time.perf_counter() - started
+        event = DecodeEvent(model, time.time() - duration, duration, nbytes)
+        for hook in self.after_decode:
+            hook(event)
+
+
+class DecodeTimer:
+    """Times the decoding of a response body that arrives in pieces, e.g. a streamed transcript.
+
+    Enter it around the decoding of each piece, adding the size of the piece to `nbytes`, then call finish() to call the
+    after_decode hooks once, with the time spent decoding rather than waiting for the body.
+    """
+
+    def __init__(self, instrumentation: Optional[Instrumentation], model: str) -> None:
+        self.instrumentation = instrumentation
+        self.model = model
+        self.nbytes = 0
+        self.duration = 0.0
+        self.started: Optional[float] = None
+        self._entered = 0.0
+
+    def __enter__(self) -> "DecodeTimer":
+        if self.instrumentation is not None:
+            if self.started is None:
+                self.started = time.time()
+            self._entered = time.perf_counter()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self.instrumentation is not None:
+            self.duration += time.perf_counter() - self._entered
+
+    def finish(self) -> None:
+        if self.instrumentation is None or self.started is None:
+            return
+        event = DecodeEvent(self.model, self.started, self.duration, self.nbytes)
+        for hook in self.instrumentation.after_decode:
+            hook(event)
+
+
+class RequestTimer:
+    """Times one attempt of a request, from before it is sent until finish()."""
+
+    def __init__(self, instrumentation: Optional[Instrumentation], request: Optional[httpx.Request], endpoint: str, counter: Optional["ByteCounter"]) -> None:
+        self.instrumentation = instrumentation
+        self.request = request
+        self.endpoint = endpoint
+        self.counter = counter
+        self.trace: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        if request is not None:
+            request.extensions["trace"] = self._record
+
+    def _record(self, name: str, info: Any) -> None:
+        self.trace.setdefault(name, time.perf_counter())
+
+    def finish(self, attempt: int, response: Optional[httpx.Response] = None, error: Optional[BaseException] = None) -> None:
+        """Calls the after_request hooks with the timings of the finished or failed attempt."""
+        if self.instrumentation is None:
+            return
+        request = self.request
+        duration = time.perf_counter() - self.started
+        # Waiting for the connection pool is not traced. It is the time until a new connection is opened, or until a
+        # reused one starts sending.
+        trace = self.trace
+        connected = trace.get("connection.connect_tcp.started") or trace.get("http11.send_request_headers.started") or trace.get("http2.send_request_headers.started")
+        length = request.headers.get("content-length")
+        event = RequestEvent(
+            method=request.method,
+            endpoint=self.endpoint,
+            url=str(request.url),
+            attempt=attempt,
+            started=time.time() - duration,
+            duration=duration,
+            status_code=response.status_code if response is not None else None,
+            bytes_sent=int(length) if length is not None else (self.counter.count if self.counter is not None else 0),
+            bytes_received=_bytes_received(response),
+            pool_wait=connected - self.started if connected is not None else None,
+            error=error,
+        )
+        for hook in self.instrumentation.after_request:
+            hook(event)
+
+
+def _bytes_received(response: Optional[httpx.Response]) -> int:
+    if response is None:
+        return 0
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    # Transports that do not stream (e.g. httpx.MockTransport) leave num_bytes_downloaded at 0. A streamed response is
+    # finished before its body is read, so its size is not known yet.
+    try:
+        return len(response.content)
+    except httpx.ResponseNotRead:
+        return 0
+
+
+NULL_TIMER = RequestTimer(None, None, "", None)
+
+
+class ByteCounter:
+    """Counts the bytes of a streamed request body as the HTTP client pulls them."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    @classmethod
+    def wrap_content(cls, data: Any) -> Tuple[Any, "ByteCounter"]:
+        """Wraps a streamed request body, sync or async, in a new counter."""
+        counter = cls()
+        return (counter.awrap(data) if hasattr(data, "__aiter__") else counter.wrap(data)), counter
+
+    def wrap(self, chunks: Any) -> Iterator[Any]:
+        for chunk in chunks:
+            self.count += len(chunk)
+            yield chunk
+
+    async def awrap(self, chunks: Any) -> Any:
+        async for chunk in chunks:
+            self.count += len(chunk)
+            yield chunk
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, as exported to Prometheus."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs, ending with "+Inf"."""
+        result, total = [], 0
+        for bound, count in zip([str(b) for b in self.buckets] + ["+Inf"], self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+@dataclass
+class EndpointMetrics:
+    """Request metrics of one method and endpoint."""
+    latency: Histogram = field(default_factory=Histogram)
+    statuses: Dict[str, int] = field(default_factory=dict)
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    retries: int = 0
+
+
+class Metrics:
+    """Aggregates request and decode events into per-endpoint histograms and counters.
+
+    Register it with `Instrumentation(Metrics())`. Read it through `endpoints`, `decode` and `pool_wait`, or export it
+    in the Prometheus text format with prometheus_text() or serve().
+    """
+
+    def __init__(self, namespace: str = "assemblyai") -> None:
+        self.namespace = namespace
+        self.endpoints: Dict[Tuple[str, str], EndpointMetrics] = {}
+        self.decode: Dict[str, Histogram] = {}
+        self.decode_bytes: Dict[str, int] = {}
+        self.pool_wait = Histogram()
+        self._lock = threading.Lock()
+        self._server: Optional["ThreadingHTTPServer"] = None
+
+    def after_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            metrics = self.endpoints.setdefault((event.method, event.endpoint), EndpointMetrics())
+            metrics.latency.observe(event.duration)
+            status = str(event.status_code) if event.status_code is not None else type(event.error).__name__
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bytes_sent += event.bytes_sent
+            metrics.bytes_received += event.bytes_received
+            metrics.retries += 1 if event.attempt else 0
+            if event.pool_wait is not None:
+                self.pool_wait.observe(event.pool_wait)
+
+    def after_decode(self, event: DecodeEvent) -> None:
+        with self._lock:
+            self.decode.setdefault(event.model, Histogram()).observe(event.duration)
+            self.decode_bytes[event.model] = self.decode_bytes.get(event.model, 0) + event.nbytes
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: List[Tuple[str, Histogram]]) -> None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} histogram"])
+            for labels, h in series:
+                sep = "," if labels else ""
+                for le, count in h.cumulative():
+                    lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {count}')
+                lines.append(f"{name}_sum{{{labels}}} {h.sum}")
+                lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        def counter(name: str, help_text: str, series: List[Tuple[str, float]]) -> None:
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in series)
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+            labels = {key: f'method="{key[0]}",endpoint="{key[1]}"' for key, _ in endpoints}
+            histogram(f"{ns}_request_duration_seconds", "Time from sending a request to receiving its full response.", [(labels[k], m.latency) for k, m in endpoints])
+            counter(f"{ns}_requests_total", "Request attempts by response status, or error type.",
+                    [(f'{labels[k]},status="{status}"', n) for k, m in endpoints for status, n in sorted(m.statuses.items())])
+            counter(f"{ns}_request_bytes_sent_total", "Request body bytes sent.", [(labels[k], m.bytes_sent) for k, m in endpoints])
+            counter(f"{ns}_request_bytes_received_total", "Response body bytes received.", [(labels[k], m.bytes_received) for k, m in endpoints])
+            counter(f"{ns}_request_retries_total", "Request attempts after the first.", [(labels[k], m.retries) for k, m in endpoints])
+            histogram(f"{ns}_pool_wait_seconds", "Time spent waiting for a pooled connection.", [("", self.pool_wait)])
+            histogram(f"{ns}_decode_duration_seconds", "Time spent decoding response bodies into models.", [(f'model="{m}"', h) for m, h in sorted(self.decode.items())])
+            counter(f"{ns}_decode_bytes_total", "Response body bytes decoded into models.", [(f'model="{m}"', n) for m, n in sorted(self.decode_bytes.items())])
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Serves prometheus_text() at any path from a threaded HTTP server in the background. Returns the bound (host, port)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                body = metrics.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("content-type", "text/plain; version=0.0.4")
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[:2]
+
+    def stop(self) -> None:
+        """Stops the HTTP server started by serve()."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+@dataclass
+class Span:
+    """An OpenTelemetry-shaped span of one request attempt or decode. Times are in ns since the epoch."""
+    name: str
+    trace_id: str
+    span_id: str
+    start_time_unix_nano: int
+    end_time_unix_nano: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    status: str = "OK"
+
+
+class SpanRecorder:
+    """Turns request and decode events into spans with OpenTelemetry semantic attribute names.
+
+    Keeps the latest `max_spans` spans in `spans` and passes each one to `export`, if given, e.g. to forward them
+    to a collector. Does not depend on the OpenTelemetry SDK; see OpenTelemetryHook for that.
+    """
+
+    def __init__(self, export: Optional[Callable[[Span], Any]] = None, max_spans: int = 1000) -> None:
+        self.export = export
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def after_request(self, event: RequestEvent) -> None:
+        attributes = {
+            "http.request.method": event.method,
+            "url.full": event.url,
+            "http.route": event.endpoint,
+            "http.request.resend_count": event.attempt,
+            "http.request.body.size": event.bytes_sent,
+            "http.response.body.size": event.bytes_received,
+        }
+        if event.status_code is not None:
+            attributes["http.response.status_code"] = event.status_code
+        if event.error is not None:
+            attributes["error.type"] = type(event.error).__name__
+        if event.pool_wait is not None:
+            attributes["assemblyai.pool_wait_s"] = event.pool_wait
+        failed = event.error is not None or (event.status_code or 0) >= 400
+        self._record(f"{event.method} {event.endpoint}", event.started, event.duration, attributes, "ERROR" if failed else "OK")
+
+    def after_decode(self, event: DecodeEvent) -> None:
+        self._record(f"decode {event.model}", event.started, event.duration, {"assemblyai.model": event.model, "assemblyai.body.size": event.nbytes}, "OK")
+
+    def _record(self, name: str, started: float, duration: float, attributes: Dict[str, Any], status: str) -> None:
+        start_ns = int(started * 1e9)
+        span = Span(name, os.urandom(16).hex(), os.urandom(8).hex(), start_ns, start_ns + int(duration * 1e9), attributes, status)
+        self.spans.append(span)
+        if self.export is not None:
+            self.export(span)
+
+
+class OpenTelemetryHook(SpanRecorder):
+    """Records request and decode spans through an OpenTelemetry tracer. Requires the `opentelemetry-api` package.
+
+    OpenTelemetry is imported when the first hook is created, so importing the client does not import it.
+    """
+
+    def __init__(self, tracer: Any = None) -> None:
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError("OpenTelemetryHook requires the opentelemetry-api package") from None
+        super().__init__(max_spans=0)
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("assemblyai")
+
+    def _record(self, name: str, started: float, duration: float, attributes: Dict[str, Any], status: str) -> None:
+        start_ns = int(started * 1e9)
+        trace = self._trace
+        span = self.tracer.start_span(name, kind=trace.SpanKind.CLIENT, attributes=attributes, start_time=start_ns)
+        if status == "ERROR":
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end(end_time=start_ns + int(duration * 1e9))
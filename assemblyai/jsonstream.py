@@ -0,0 +1,213 @@
+"""Incremental decoding of a JSON object as its bytes arrive.
+
+ObjectStream is a push parser for a single top-level JSON object, e.g. a transcript response body. The elements of its
+top-level arrays are decoded one at a time with json.JSONDecoder.raw_decode, so neither the whole body nor the whole
+parsed tree has to be held in memory: elements of the arrays named in `stream_keys` are handed back to the caller as they
+complete, and every other field is collected.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Collection, Dict, List, Tuple
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DIGITS = frozenset("0123456789")
+_NUMBER_TAIL = re.compile(r"[.eE][+\-]?[0-9]*")
+
+
+def _truncated(buffer: str, end: int) -> bool:
+    """Whether a value decoded up to `end` may be a number that continues past the end of the buffer, e.g. "12" of "125"
+    or "1" of "1.5"."""
+    if buffer[end - 1] not in _DIGITS:
+        return False
+    return end == len(buffer) or (buffer[end] in ".eE" and _NUMBER_TAIL.fullmatch(buffer, end) is not None)
+
+# Parser states
+_OBJECT, _FIRST_KEY, _KEY, _COLON, _VALUE, _AFTER_VALUE, _FIRST_ITEM, _ITEM, _AFTER_ITEM, _DONE = range(10)
+
+
+class ObjectStream:
+    """Push parser for one JSON object, yielding the elements of selected top-level arrays as they are decoded.
+
+        stream = ObjectStream(stream_keys=("words",))
+        for chunk in response.iter_bytes():
+            for key, word in stream.feed(chunk):
+                ...
+        for key, word in stream.close():
+            ...
+        stream.fields  # every other top-level field
+
+    Args:
+        stream_keys: top-level keys whose array elements are returned by feed() instead of being collected.
+        compact_after: consumed characters after which the buffer is trimmed.
+    """
+
+    def __init__(self, stream_keys: Collection[str] = (), compact_after: int = 1 << 16) -> None:
+        self.stream_keys = stream_keys
+        self.compact_after = compact_after
+        self.fields: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _OBJECT
+        self._key = ""
+        self._items: List[Any] = []
+        # Buffer length before retrying to decode a value that was incomplete, so that large values are retried a logarithmic number of times.
+        self._retry_at = 0
+
+    def feed(self, data: bytes) -> List[Tuple[str, Any]]:
+        """Parses more of the body. Returns the (key, element) pairs of streamed arrays completed by this data."""
+        self._buffer += self._text.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """Ends the body, returning the remaining (key, element) pairs of streamed arrays. `fields` is then complete.
+
+        Throws:
+            ValueError: If the body is not a complete JSON object.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        events = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError(f"Incomplete JSON object at character {self._pos}")
+        return events
+
+    def _decode(self, final: bool) -> Tuple[bool, Any]:
+        """Decodes the value at the current position. Returns (False, None) if more data is needed."""
+        if not final and len(self._buffer) < self._retry_at:
+            return False, None
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            self._retry_at = self._pos + 2 * (len(self._buffer) - self._pos)
+            return False, None
+        if not final and _truncated(self._buffer, end):
+            return False, None
+        self._retry_at = 0
+        self._pos = end
+        return True, value
+
+    def _parse(self, final: bool) -> List[Tuple[str, Any]]:
+        events: List[Tuple[str, Any]] = []
+        buffer = self._buffer
+        while self._state != _DONE:
+            self._pos = _WHITESPACE.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                break
+            char, state = buffer[self._pos], self._state
+
+            if state == _OBJECT:
+                self._expect(char, "{")
+                self._state = _FIRST_KEY
+            elif state in (_FIRST_KEY, _KEY):
+                if char == "}" and state == _FIRST_KEY:
+                    self._pos += 1
+                    self._state = _DONE
+                    break
+                self._expect(char, '"', advance=False)
+                complete, self._key = self._decode(final)
+                if not complete:
+                    break
+                self._state = _COLON
+            elif state == _COLON:
+                self._expect(char, ":")
+                self._state = _VALUE
+            elif state == _VALUE:
+                if char == "[":
+                    self._pos += 1
+                    self._items = []
+                    self._state = _FIRST_ITEM
+                    continue
+                complete, value = self._decode(final)
+                if not complete:
+                    break
+                self.fields[self._key] = value
+                self._state = _AFTER_VALUE
+            elif state == _AFTER_VALUE:
+                self._pos += 1
+                if char == "}":
+                    self._state = _DONE
+                elif char == ",":
+                    self._state = _KEY
+                else:
+                    raise ValueError(f"Expected ',' or '}}' at character {self._pos - 1}, got {char!r}")
+            elif state in (_FIRST_ITEM, _ITEM):
+                if char == "]" and state == _FIRST_ITEM:
+                    self._end_array()
+                    continue
+                if not self._decode_items(events, final):
+                    break
+            elif state == _AFTER_ITEM:
+                if char == "]":
+                    self._end_array()
+                elif char == ",":
+                    self._pos += 1
+                    self._state = _ITEM
+                else:
+                    raise ValueError(f"Expected ',' or ']' at character {self._pos}, got {char!r}")
+
+            if self._pos > self.compact_after:
+                buffer = self._trim()
+        if self._pos > self.compact_after:
+            self._trim()
+        return events
+
+    def _trim(self) -> str:
+        """Drops the consumed start of the buffer."""
+        self._buffer = self._buffer[self._pos:]
+        self._retry_at = max(0, self._retry_at - self._pos)
+        self._pos = 0
+        return self._buffer
+
+    def _decode_items(self, events: List[Tuple[str, Any]], final: bool) -> bool:
+        """Decodes consecutive array elements in one tight loop, the hot path for long arrays. Returns False if more data is needed."""
+        if not final and len(self._buffer) < self._retry_at:
+            return False
+        buffer, key, raw_decode = self._buffer, self._key, self._decoder.raw_decode
+        streamed = key in self.stream_keys
+        pos = self._pos
+        while True:
+            try:
+                value, end = raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if final:
+                    raise
+                self._retry_at = pos + 2 * (len(buffer) - pos)
+                break
+            if not final and _truncated(buffer, end):
+                break
+            if streamed:
+                events.append((key, value))
+            else:
+                self._items.append(value)
+            self._retry_at = 0
+            # Skip the separator, usually ", " or ",", to the next element. Anything else goes through the state machine.
+            if buffer.startswith(", ", end):
+                pos = end + 2
+            elif buffer.startswith(",", end):
+                pos = end + 1
+            else:
+                self._pos = end
+                self._state = _AFTER_ITEM
+                return True
+            pos = _WHITESPACE.match(buffer, pos).end()
+            self._pos = pos
+            self._state = _ITEM
+        return False
+
+    def _expect(self, char: str, expected: str, advance: bool = True) -> None:
+        if char != expected:
+            raise ValueError(f"Expected {expected!r} at character {self._pos}, got {char!r}")
+        if advance:
+            self._pos += 1
+
+    def _end_array(self) -> None:
+        self._pos += 1
+        if self._key not in self.stream_keys:
+            self.fields[self._key] = self._items
+        self._items = []
+        self._state = _AFTER_VALUE
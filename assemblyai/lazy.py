@@ -0,0 +1,123 @@
+"""Transcripts whose heavy fields are decoded on first access."""
+
+import dataclasses
+import threading
+import typing
+from typing import Any, Dict
+
+from assemblyai import decoding
+from assemblyai.model import Transcript
+
+LAZY_FIELDS = ("words", "utterances", "sentiment_analysis_results", "entities", "iab_categories_result", "auto_highlights_result")
+
+
+class _LazyField:
+    """Data descriptor that decodes the raw JSON value of a field on first access and caches the result.
+
+    Decoding holds a lock of the instance, so threads sharing a transcript decode each field once and all see its value.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        values = obj.__dict__
+        if self.name in values:
+            return values[self.name]
+
+        with values["_lazy_lock"]:
+            # Another thread may have decoded the field while this one waited for the lock.
+            if self.name in values:
+                return values[self.name]
+            raw = values.get("_lazy_raw", {})
+            if self.name not in raw:
+                raise AttributeError(self.name)
+            value = obj._decode_lazy_field(self.name, raw[self.name])
+            values[self.name] = value
+            raw.pop(self.name, None)
+            return value
+
+    def __set__(self, obj: Any, value: Any) -> None:
+        with obj.__dict__.setdefault("_lazy_lock", threading.Lock()):
+            obj.__dict__[self.name] = value
+            obj.__dict__.get("_lazy_raw", {}).pop(self.name, None)
+
+
+class LazyTranscript(Transcript):
+    """A Transcript that keeps `words`, `utterances`, `sentiment_analysis_results`, `entities`, `iab_categories_result`
+    and `auto_highlights_result` as raw JSON until they are first read.
+
+    Behaves like Transcript in every other way and compares equal to a Transcript with the same field values.
+    When orjson is installed, the raw values are held as compact JSON bytes. Otherwise they stay as the parsed values.
+    """
+
+    words = _LazyField("words")
+    utterances = _LazyField("utterances")
+    sentiment_analysis_results = _LazyField("sentiment_analysis_results")
+    entities = _LazyField("entities")
+    iab_categories_result = _LazyField("iab_categories_result")
+    auto_highlights_result = _LazyField("auto_highlights_result")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Transcript):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in dataclasses.fields(Transcript))
+
+    __hash__ = None  # type: ignore
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks cannot be copied or pickled. The raw values are copied too: decoding a field pops its raw value, which
+        # must not take it away from a copy sharing the dict.
+        with self.__dict__.setdefault("_lazy_lock", threading.Lock()):
+            state = dict(self.__dict__)
+            state.pop("_lazy_lock", None)
+            if "_lazy_raw" in state:
+                state["_lazy_raw"] = dict(state["_lazy_raw"])
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state, _lazy_lock=threading.Lock())
+        if "_lazy_raw" in state:
+            self.__dict__["_lazy_raw"] = dict(state["_lazy_raw"])
+
+    @property
+    def pending_fields(self) -> typing.List[str]:
+        """Names of heavy fields that have not been decoded yet."""
+        return list(self.__dict__.get("_lazy_raw", {}))
+
+    def _decode_lazy_field(self, name: str, raw: Any) -> Any:
+        if isinstance(raw, bytes):
+            raw = decoding.loads(raw)
+        if raw is None:
+            return None
+        convert = _field_converter(name, self.__dict__.get("_lazy_compact_words", False))
+        return convert(raw) if convert else raw
+
+
+_converters: Dict[typing.Tuple[str, bool], Any] = {}
+
+
+def _field_converter(name: str, compact_words: bool) -> Any:
+    key = (name, compact_words)
+    if key not in _converters:
+        _converters[key] = decoding._converter(typing.get_type_hints(Transcript)[name], compact_words)
+    return _converters[key]
+
+
+def decode_lazy(data: Dict[str, Any], compact_words: bool = False) -> LazyTranscript:
+    """Decodes a transcript dict into a LazyTranscript, deferring its heavy fields."""
+    light = {k: v for k, v in data.items() if k not in LAZY_FIELDS}
+    transcript = decoding.decode(LazyTranscript, light)
+    raw = {k: data[k] for k in LAZY_FIELDS if k in data}
+    if decoding.orjson is not None:
+        raw = {k: decoding.orjson.dumps(v) for k, v in raw.items()}
+
+    values = transcript.__dict__
+    for name in raw:
+        values.pop(name, None)
+    values["_lazy_raw"] = raw
+    values["_lazy_compact_words"] = compact_words
+    values["_lazy_lock"] = threading.Lock()
+    return transcript
@@ -0,0 +1,232 @@
+"""Incremental local mirror of every transcript on an account, stored in SQLite.
+
+A sync lists transcripts newest first, starting after the newest one listed by the previous sync, and saves a checkpoint
+in the same transaction as each page, so an interrupted sync resumes from the last saved page. It then retrieves the
+full transcript of every listed transcript that completed or errored since it was last retrieved, with bounded
+concurrency, and upserts the response bodies. Transcripts still queued or processing are retrieved again on each sync
+until they reach a final status, as a listing after the checkpoint does not include them any more.
+
+    with TranscriptMirror(client.transcript, "transcripts.db") as mirror:
+        stats = mirror.sync()
+        transcript = mirror.get(transcript_id)
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, List, Optional, Tuple, TYPE_CHECKING
+
+import httpx
+
+from assemblyai.decoding import decode, loads
+from assemblyai.model import Transcript, TranscriptStatus
+from assemblyai.poller import FINAL_STATUSES
+from assemblyai.policy import RETRY_STATUS_CODES
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import TranscriptEndpoint
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    audio_url TEXT,
+    created TEXT,
+    completed TEXT,
+    listed_at REAL NOT NULL,
+    fetched_status TEXT,
+    fetched_at REAL,
+    audio_duration REAL,
+    language_code TEXT,
+    text TEXT,
+    error TEXT,
+    body BLOB
+);
+CREATE INDEX IF NOT EXISTS transcripts_status ON transcripts (status);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT,
+    PRIMARY KEY (scope, name)
+);
+"""
+
+_FINAL = tuple(s.value for s in FINAL_STATUSES)
+
+
+@dataclass
+class SyncStats:
+    """What one sync() did. `failed` counts transcripts not retrieved after connection errors, throttling or 5xx
+    responses, which the next sync retries. `last_error` describes the last of them."""
+    pages: int = 0
+    listed: int = 0
+    fetched: int = 0
+    failed: int = 0
+    last_error: Optional[str] = None
+    resumed: bool = False
+    complete: bool = False
+    elapsed: float = 0.0
+
+
+class TranscriptMirror:
+    """Local SQLite copy of the transcripts listed by a TranscriptEndpoint.
+
+    Args:
+        endpoint: the endpoint of the account to mirror.
+        path: SQLite database file, created if missing.
+        page_size: transcripts requested per listing page.
+        max_concurrency: transcripts retrieved at once.
+        created_on: only mirror transcripts created on this day. Each day keeps its own checkpoints.
+    """
+
+    def __init__(self, endpoint: "TranscriptEndpoint", path: str, page_size: int = 100, max_concurrency: int = 8, created_on: Optional[date] = None) -> None:
+        self.endpoint = endpoint
+        self.path = path
+        self.page_size = page_size
+        self.max_concurrency = max_concurrency
+        self.created_on = created_on
+        self.scope = created_on.isoformat() if created_on else "all"
+        self.db = sqlite3.connect(path)
+        self.db.executescript(_SCHEMA)
+
+    def _checkpoint(self, name: str) -> Optional[str]:
+        row = self.db.execute("SELECT value FROM checkpoints WHERE scope = ? AND name = ?", (self.scope, name)).fetchone()
+        return row[0] if row else None
+
+    def _set_checkpoint(self, name: str, value: Optional[str]) -> None:
+        self.db.execute("INSERT INTO checkpoints (scope, name, value) VALUES (?, ?, ?) ON CONFLICT (scope, name) DO UPDATE SET value = excluded.value", (self.scope, name, value))
+
+    def sync(self, fetch: bool = True, max_pages: Optional[int] = None) -> SyncStats:
+        """Lists the transcripts created since the last sync, then retrieves those that need it.
+
+        Args:
+            fetch: also retrieve full transcripts; otherwise only the listing is mirrored.
+            max_pages: stop listing after this many pages, leaving a checkpoint the next sync resumes from.
+        """
+        started = time.monotonic()
+        stats = SyncStats()
+        stats.complete = self.list_new(stats, max_pages)
+        if fetch:
+            self.fetch_pending(stats)
+        stats.elapsed = time.monotonic() - started
+        return stats
+
+    def list_new(self, stats: Optional[SyncStats] = None, max_pages: Optional[int] = None) -> bool:
+        """Mirrors the listing of transcripts newer than the last complete listing. Returns True if it reached the end."""
+        stats = stats or SyncStats()
+        newest = self._checkpoint("newest_id")
+        cursor = self._checkpoint("run_before_id")
+        stats.resumed = cursor is not None
+
+        request = self.endpoint._all_request(self.page_size, created_on=self.created_on, before_id=cursor, after_id=newest)
+        for page in self.endpoint._iter_pages(request, prefetch=True):
+            # Stop at the newest transcript of the previous sync, in case a page does not honor after_id.
+            ids = [t.id for t in page]
+            reached_newest = newest in ids
+            transcripts = page[:ids.index(newest)] if reached_newest else page
+            now = time.time()
+            with self.db:
+                if transcripts and self._checkpoint("run_newest_id") is None:
+                    self._set_checkpoint("run_newest_id", transcripts[0].id)
+                self.db.executemany(
+                    "INSERT INTO transcripts (id, status, audio_url, created, completed, listed_at) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET status = excluded.status, audio_url = excluded.audio_url, "
+                    "created = excluded.created, completed = excluded.completed, listed_at = excluded.listed_at",
+                    [(t.id, _status(t.status), t.audio_url, t.created, t.completed, now) for t in transcripts])
+                if page:
+                    self._set_checkpoint("run_before_id", page[-1].id)
+            stats.pages += 1
+            stats.listed += len(transcripts)
+            if reached_newest:
+                break
+            if max_pages is not None and stats.pages >= max_pages:
+                return False
+
+        with self.db:
+            run_newest = self._checkpoint("run_newest_id")
+            if run_newest is not None:
+                self._set_checkpoint("newest_id", run_newest)
+            self._set_checkpoint("run_newest_id", None)
+            self._set_checkpoint("run_before_id", None)
+        return True
+
+    def pending_ids(self) -> List[str]:
+        """Ids of transcripts to retrieve: not yet in a final status, or in a final status not retrieved yet."""
+        rows = self.db.execute(
+            f"SELECT id FROM transcripts WHERE fetched_status IS NULL OR fetched_status != status "
+            f"OR status NOT IN ({', '.join('?' * len(_FINAL))}) ORDER BY created, id", _FINAL).fetchall()
+        return [row[0] for row in rows]
+
+    def fetch_pending(self, stats: Optional[SyncStats] = None) -> SyncStats:
+        """Retrieves pending_ids() with at most max_concurrency requests in flight, upserting each batch as it completes.
+
+        Transcripts that fail with a connection error, throttling or a 5xx response are counted in `failed` and left
+        pending for the next sync. Any other error, e.g. an invalid API key, is raised after the batches already
+        retrieved are saved.
+        """
+        stats = stats or SyncStats()
+        ids = self.pending_ids()
+        batch = self.max_concurrency * 4
+
+        def fetch(transcript_id: str) -> Tuple[str, Optional[bytes]]:
+            try:
+                return transcript_id, self.endpoint._handle_request(transcript_id, "GET").content
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUS_CODES:
+                    raise
+                stats.last_error = f"{transcript_id}: {e}"
+            except httpx.TransportError as e:
+                stats.last_error = f"{transcript_id}: {e!r}"
+            return transcript_id, None
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            for i in range(0, len(ids), batch):
+                rows = []
+                for transcript_id, body in pool.map(fetch, ids[i:i + batch]):
+                    if body is None:
+                        stats.failed += 1
+                        continue
+                    data = loads(body)
+                    status = data.get("status")
+                    rows.append((status, status, time.time(), data.get("audio_duration"), data.get("language_code"), data.get("text"), data.get("error"), body, transcript_id))
+                with self.db:
+                    self.db.executemany(
+                        "UPDATE transcripts SET status = ?, fetched_status = ?, fetched_at = ?, audio_duration = ?, language_code = ?, "
+                        "text = ?, error = ?, body = ? WHERE id = ?", rows)
+                stats.fetched += len(rows)
+        return stats
+
+    def get(self, transcript_id: str, compact_words: bool = False) -> Optional[Transcript]:
+        """The mirrored transcript, None if it is unknown. Transcripts listed but not retrieved yet only have their listing fields."""
+        row = self.db.execute("SELECT body, id, status, audio_url, created, completed FROM transcripts WHERE id = ?", (transcript_id,)).fetchone()
+        if row is None:
+            return None
+        if row[0] is not None:
+            return decode(Transcript, loads(row[0]), compact_words)
+        return Transcript(id=row[1], status=TranscriptStatus(row[2]), audio_url=row[3], created=row[4], completed=row[5])
+
+    def ids(self, status: Optional[TranscriptStatus] = None) -> List[str]:
+        """Ids of the mirrored transcripts, newest first, optionally only those with the given status."""
+        if status is None:
+            rows = self.db.execute("SELECT id FROM transcripts ORDER BY created DESC, id DESC").fetchall()
+        else:
+            rows = self.db.execute("SELECT id FROM transcripts WHERE status = ? ORDER BY created DESC, id DESC", (_status(status),)).fetchall()
+        return [row[0] for row in rows]
+
+    def __len__(self) -> int:
+        return self.db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def close(self) -> None:
+        self.db.close()
+
+    def __enter__(self) -> "TranscriptMirror":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _status(status: Any) -> Optional[str]:
+    return status.value if isinstance(status, TranscriptStatus) else status
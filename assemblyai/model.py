@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from dataclasses_json import dataclass_json
+from assemblyai.serialization import dataclass_json
 from enum import Enum
 from typing import Any, Dict, Optional, List
 
@@ -219,13 +219,13 @@ class Transcript:
     utterances: List[Utterance] = field(default_factory=list)
 
     ## TODO: Add these back in. Currently these fields are correctly documented by AssemblyAI.
-    auto_highlights_result: Optional[AutoHighlightResults] = field(default_factory=list)
+    auto_highlights_result: Optional[AutoHighlightResults] = None
     # redact_pii_policies: Optional[List[EntityType]] = field(default_factory=list)
     chapters: List[Chapter] = field(default_factory=list)
     sentiment_analysis_results: List[SentimentAnalysisResult] = field(default_factory=list)
     entities: List[DetectedEntity] = field(default_factory=list)
     ##content_safety_labels: List[ContentSafetyLabel] = field(default_factory=list)
-    iab_categories_result: IABCategoryResults = field(default_factory=list)
+    iab_categories_result: Optional[IABCategoryResults] = None
     # custom_spelling: List[CustomSpelling] = field(default_factory=list)
 
 
@@ -0,0 +1,254 @@
+"""Rate limiting and retries shared by every request of a client, or of several clients."""
+
+import email.utils
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Optional, Tuple, TYPE_CHECKING
+
+import httpx
+
+if TYPE_CHECKING:
+    import asyncio
+
+IDEMPOTENT_METHODS = ("GET", "HEAD", "OPTIONS", "PUT", "DELETE")
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class PolicyStats:
+    """Counters of a RequestPolicy."""
+    requests: int = 0
+    throttled: int = 0
+    retried: int = 0
+    rate_limited_wait: float = 0.0
+    concurrency_wait: float = 0.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` requests per second on average and bursts of up to `burst` requests.
+
+    Implemented as a generic cell rate algorithm: each caller reserves the next free slot and is told how long to wait for
+    it, so concurrent callers are spread out evenly rather than released together.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Takes a token, returning the seconds to wait before using it."""
+        return self.reserve_at(time.monotonic())
+
+    def reserve_at(self, start: float) -> float:
+        """Takes a token for use no earlier than `start` (a time.monotonic() value), returning the seconds to wait after `start`."""
+        with self._lock:
+            arrival = max(self._next, start)
+            self._next = arrival + self._interval
+            return max(0.0, arrival - self._tolerance - start)
+
+
+class ConcurrencyLimit:
+    """Counting semaphore usable from threads and from coroutines on any event loop at the same time."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._waiters: Deque[Tuple["asyncio.AbstractEventLoop", "asyncio.Future[None]"]] = deque()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_use >= self.limit:
+                self._condition.wait()
+            self._in_use += 1
+
+    async def aacquire(self) -> None:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        with self._condition:
+            if self._in_use < self.limit:
+                self._in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._condition:
+                handed_over = waiter not in self._waiters
+                if not handed_over:
+                    self._waiters.remove(waiter)
+            if handed_over and waiter[1].done() and not waiter[1].cancelled():
+                # The slot was handed over just before the cancellation: pass it on.
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._condition:
+            if self._waiters:
+                # Hand the slot straight to a waiting coroutine.
+                loop, future = self._waiters.popleft()
+                loop.call_soon_threadsafe(self._hand_over, future)
+                return
+            self._in_use -= 1
+            self._condition.notify()
+
+    def _hand_over(self, future: "asyncio.Future[None]") -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class RequestPolicy:
+    """Rate limit, concurrency limit and retries applied to every request of the clients that share it.
+
+    Retries, with jittered exponential backoff:
+    - 429 responses, for any method, as the API did not process the request. All requests sharing the policy are held
+      back for the `Retry-After` of the response, so a throttled fleet of workers slows down together.
+    - 5xx responses and dropped connections, for idempotent methods only. A create is not retried,
+      as it may have been processed.
+    - Failures to connect, for any method.
+    Requests whose body is a stream (e.g. uploads) are never retried here, as the body cannot be sent twice.
+
+    Args:
+        requests_per_second: average request rate allowed, unlimited if None.
+        burst: requests allowed at once before the rate applies.
+        max_concurrency: requests allowed in flight at once, unlimited if None.
+        retries: attempts after the first one.
+        backoff: base delay in seconds of the exponential backoff.
+        max_backoff: upper bound of a backoff delay, and of an honored `Retry-After`.
+    """
+
+    def __init__(self, requests_per_second: Optional[float] = None, burst: int = 1, max_concurrency: Optional[int] = None, retries: int = 3, backoff: float = 0.5, max_backoff: float = 60.0) -> None:
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second else None
+        self.concurrency = ConcurrencyLimit(max_concurrency) if max_concurrency else None
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._stats = PolicyStats()
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    @property
+    def stats(self) -> PolicyStats:
+        """A snapshot of the policy counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def _count(self, **increments: Any) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self._stats, name, getattr(self._stats, name) + value)
+
+    def acquire(self) -> None:
+        """Blocks until a request may be sent. Must be paired with release()."""
+        started = time.monotonic()
+        if self.concurrency is not None:
+            self.concurrency.acquire()
+        acquired = time.monotonic()
+        delay = self._delay(acquired)
+        if delay:
+            try:
+                time.sleep(delay)
+            except BaseException:
+                # E.g. KeyboardInterrupt: the caller does not call release() for a failed acquire().
+                self.release()
+                raise
+        self._count(requests=1, concurrency_wait=acquired - started, rate_limited_wait=delay)
+
+    async def aacquire(self) -> None:
+        """acquire() for coroutines."""
+        import asyncio
+
+        started = time.monotonic()
+        if self.concurrency is not None:
+            await self.concurrency.aacquire()
+        acquired = time.monotonic()
+        delay = self._delay(acquired)
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except BaseException:
+                # A task cancelled while waiting for the rate limit does not call release().
+                self.release()
+                raise
+        self._count(requests=1, concurrency_wait=acquired - started, rate_limited_wait=delay)
+
+    def _delay(self, now: float) -> float:
+        """Seconds to wait for the end of a throttling hold and then for a token."""
+        hold = max(0.0, self._resume_at - now)
+        if self.bucket is None:
+            return hold
+        # Tokens are reserved from the end of the hold, so held requests are spread out rather than released at once.
+        return hold + self.bucket.reserve_at(now + hold)
+
+    def release(self) -> None:
+        """Marks a request acquired with acquire() or aacquire() as finished."""
+        if self.concurrency is not None:
+            self.concurrency.release()
+
+    def retry_delay(self, method: str, attempt: int, replayable: bool, response: Optional[httpx.Response] = None, error: Optional[Exception] = None, retries: Optional[int] = None, backoff: Optional[float] = None, idempotent: Optional[bool] = None) -> Optional[float]:
+        """Seconds to wait before retrying a request that got `response` or failed with `error`, None to not retry.
+
+        `attempt` is the 0-based number of the attempt that just finished. A 429 response holds back every request sharing
+        the policy for its `Retry-After`, whether or not this request is retried. An httpx.HTTPStatusError `error` is judged
+        by its response, which is not counted again. `retries`, `backoff` and `idempotent` override the policy's retries and
+        backoff and the idempotency of the method for one request, e.g. an upload that can safely be sent again.
+        """
+        retry_after = None
+        if response is not None:
+            retry_after = self._observe(response)
+        elif isinstance(error, httpx.HTTPStatusError):
+            response = error.response
+            retry_after = _retry_after(response)
+        if attempt >= (self.retries if retries is None else retries) or not replayable:
+            return None
+
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if response is not None:
+            if response.status_code not in RETRY_STATUS_CODES or (response.status_code != 429 and not idempotent):
+                return None
+        elif not (isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                  or (idempotent and isinstance(error, httpx.TransportError))):
+            return None
+
+        delay = random.uniform(0, min(self.max_backoff, (self.backoff if backoff is None else backoff) * 2 ** attempt))
+        if retry_after is not None:
+            delay = min(self.max_backoff, retry_after)
+        self._count(retried=1)
+        return delay
+
+    def _observe(self, response: httpx.Response) -> Optional[float]:
+        """Counts a 429 response and holds back requests for its Retry-After. Returns the Retry-After of the response."""
+        retry_after = _retry_after(response)
+        if response.status_code == 429:
+            self._count(throttled=1)
+            if retry_after is not None:
+                with self._lock:
+                    self._resume_at = max(self._resume_at, time.monotonic() + min(self.max_backoff, retry_after))
+        return retry_after
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds requested by a Retry-After header, given either as seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
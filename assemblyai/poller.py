@@ -0,0 +1,335 @@
+"""Multiplexed completion polling for many transcripts at once."""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, TYPE_CHECKING
+
+from assemblyai.model import Transcript, TranscriptStatus
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import AsyncTranscriptEndpoint, TranscriptEndpoint
+
+
+FINAL_STATUSES = (TranscriptStatus.completed, TranscriptStatus.error)
+
+
+@dataclass
+class PollState:
+    """Polling state of one tracked transcript."""
+    transcript_id: str
+    future: Any
+    status: Optional[TranscriptStatus] = None
+    audio_duration: Optional[float] = None
+    status_since: float = 0.0
+    next_check: float = 0.0
+    list_misses: int = 0
+
+
+class AdaptiveBackoff:
+    """Decides how long to wait before checking a transcript again.
+
+    The interval grows with the time already spent in the current status. Once the audio duration is known,
+    checks are spread towards the expected completion time, estimated as `processing_ratio` of the audio duration.
+    """
+
+    def __init__(self, min_interval: float = 1.0, max_interval: float = 60.0, growth: float = 0.25, processing_ratio: float = 0.3) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.processing_ratio = processing_ratio
+
+    def interval(self, state: PollState, now: float) -> float:
+        """Seconds until `state` should next be checked."""
+        waited = now - state.status_since
+        interval = waited * self.growth
+        if state.audio_duration and state.status == TranscriptStatus.processing:
+            expected_remaining = state.audio_duration * self.processing_ratio - waited
+            interval = max(interval, expected_remaining / 2)
+        return min(self.max_interval, max(self.min_interval, interval))
+
+
+class BasePoller:
+    """Scheduling shared by TranscriptPoller and AsyncTranscriptPoller.
+
+    Due transcripts are checked with one paginated `all(status=...)` listing when at least `list_threshold` of them are due,
+    and with individual `get()` calls otherwise. The full Transcript is only downloaded once a transcript is completed or errored.
+    Transcripts the listing fails to find `max_list_misses` times in a row are checked individually.
+    """
+
+    def __init__(self, backoff: Optional[AdaptiveBackoff] = None, list_threshold: int = 5, page_size: int = 100, max_list_pages: int = 3, max_list_misses: int = 3, max_concurrency: int = 8) -> None:
+        self.backoff = backoff or AdaptiveBackoff()
+        self.list_threshold = list_threshold
+        self.page_size = page_size
+        self.max_list_pages = max_list_pages
+        self.max_list_misses = max_list_misses
+        self.max_concurrency = max_concurrency
+        self._states: Dict[str, PollState] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> List[str]:
+        """IDs of transcripts that are tracked and not yet resolved."""
+        with self._lock:
+            return list(self._states)
+
+    def _track(self, transcript_id: str, audio_duration: Optional[float], new_future: Callable[[], Any]) -> Any:
+        with self._lock:
+            state = self._states.get(transcript_id)
+            if state is None:
+                now = time.monotonic()
+                state = PollState(transcript_id, new_future(), audio_duration=audio_duration, status_since=now, next_check=now)
+                self._states[transcript_id] = state
+            return state.future
+
+    def untrack(self, transcript_id: str) -> None:
+        """Stops polling a transcript. Its future is cancelled, so callers waiting for it do not block forever."""
+        with self._lock:
+            state = self._states.pop(transcript_id, None)
+        if state is not None:
+            state.future.cancel()
+
+    def _tracked_futures(self) -> List[Any]:
+        with self._lock:
+            return [s.future for s in self._states.values()]
+
+    def _due(self, now: float) -> List[PollState]:
+        with self._lock:
+            return [s for s in self._states.values() if s.next_check <= now]
+
+    def _next_delay(self, now: float) -> Optional[float]:
+        """Seconds until the next transcript is due, None if nothing is tracked."""
+        with self._lock:
+            if not self._states:
+                return None
+            return max(0.0, min(s.next_check for s in self._states.values()) - now)
+
+    def _partition(self, due: List[PollState], finished: Set[str]) -> List[PollState]:
+        """Given the IDs a listing found finished, returns the due states to check individually and reschedules the rest."""
+        now = time.monotonic()
+        to_check = []
+        for state in due:
+            if state.transcript_id in finished or state.list_misses + 1 >= self.max_list_misses:
+                to_check.append(state)
+            else:
+                state.list_misses += 1
+                state.next_check = now + self.backoff.interval(state, now)
+        return to_check
+
+    def _finished_in_page(self, page: List[Transcript], wanted: Set[str]) -> Set[str]:
+        return {t.id for t in page if t.id in wanted and t.status in FINAL_STATUSES}
+
+    def _observe(self, state: PollState, transcript: Transcript) -> bool:
+        """Records a fetched transcript. Returns True iff it is final and the state was removed."""
+        now = time.monotonic()
+        if transcript.status in FINAL_STATUSES:
+            with self._lock:
+                self._states.pop(state.transcript_id, None)
+            return True
+
+        if transcript.status != state.status:
+            state.status = transcript.status
+            state.status_since = now
+        state.audio_duration = transcript.audio_duration or state.audio_duration
+        state.list_misses = 0
+        state.next_check = now + self.backoff.interval(state, now)
+        return False
+
+    def _fail(self, state: PollState) -> None:
+        with self._lock:
+            self._states.pop(state.transcript_id, None)
+
+
+class TranscriptPoller(BasePoller):
+    """Waits for many transcripts to complete, sharing requests between them.
+
+    Safe to track() from other threads while run() is in progress. Transcripts are checked on a pool of `max_concurrency`
+    threads that lives as long as the poller: close() it, or use it as a context manager, once done.
+    """
+
+    def __init__(self, endpoint: "TranscriptEndpoint", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.endpoint = endpoint
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def close(self) -> None:
+        """Shuts down the threads checking transcripts. A later poll_once() starts new ones."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "TranscriptPoller":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def track(self, transcript_id: str, audio_duration: Optional[float] = None) -> "Future[Transcript]":
+        """Starts polling a transcript. The returned future resolves to the full Transcript once it is completed or errored."""
+        return self._track(transcript_id, audio_duration, Future)
+
+    def poll_once(self) -> Optional[float]:
+        """Checks every due transcript once. Returns the seconds until the next one is due, None if nothing is tracked."""
+        due = self._due(time.monotonic())
+        if len(due) >= self.list_threshold:
+            try:
+                due = self._partition(due, self._list_finished({s.transcript_id for s in due}))
+            except Exception:
+                # The listing is only an optimisation, fall back to checking every due transcript.
+                pass
+
+        if due:
+            list(self._executor().map(self._check, due))
+        return self._next_delay(time.monotonic())
+
+    def run(self, futures: Optional[Iterable["Future[Transcript]"]] = None, timeout: Optional[float] = None) -> None:
+        """Polls until the given futures (by default, every tracked transcript) are resolved.
+
+        Throws:
+            TimeoutError: If futures are still unresolved after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waiting = list(futures) if futures is not None else self._tracked_futures()
+        while not all(f.done() for f in waiting):
+            delay = self.poll_once()
+            if all(f.done() for f in waiting) or delay is None:
+                return
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{sum(not f.done() for f in waiting)} transcripts still pending.")
+                delay = min(delay, remaining)
+            time.sleep(delay)
+
+    def wait(self, transcript_ids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Transcript]:
+        """Tracks the given transcripts and blocks until all are completed or errored.
+
+        Throws:
+            TimeoutError: If transcripts are still pending after `timeout` seconds.
+            httpx.HTTPStatusError: If fetching a transcript failed.
+        """
+        futures = {i: self.track(i) for i in transcript_ids}
+        self.run(futures.values(), timeout=timeout)
+        return {i: f.result() for i, f in futures.items()}
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency)
+            return self._pool
+
+    def _list_finished(self, wanted: Set[str]) -> Set[str]:
+        """Pages through completed and errored transcripts, returning which of `wanted` were found."""
+        finished: Set[str] = set()
+        for status in FINAL_STATUSES:
+            before_id = None
+            for _ in range(self.max_list_pages):
+                page = self.endpoint.all(limit=self.page_size, status=status, before_id=before_id)
+                finished |= self._finished_in_page(page, wanted)
+                if wanted <= finished or len(page) < self.page_size:
+                    break
+                before_id = page[-1].id
+        return finished
+
+    def _check(self, state: PollState) -> None:
+        try:
+            transcript = self.endpoint.get(state.transcript_id)
+        except Exception as e:
+            self._fail(state)
+            if not state.future.cancelled():
+                state.future.set_exception(e)
+            return
+
+        # untrack() cancels the future of a transcript that may still be checked.
+        if self._observe(state, transcript) and not state.future.cancelled():
+            state.future.set_result(transcript)
+
+
+class AsyncTranscriptPoller(BasePoller):
+    """Waits for many transcripts to complete, sharing requests between them. Mirrors TranscriptPoller for asyncio."""
+
+    def __init__(self, endpoint: "AsyncTranscriptEndpoint", **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.endpoint = endpoint
+
+    def track(self, transcript_id: str, audio_duration: Optional[float] = None) -> "asyncio.Future[Transcript]":
+        """Starts polling a transcript. The returned future resolves to the full Transcript once it is completed or errored."""
+        return self._track(transcript_id, audio_duration, asyncio.get_running_loop().create_future)
+
+    async def poll_once(self) -> Optional[float]:
+        """Checks every due transcript once. Returns the seconds until the next one is due, None if nothing is tracked."""
+        due = self._due(time.monotonic())
+        if len(due) >= self.list_threshold:
+            try:
+                due = self._partition(due, await self._list_finished({s.transcript_id for s in due}))
+            except Exception:
+                # The listing is only an optimisation, fall back to checking every due transcript.
+                pass
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def check(state: PollState) -> None:
+            async with semaphore:
+                await self._check(state)
+
+        await asyncio.gather(*[check(s) for s in due])
+        return self._next_delay(time.monotonic())
+
+    async def run(self, futures: Optional[Iterable[Awaitable[Transcript]]] = None, timeout: Optional[float] = None) -> None:
+        """Polls until the given futures (by default, every tracked transcript) are resolved.
+
+        Throws:
+            TimeoutError: If futures are still unresolved after `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        waiting = list(futures) if futures is not None else self._tracked_futures()
+        while not all(f.done() for f in waiting):
+            delay = await self.poll_once()
+            if all(f.done() for f in waiting) or delay is None:
+                return
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"{sum(not f.done() for f in waiting)} transcripts still pending.")
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+    async def wait(self, transcript_ids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, Transcript]:
+        """Tracks the given transcripts and waits until all are completed or errored.
+
+        Throws:
+            TimeoutError: If transcripts are still pending after `timeout` seconds.
+            httpx.HTTPStatusError: If fetching a transcript failed.
+        """
+        futures = {i: self.track(i) for i in transcript_ids}
+        await self.run(futures.values(), timeout=timeout)
+        return {i: f.result() for i, f in futures.items()}
+
+    async def _list_finished(self, wanted: Set[str]) -> Set[str]:
+        """Pages through completed and errored transcripts, returning which of `wanted` were found."""
+        finished: Set[str] = set()
+        for status in FINAL_STATUSES:
+            before_id = None
+            for _ in range(self.max_list_pages):
+                page = await self.endpoint.all(limit=self.page_size, status=status, before_id=before_id)
+                finished |= self._finished_in_page(page, wanted)
+                if wanted <= finished or len(page) < self.page_size:
+                    break
+                before_id = page[-1].id
+        return finished
+
+    async def _check(self, state: PollState) -> None:
+        try:
+            transcript = await self.endpoint.get(state.transcript_id)
+        except Exception as e:
+            self._fail(state)
+            if not state.future.cancelled():
+                state.future.set_exception(e)
+            return
+
+        # untrack() cancels the future of a transcript that may still be checked.
+        if self._observe(state, transcript) and not state.future.cancelled():
+            state.future.set_result(transcript)
@@ -0,0 +1,226 @@
+"""Connection pools that clients send their requests through, shareable by clients of several API keys.
+
+A client creates its own pool unless given one. Share one pool between clients to reuse the same connections for all of
+them, e.g. when serving several accounts from one process:
+
+    with ConnectionPool(max_connections=50, http2=True) as pool:
+        clients = {name: Client(key, pool=pool) for name, key in api_keys.items()}
+        ...
+        pool.stats.reuse_ratio
+
+Clients do not close a pool they were given; close it once none of them send requests any more.
+"""
+
+import inspect
+import threading
+import urllib.request
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+API_HOST = "api.assemblyai.com"
+# The defaults of httpx
+DEFAULT_TIMEOUT = httpx.Timeout(5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=5.0)
+
+
+@dataclass
+class PoolStats:
+    """Counters of a connection pool.
+
+    Connections are only counted for transports that trace them, like the default httpx transports. Requests sent through
+    other transports, e.g. httpx.MockTransport, are counted as `untraced`.
+    """
+    requests: int = 0
+    connections_opened: int = 0
+    connections_reused: int = 0
+    untraced: int = 0
+    errors: int = 0
+
+    @property
+    def reuse_ratio(self) -> float:
+        """The fraction of traced requests sent on an already open connection."""
+        traced = self.connections_opened + self.connections_reused
+        return self.connections_reused / traced if traced else 0.0
+
+
+def environment_proxy(host: str = API_HOST) -> Optional[str]:
+    """The proxy for requests to host from the HTTPS_PROXY, ALL_PROXY and NO_PROXY environment variables, as httpx.Client
+    uses when it creates its own transport."""
+    if urllib.request.proxy_bypass(host):
+        return None
+    proxies = urllib.request.getproxies()
+    return proxies.get("https") or proxies.get("all")
+
+
+class _Tracer:
+    """Records which connection events the transport traced for one request, then calls the request's previous trace hook."""
+
+    __slots__ = ("previous", "traced", "opened")
+
+    def __init__(self, previous: Optional[Callable[[str, Any], Any]]) -> None:
+        self.previous = previous
+        self.traced = False
+        self.opened = False
+
+    def _record(self, name: str) -> None:
+        self.traced = True
+        if name.startswith(("connection.connect_tcp.", "connection.connect_unix_socket.")):
+            self.opened = True
+
+    def trace(self, name: str, info: Any) -> None:
+        self._record(name)
+        if self.previous is not None:
+            self.previous(name, info)
+
+    async def atrace(self, name: str, info: Any) -> None:
+        self._record(name)
+        if self.previous is not None:
+            # Hooks of the instrumentation are plain functions, which async transports do not accept themselves.
+            result = self.previous(name, info)
+            if inspect.isawaitable(result):
+                await result
+
+
+class BaseConnectionPool:
+    """Limits and counters shared by ConnectionPool and AsyncConnectionPool.
+
+    Args:
+        max_connections: connections open at once, None for no limit.
+        max_keepalive_connections: idle connections kept open for reuse.
+        keepalive_expiry: seconds an idle connection is kept open.
+        http2: multiplex requests over HTTP/2 connections. Requires the h2 package, e.g. `pip install httpx[http2]`.
+        proxy: proxy URL for all requests.
+        trust_env: without a `proxy`, use environment_proxy(), like httpx.Client does.
+
+    The limits, http2 and proxy only apply to the default transport, not to a `transport` passed in.
+    """
+
+    def __init__(self, max_connections: Optional[int] = DEFAULT_LIMITS.max_connections, max_keepalive_connections: Optional[int] = DEFAULT_LIMITS.max_keepalive_connections, keepalive_expiry: Optional[float] = DEFAULT_LIMITS.keepalive_expiry, http2: bool = False, proxy: Optional[str] = None, trust_env: bool = True) -> None:
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections, keepalive_expiry=keepalive_expiry)
+        self.http2 = http2
+        self.proxy = proxy if proxy is not None or not trust_env else environment_proxy()
+        self._stats = PoolStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> PoolStats:
+        """A snapshot of the pool counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def _transport_options(self) -> Dict[str, Any]:
+        return {"limits": self.limits, "http2": self.http2, "proxy": self.proxy}
+
+    def _finish(self, tracer: _Tracer, error: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            stats.requests += 1
+            if error:
+                stats.errors += 1
+            elif not tracer.traced:
+                stats.untraced += 1
+            elif tracer.opened:
+                stats.connections_opened += 1
+            else:
+                stats.connections_reused += 1
+
+
+class ConnectionPool(BaseConnectionPool):
+    """Pool of HTTP connections to the API. Safe to share between clients and threads.
+
+    Args:
+        transport: send requests through this transport instead of a new httpx.HTTPTransport.
+    """
+
+    def __init__(self, max_connections: Optional[int] = DEFAULT_LIMITS.max_connections, max_keepalive_connections: Optional[int] = DEFAULT_LIMITS.max_keepalive_connections, keepalive_expiry: Optional[float] = DEFAULT_LIMITS.keepalive_expiry, http2: bool = False, proxy: Optional[str] = None, trust_env: bool = True, transport: Optional[httpx.BaseTransport] = None) -> None:
+        super().__init__(max_connections, max_keepalive_connections, keepalive_expiry, http2, proxy, trust_env)
+        self.transport = transport if transport is not None else httpx.HTTPTransport(**self._transport_options())
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        tracer = _Tracer(request.extensions.get("trace"))
+        request.extensions["trace"] = tracer.trace
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException:
+            self._finish(tracer, error=True)
+            raise
+        self._finish(tracer, error=False)
+        return response
+
+    def borrow(self) -> httpx.BaseTransport:
+        """A transport sending through this pool, for one httpx.Client. Closing it leaves the pool open."""
+        return _BorrowedTransport(self)
+
+    def close(self) -> None:
+        """Closes every connection of the pool."""
+        self.transport.close()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+class AsyncConnectionPool(BaseConnectionPool):
+    """Pool of HTTP connections to the API for asyncio clients. Mirrors ConnectionPool.
+
+    Share it only between clients running on the same event loop.
+
+    Args:
+        transport: send requests through this transport instead of a new httpx.AsyncHTTPTransport.
+    """
+
+    def __init__(self, max_connections: Optional[int] = DEFAULT_LIMITS.max_connections, max_keepalive_connections: Optional[int] = DEFAULT_LIMITS.max_keepalive_connections, keepalive_expiry: Optional[float] = DEFAULT_LIMITS.keepalive_expiry, http2: bool = False, proxy: Optional[str] = None, trust_env: bool = True, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        super().__init__(max_connections, max_keepalive_connections, keepalive_expiry, http2, proxy, trust_env)
+        self.transport = transport if transport is not None else httpx.AsyncHTTPTransport(**self._transport_options())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        tracer = _Tracer(request.extensions.get("trace"))
+        request.extensions["trace"] = tracer.atrace
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self._finish(tracer, error=True)
+            raise
+        self._finish(tracer, error=False)
+        return response
+
+    def borrow(self) -> httpx.AsyncBaseTransport:
+        """A transport sending through this pool, for one httpx.AsyncClient. Closing it leaves the pool open."""
+        return _AsyncBorrowedTransport(self)
+
+    async def aclose(self) -> None:
+        """Closes every connection of the pool."""
+        await self.transport.aclose()
+
+    async def __aenter__(self) -> "AsyncConnectionPool":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
+
+
+class _BorrowedTransport(httpx.BaseTransport):
+    def __init__(self, pool: ConnectionPool) -> None:
+        self.pool = pool
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.pool.handle_request(request)
+
+    def close(self) -> None:
+        # The pool outlives the clients borrowing it.
+        pass
+
+
+class _AsyncBorrowedTransport(httpx.AsyncBaseTransport):
+    def __init__(self, pool: AsyncConnectionPool) -> None:
+        self.pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
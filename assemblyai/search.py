@@ -0,0 +1,440 @@
+"""Local full-text search over the words of many transcripts, returning the time ranges that match.
+
+A SearchIndex is a directory of immutable segment files plus a manifest. Each commit() writes the transcripts added since
+the last one as a new segment, so the index grows incrementally as transcripts complete; compact() merges the segments.
+Segments are memory-mapped and never loaded: a term lookup is a binary search over the sorted term table, and its
+postings are read in place as arrays.
+
+Segment layout, native byte order, sections aligned to 8 bytes:
+
+    header | posting blocks | meta (JSON) | term offsets (uint64) | term bytes | block offsets (uint64) | block sizes (uint32)
+
+The posting block of a term holds its postings as columns: keys (uint64, transcript number << 32 | token position),
+word starts and ends (uint32, ms) and speaker codes (uint16, 0 for none). Keys are sorted, so the postings of a term are
+ordered by transcript and position, and phrase queries binary search them for adjacent positions.
+
+    index = SearchIndex("archive.idx")
+    index.add_all(client.transcript.get(t) for t in ids)
+    index.commit()
+    index.search('"abundance mindset"', speaker="A")
+"""
+
+import bisect
+import heapq
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+from assemblyai.model import Transcript, TranscriptStatus
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import TranscriptEndpoint
+
+TOKEN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+_MAGIC = b"AAISIDX1"
+_HEADER = struct.Struct("<8s" + "QQ" * 5)  # magic, then (offset, size) of meta, term offsets, term bytes, block offsets, block sizes
+_POSITION_MASK = 0xFFFFFFFF
+
+
+def tokenize(text: str) -> List[str]:
+    """The lowercase tokens of a text, as indexed and as queried. Punctuation is dropped and apostrophes kept, e.g. "don't"."""
+    return TOKEN.findall(text.lower())
+
+
+@dataclass
+class SearchHit:
+    """A match of a query. Times are in ms; `position` is the token number of the first matched token in the transcript."""
+    transcript_id: str
+    start: int
+    end: int
+    position: int
+    speaker: Optional[str] = None
+
+
+class _Postings:
+    """The postings of one term in one segment, read in place from the memory map."""
+    __slots__ = ("keys", "starts", "ends", "speakers")
+
+    def __init__(self, view: memoryview, offset: int, size: int) -> None:
+        keys_end = offset + 8 * size
+        starts_end = keys_end + 4 * size
+        ends_end = starts_end + 4 * size
+        self.keys = view[offset:keys_end].cast("Q")
+        self.starts = view[keys_end:starts_end].cast("I")
+        self.ends = view[starts_end:ends_end].cast("I")
+        self.speakers = view[ends_end:ends_end + 2 * size].cast("H")
+
+    def find(self, key: int) -> int:
+        """Index of a posting with the given key, -1 if there is none."""
+        i = bisect.bisect_left(self.keys, key)
+        return i if i < len(self.keys) and self.keys[i] == key else -1
+
+
+class _Segment:
+    """A read-only, memory-mapped segment file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        magic, *sections = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a search index segment")
+        meta, term_offsets, terms, block_offsets, block_sizes = [(sections[i], sections[i + 1]) for i in range(0, 10, 2)]
+        info = json.loads(bytes(self._view[meta[0]:meta[0] + meta[1]]))
+        if info["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {info['byteorder']}-endian machine")
+        self.transcript_ids: List[str] = info["transcripts"]
+        self.speakers: List[Optional[str]] = [None] + info["speakers"]
+        self._term_offsets = self._view[term_offsets[0]:term_offsets[0] + term_offsets[1]].cast("Q")
+        self._terms = self._view[terms[0]:terms[0] + terms[1]]
+        self._block_offsets = self._view[block_offsets[0]:block_offsets[0] + block_offsets[1]].cast("Q")
+        self._block_sizes = self._view[block_sizes[0]:block_sizes[0] + block_sizes[1]].cast("I")
+
+    def __len__(self) -> int:
+        """Number of terms."""
+        return len(self._block_sizes)
+
+    def term(self, i: int) -> bytes:
+        return bytes(self._terms[self._term_offsets[i]:self._term_offsets[i + 1]])
+
+    def terms(self) -> Iterator[bytes]:
+        return (self.term(i) for i in range(len(self)))
+
+    def postings_at(self, i: int) -> _Postings:
+        return _Postings(self._view, self._block_offsets[i], self._block_sizes[i])
+
+    def postings(self, term: bytes) -> Optional[_Postings]:
+        """The postings of a UTF-8 encoded term, None if it does not occur in this segment."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == len(self) or self.term(lo) != term:
+            return None
+        return self.postings_at(lo)
+
+    def close(self) -> None:
+        for view in (self._term_offsets, self._terms, self._block_offsets, self._block_sizes, self._view):
+            view.release()
+        self._mmap.close()
+
+
+def _write_segment(path: str, terms: Iterable[Tuple[bytes, array, array, array, array]], transcript_ids: List[str], speakers: List[Optional[str]]) -> None:
+    """Writes a segment from (term, keys, starts, ends, speaker codes) in term order, streaming the posting blocks to disk."""
+    term_offsets, term_bytes = array("Q", [0]), bytearray()
+    block_offsets, block_sizes = array("Q"), array("I")
+
+    def align(f: Any) -> int:
+        position = f.tell()
+        padding = -position % 8
+        f.write(b"\0" * padding)
+        return position + padding
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        for term, keys, starts, ends, speaker_codes in terms:
+            term_bytes += term
+            term_offsets.append(len(term_bytes))
+            block_offsets.append(align(f))
+            block_sizes.append(len(keys))
+            for column in (keys, starts, ends, speaker_codes):
+                column.tofile(f)
+
+        sections = []
+        meta = json.dumps({"byteorder": sys.byteorder, "transcripts": transcript_ids, "speakers": speakers[1:]}).encode()
+        for data in (meta, term_offsets.tobytes(), bytes(term_bytes), block_offsets.tobytes(), block_sizes.tobytes()):
+            sections += [align(f), len(data)]
+            f.write(data)
+        f.seek(0)
+        f.write(_HEADER.pack(_MAGIC, *sections))
+    os.replace(tmp, path)
+
+
+class SearchIndex:
+    """An on-disk inverted index from word tokens to (transcript, position, start, end, speaker).
+
+    Transcripts added with add() become searchable on commit(), which also happens automatically once `segment_words`
+    words are pending. Adding a transcript that is already indexed replaces it. A SearchIndex is safe to share across
+    threads; the directory should be written by one SearchIndex at a time.
+
+    Args:
+        directory: where segments and the manifest are stored, created if missing.
+        segment_words: pending words that trigger a commit, bounding the memory used while indexing.
+    """
+
+    MANIFEST = "manifest.json"
+
+    def __init__(self, directory: str, segment_words: int = 2_000_000) -> None:
+        self.directory = directory
+        self.segment_words = segment_words
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        manifest = self._read_manifest()
+        self._next_segment: int = manifest["next_segment"]
+        # Segments missing from disk, e.g. deleted by an interrupted commit, are skipped along with their transcripts.
+        names = [name for name in manifest["segments"] if os.path.exists(os.path.join(directory, name))]
+        self._owners: Dict[str, str] = {t: name for t, name in manifest["transcripts"].items() if name in names}
+        self._segments: List[_Segment] = [_Segment(os.path.join(directory, name)) for name in names]
+        self._reset_pending()
+        if len(names) != len(manifest["segments"]):
+            self._write_manifest()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.directory, self.MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"next_segment": 1, "segments": [], "transcripts": {}}
+
+    def _write_manifest(self) -> None:
+        manifest = {"next_segment": self._next_segment, "segments": [s.name for s in self._segments], "transcripts": self._owners}
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(self.directory, self.MANIFEST))
+
+    def _reset_pending(self) -> None:
+        self._pending: Dict[str, Tuple[array, array, array, array]] = {}
+        self._pending_ids: List[str] = []
+        self._pending_speakers: Dict[Optional[str], int] = {None: 0}
+        self._pending_words = 0
+
+    def __len__(self) -> int:
+        """Number of committed transcripts."""
+        return len(self._owners)
+
+    def __contains__(self, transcript_id: object) -> bool:
+        return transcript_id in self._owners
+
+    def add(self, transcript: Transcript) -> bool:
+        """Queues a completed transcript for indexing. Returns False, indexing nothing, if it is not completed or has no words."""
+        if transcript.status != TranscriptStatus.completed or not transcript.words:
+            return False
+        with self._lock:
+            if transcript.id in self._pending_ids:
+                self.commit()
+            doc = len(self._pending_ids) << 32
+            self._pending_ids.append(transcript.id)
+            speakers, pending = self._pending_speakers, self._pending
+            position = 0
+            for word in transcript.words:
+                speaker = speakers.setdefault(word.speaker, len(speakers))
+                for token in tokenize(word.text):
+                    columns = pending.get(token)
+                    if columns is None:
+                        columns = pending[token] = (array("Q"), array("I"), array("I"), array("H"))
+                    columns[0].append(doc | position)
+                    columns[1].append(word.start)
+                    columns[2].append(word.end)
+                    columns[3].append(speaker)
+                    position += 1
+            self._pending_words += len(transcript.words)
+            if self._pending_words >= self.segment_words:
+                self.commit()
+        return True
+
+    def add_all(self, transcripts: Iterable[Transcript]) -> int:
+        """add() for many transcripts, e.g. from TranscriptEndpoint.fetch_bundle(). Returns the number of transcripts queued."""
+        return sum(1 for transcript in transcripts if self.add(transcript))
+
+    def fetch_and_add(self, endpoint: "TranscriptEndpoint", transcript_ids: Iterable[str], max_concurrency: int = 8, skip_indexed: bool = True) -> int:
+        """Retrieves transcripts concurrently and queues them for indexing, e.g. the ids listed by TranscriptEndpoint.iter_all().
+
+        Transcripts that are already committed are skipped with `skip_indexed`. Returns the number of transcripts queued.
+
+        Throws:
+            Exception: The error of the first transcript that could not be retrieved.
+        """
+        ids = (t for t in transcript_ids if not (skip_indexed and t in self._owners))
+        added = 0
+        for bundle in endpoint.fetch_bundle(ids, parts=("transcript",), max_concurrency=max_concurrency):
+            added += self.add(bundle.raise_for_error().transcript)
+        return added
+
+    def commit(self) -> Optional[str]:
+        """Writes the pending transcripts as a new segment and makes them searchable. Returns the segment name, None if nothing was pending."""
+        with self._lock:
+            if not self._pending_ids:
+                return None
+            name = f"segment-{self._next_segment:06d}.idx"
+            path = os.path.join(self.directory, name)
+            speakers = sorted(self._pending_speakers, key=self._pending_speakers.__getitem__)
+            encoded = sorted((token.encode(), columns) for token, columns in self._pending.items())
+            _write_segment(path, ((term, *columns) for term, columns in encoded), self._pending_ids, speakers)
+            self._segments.append(_Segment(path))
+            self._next_segment += 1
+            self._owners.update((transcript_id, name) for transcript_id in self._pending_ids)
+            self._save()
+            self._reset_pending()
+            return name
+
+    def compact(self) -> None:
+        """Merges all segments into one, dropping replaced transcripts."""
+        with self._lock:
+            self.commit()
+            if len(self._segments) < 2 and not self._has_replaced_transcripts():
+                return
+            transcript_ids: List[str] = []
+            speakers: Dict[Optional[str], int] = {None: 0}
+            doc_maps, speaker_maps = [], []
+            for segment in self._segments:
+                doc_map = {}
+                for doc, transcript_id in enumerate(segment.transcript_ids):
+                    if self._owners.get(transcript_id) == segment.name:
+                        doc_map[doc] = len(transcript_ids)
+                        transcript_ids.append(transcript_id)
+                doc_maps.append(doc_map)
+                speaker_maps.append([speakers.setdefault(s, len(speakers)) for s in segment.speakers])
+
+            def merged_terms() -> Iterator[Tuple[bytes, array, array, array, array]]:
+                def numbered(i: int) -> Iterator[Tuple[bytes, int, int]]:
+                    return ((term, i, t) for t, term in enumerate(self._segments[i].terms()))
+
+                ordered = heapq.merge(*[numbered(i) for i in range(len(self._segments))])
+                current, columns = None, None
+                for term, i, t in ordered:
+                    if term != current:
+                        if columns is not None and len(columns[0]):
+                            yield (current, *columns)
+                        current, columns = term, (array("Q"), array("I"), array("I"), array("H"))
+                    postings, doc_map, speaker_map = self._segments[i].postings_at(t), doc_maps[i], speaker_maps[i]
+                    for j, key in enumerate(postings.keys):
+                        doc = doc_map.get(key >> 32)
+                        if doc is not None:
+                            columns[0].append(doc << 32 | key & _POSITION_MASK)
+                            columns[1].append(postings.starts[j])
+                            columns[2].append(postings.ends[j])
+                            columns[3].append(speaker_map[postings.speakers[j]])
+                if columns is not None and len(columns[0]):
+                    yield (current, *columns)
+
+            name = f"segment-{self._next_segment:06d}.idx"
+            path = os.path.join(self.directory, name)
+            _write_segment(path, merged_terms(), transcript_ids, sorted(speakers, key=speakers.__getitem__))
+            self._next_segment += 1
+            self._segments.append(_Segment(path))
+            self._owners = {transcript_id: name for transcript_id in transcript_ids}
+            self._save()
+
+    def _has_replaced_transcripts(self) -> bool:
+        return sum(len(s.transcript_ids) for s in self._segments) != len(self._owners)
+
+    def _save(self) -> None:
+        """Drops segments no transcript is owned by any more, writes the manifest, then deletes the dropped segment files,
+        so the manifest never lists a deleted file."""
+        used = set(self._owners.values())
+        unused = [s for s in self._segments if s.name not in used]
+        self._segments = [s for s in self._segments if s.name in used]
+        self._write_manifest()
+        for segment in unused:
+            segment.close()
+            os.remove(segment.path)
+
+    def search(self, query: str, speaker: Optional[str] = None, transcript_ids: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[SearchHit]:
+        """Time ranges matching a query, ordered by segment, transcript and position.
+
+        A query is one or more words; text in double quotes is matched as a phrase, and every other word as a term.
+        Hits must match all of them: each hit is the range of one occurrence of the first phrase or term, in transcripts
+        that contain all the others.
+
+        Args:
+            speaker: only match words spoken by this speaker label.
+            transcript_ids: only search these transcripts.
+            limit: stop after this many hits.
+        """
+        parts = [tokenize(p) for p in re.findall(r'"([^"]*)"', query)]
+        parts += [[token] for token in tokenize(re.sub(r'"[^"]*"', " ", query))]
+        parts = [p for p in parts if p]
+        if not parts:
+            return []
+        allowed = set(transcript_ids) if transcript_ids is not None else None
+        hits: List[SearchHit] = []
+        with self._lock:
+            for segment in self._segments:
+                for hit in self._search_segment(segment, parts, speaker, allowed):
+                    hits.append(hit)
+                    if limit is not None and len(hits) >= limit:
+                        return hits
+        return hits
+
+    def phrase(self, text: str, speaker: Optional[str] = None, transcript_ids: Optional[Iterable[str]] = None, limit: Optional[int] = None) -> List[SearchHit]:
+        """Time ranges where the words of `text` are spoken in sequence."""
+        return self.search(f'"{text.replace(chr(34), " ")}"', speaker, transcript_ids, limit)
+
+    def _search_segment(self, segment: _Segment, parts: List[List[str]], speaker: Optional[str], allowed: Optional[set]) -> Iterator[SearchHit]:
+        if speaker is not None and speaker not in segment.speakers:
+            return
+        speaker_code = segment.speakers.index(speaker) if speaker is not None else None
+        # Transcripts containing every part after the first, to filter the hits of the first part.
+        required: Optional[set] = None
+        for part in parts[1:]:
+            docs = {key >> 32 for key, _, _, _ in self._matches(segment, part, speaker_code)}
+            required = docs if required is None else required & docs
+            if not required:
+                return
+        for key, start, end, code in self._matches(segment, parts[0], speaker_code):
+            doc = key >> 32
+            if required is not None and doc not in required:
+                continue
+            transcript_id = segment.transcript_ids[doc]
+            if self._owners.get(transcript_id) != segment.name or (allowed is not None and transcript_id not in allowed):
+                continue
+            yield SearchHit(transcript_id, start, end, key & _POSITION_MASK, segment.speakers[code])
+
+    @staticmethod
+    def _matches(segment: _Segment, tokens: Sequence[str], speaker_code: Optional[int]) -> Iterator[Tuple[int, int, int, int]]:
+        """(key, start, end, speaker code) of each occurrence of a token sequence in a segment."""
+        lists = [segment.postings(token.encode()) for token in tokens]
+        if any(p is None for p in lists):
+            return
+        if len(lists) == 1:
+            postings = lists[0]
+            for i, key in enumerate(postings.keys):
+                if speaker_code is None or postings.speakers[i] == speaker_code:
+                    yield key, postings.starts[i], postings.ends[i], postings.speakers[i]
+            return
+        # Walk the rarest token and look the others up at their expected positions.
+        rare = min(range(len(lists)), key=lambda i: len(lists[i].keys))
+        first, last = lists[0], lists[-1]
+        for key in lists[rare].keys:
+            if (key & _POSITION_MASK) < rare:
+                continue
+            base = key - rare
+            indexes = []
+            for offset, postings in enumerate(lists):
+                i = postings.find(base + offset)
+                if i < 0 or (speaker_code is not None and postings.speakers[i] != speaker_code):
+                    break
+                indexes.append(i)
+            else:
+                yield base, first.starts[indexes[0]], last.ends[indexes[-1]], first.speakers[indexes[0]]
+
+    def close(self) -> None:
+        """Commits pending transcripts and unmaps the segments."""
+        with self._lock:
+            self.commit()
+            for segment in self._segments:
+                segment.close()
+            self._segments = []
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
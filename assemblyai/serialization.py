@@ -0,0 +1,65 @@
+"""A deferred `@dataclass_json`, so importing the models does not import dataclasses_json and marshmallow."""
+
+import threading
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+JSON_METHODS = ("to_json", "from_json", "to_dict", "from_dict", "schema")
+
+_classes: List[type] = []
+_schemas: Dict[Tuple[type, Any], Any] = {}
+_lock = threading.RLock()
+
+
+class _DeferredMethod:
+    """Placeholder for a dataclasses_json method. The first access applies the real decorator to every model class."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        apply_dataclass_json()
+        return getattr(obj if obj is not None else owner, self.name)
+
+
+def dataclass_json(cls: Type[T]) -> Type[T]:
+    """Same as dataclasses_json's `@dataclass_json`, applied when one of its methods is first used.
+
+    `schema()` is memoized: each class builds its marshmallow schema once per set of (hashable) arguments, and calls
+    return that shared instance.
+    """
+    with _lock:
+        _classes.append(cls)
+        for name in JSON_METHODS:
+            setattr(cls, name, _DeferredMethod(name))
+    return cls
+
+
+def apply_dataclass_json() -> None:
+    """Applies dataclasses_json to every model class still waiting for it."""
+    import dataclasses_json
+
+    with _lock:
+        for cls in _classes:
+            if isinstance(cls.__dict__.get("to_dict"), _DeferredMethod):
+                dataclasses_json.dataclass_json(cls)
+                cls.schema = classmethod(_schema)  # type: ignore[attr-defined]
+
+
+def _schema(cls: type, **kwargs: Any) -> Any:
+    from dataclasses_json import DataClassJsonMixin
+
+    build = DataClassJsonMixin.schema.__func__  # type: ignore[attr-defined]
+    try:
+        key = (cls, frozenset(kwargs.items()))
+        schema = _schemas.get(key)
+    except TypeError:
+        # Unhashable arguments, e.g. a `context` dict: build a schema just for this call.
+        return build(cls, **kwargs)
+    if schema is None:
+        with _lock:
+            schema = _schemas.get(key)
+            if schema is None:
+                schema = _schemas[key] = build(cls, **kwargs)
+    return schema
@@ -0,0 +1,146 @@
+"""Coalescing of concurrent identical reads, so that they share one request and one decoded result."""
+
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import httpx
+
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters of a SingleFlight. `coalesced` calls waited for another call's result instead of running."""
+    calls: int = 0
+    coalesced: int = 0
+    negative_hits: int = 0
+
+
+def is_not_found(error: BaseException) -> bool:
+    """Whether an error is a 404 response."""
+    return isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 404
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time. Callers arriving while a call is in flight wait for it and share its
+    result, or its exception.
+
+    Usable from threads with do() and from coroutines with ado(). Coroutines only share calls with coroutines on the same
+    event loop, and threads with threads. Results are shared objects: callers must not modify them.
+
+    Args:
+        negative_ttl: seconds for which a failure matching `negative` is remembered and raised again without a call.
+            0 disables negative caching.
+        negative: which failures to remember, by default 404 responses.
+    """
+
+    def __init__(self, negative_ttl: float = 0.0, negative: Callable[[BaseException], bool] = is_not_found) -> None:
+        self.negative_ttl = negative_ttl
+        self.negative = negative
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "Any"] = {}
+        self._failures: Dict[Hashable, Tuple[float, BaseException]] = {}
+        self._stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """A snapshot of the counters."""
+        with self._lock:
+            return replace(self._stats)
+
+    def forget(self, key: Hashable) -> None:
+        """Drops a remembered failure, e.g. after creating what was not found."""
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def _remembered_failure(self, key: Hashable) -> Optional[BaseException]:
+        """The remembered failure of key, if still fresh. Call with the lock held."""
+        failure = self._failures.get(key)
+        if failure is None:
+            return None
+        if failure[0] <= time.monotonic():
+            del self._failures[key]
+            return None
+        self._stats.negative_hits += 1
+        # Raised again on every hit until it expires: drop the previous traceback so it does not grow with each raise.
+        return failure[1].with_traceback(None)
+
+    def _remember(self, key: Hashable, error: BaseException) -> None:
+        if self.negative_ttl > 0 and self.negative(error):
+            with self._lock:
+                self._failures[key] = (time.monotonic() + self.negative_ttl, error)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Returns fn(), or the result of the call of fn already in flight for key."""
+        with self._lock:
+            self._stats.calls += 1
+            error = self._remembered_failure(key)
+            if error is not None:
+                raise error
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self._stats.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            self._remember(key, e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """Returns await fn(), or the result of the call of fn already in flight for key on this event loop.
+
+        The shared call runs as its own task, so cancelling one waiting caller does not cancel it for the others.
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        with self._lock:
+            self._stats.calls += 1
+            error = self._remembered_failure(key)
+            if error is not None:
+                raise error
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = loop.create_task(self._arun(task_key, key, fn))
+            else:
+                self._stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    async def _arun(self, task_key: Tuple[int, Hashable], key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        try:
+            return await fn()
+        except BaseException as e:
+            self._remember(key, e)
+            raise
+        finally:
+            with self._lock:
+                del self._tasks[task_key]
@@ -0,0 +1,200 @@
+"""Transcription of long audio in parallel, by splitting it into overlapping segments and merging their transcripts.
+
+    transcript = client.transcript.create_split("meeting.wav", Transcript(speaker_labels=True), max_concurrency=8)
+
+Each segment is uploaded as a WAV file of its own and transcribed as a separate job, so the wall-clock time grows with the
+segment length and the number of segments per parallel job rather than with the length of the audio. The timestamps of
+each segment transcript are shifted by the offset of its segment. Where two segments overlap, words, chapters, entities
+and sentiment analysis results are taken from the earlier segment up to the middle of the overlap and from the later one
+after it, so words cut off at a segment boundary are transcribed whole by one of the two segments.
+
+Speakers are labelled per segment by the API, so one label may denote different speakers in different segments.
+"""
+
+import math
+import os
+import struct
+import wave
+from dataclasses import dataclass, replace
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from assemblyai.model import Transcript, TranscriptStatus, Utterance, UtteredWord
+from assemblyai.streaming import AudioFormat, is_wav
+
+DEFAULT_SEGMENT_MS = 30 * 60 * 1000
+DEFAULT_OVERLAP_MS = 10 * 1000
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class AudioSource:
+    """A local PCM audio file: a WAV file, or headerless PCM in a given format."""
+    filename: str
+    audio_format: AudioFormat
+    frames: int
+    wav: bool
+
+    @classmethod
+    def open(cls, filename: str, audio_format: Optional[AudioFormat] = None) -> "AudioSource":
+        """Reads the format and length of a file. Files without a WAV header are raw PCM in `audio_format`.
+
+        Throws:
+            ValueError: If a raw PCM file is given without its audio_format.
+            wave.Error: If a WAV file is not PCM encoded.
+        """
+        if is_wav(filename):
+            with wave.open(filename, "rb") as w:
+                return cls(filename, AudioFormat(w.getframerate(), w.getsampwidth(), w.getnchannels()), w.getnframes(), True)
+        if audio_format is None:
+            raise ValueError(f"{filename} is not a WAV file; pass the audio_format of its raw PCM data")
+        return cls(filename, audio_format, os.path.getsize(filename) // audio_format.block_size, False)
+
+    @property
+    def duration_ms(self) -> int:
+        return self.frames * 1000 // self.audio_format.sample_rate
+
+
+@dataclass(frozen=True)
+class Segment:
+    """A slice of an AudioSource: `frames` sample frames from `start_frame`, spanning start_ms to end_ms of the audio."""
+    index: int
+    start_frame: int
+    frames: int
+    start_ms: int
+    end_ms: int
+
+
+def plan_segments(source: AudioSource, segment_ms: int = DEFAULT_SEGMENT_MS, overlap_ms: int = DEFAULT_OVERLAP_MS) -> List[Segment]:
+    """Splits a source into segments of segment_ms, each overlapping the previous one by overlap_ms. The last one may be shorter.
+
+    Throws:
+        ValueError: If the overlap is not shorter than the segments, or the segments are shorter than one sample frame.
+    """
+    if not 0 <= overlap_ms < segment_ms:
+        raise ValueError(f"overlap_ms must be at least 0 and less than segment_ms, got {overlap_ms} and {segment_ms}")
+    rate = source.audio_format.sample_rate
+    segment_frames = segment_ms * rate // 1000
+    overlap_frames = overlap_ms * rate // 1000
+    # Rounded down to frames, a segment may not reach past its overlap, and the next one would start where it did.
+    if segment_frames <= overlap_frames:
+        raise ValueError(f"segment_ms must exceed overlap_ms by at least one frame at {rate} Hz, got {segment_ms} and {overlap_ms}")
+    segments: List[Segment] = []
+    start = 0
+    while True:
+        end = min(start + segment_frames, source.frames)
+        segments.append(Segment(len(segments), start, end - start, start * 1000 // rate, end * 1000 // rate))
+        if end >= source.frames:
+            return segments
+        start = end - overlap_frames
+
+
+def wav_header(audio_format: AudioFormat, frames: int) -> bytes:
+    """The 44 byte header of a PCM WAV file holding `frames` sample frames.
+
+    Throws:
+        ValueError: If the file would exceed the 4 GiB limit of the WAV format.
+    """
+    data_bytes = frames * audio_format.block_size
+    if 36 + data_bytes > 0xFFFFFFFF:
+        raise ValueError(f"{frames} frames of {audio_format.block_size} bytes exceed the 4 GiB limit of a WAV file; use shorter segments")
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + data_bytes, b"WAVE", b"fmt ", 16, 1, audio_format.channels, audio_format.sample_rate,
+        audio_format.sample_rate * audio_format.block_size, audio_format.block_size, audio_format.sample_width * 8, b"data", data_bytes)
+
+
+def segment_chunks(source: AudioSource, segment: Segment, chunk_frames: int = 1 << 16) -> Iterator[bytes]:
+    """A segment as a WAV file: its header, then its PCM data read `chunk_frames` frames at a time."""
+    yield wav_header(source.audio_format, segment.frames)
+    remaining = segment.frames
+    if source.wav:
+        with wave.open(source.filename, "rb") as w:
+            w.setpos(segment.start_frame)
+            while remaining > 0:
+                data = w.readframes(min(chunk_frames, remaining))
+                if not data:
+                    break
+                remaining -= len(data) // source.audio_format.block_size
+                yield data
+        return
+    block_size = source.audio_format.block_size
+    with open(source.filename, "rb") as f:
+        f.seek(segment.start_frame * block_size)
+        while remaining > 0:
+            data = f.read(min(chunk_frames, remaining) * block_size)
+            if not data:
+                break
+            remaining -= len(data) // block_size
+            yield data
+
+
+def _keep(items: Iterable[T], offset: int, low: float, high: float) -> List[T]:
+    """Items with start and end shifted by offset, keeping those whose midpoint lies in [low, high), clamped to it."""
+    kept = []
+    for item in items:
+        start, end = item.start + offset, item.end + offset  # type: ignore[attr-defined]
+        if low <= (start + end) / 2 < high:
+            kept.append(replace(item, start=max(start, low), end=min(end, high)))  # type: ignore[type-var]
+    return kept
+
+
+def _keep_utterances(utterances: Iterable[Utterance], offset: int, low: float, high: float) -> List[Utterance]:
+    """Utterances shifted by offset, keeping their words in [low, high). An utterance cut by a bound is shortened to its kept words."""
+    kept = []
+    for utterance in utterances:
+        words = _keep(utterance.words or [], offset, low, high)
+        if not utterance.words:
+            kept.extend(_keep([utterance], offset, low, high))
+        elif len(words) == len(utterance.words):
+            kept.append(replace(utterance, start=utterance.start + offset, end=utterance.end + offset, words=words))
+        elif words:
+            kept.append(replace(utterance, start=words[0].start, end=words[-1].end, text=" ".join(w.text for w in words),
+                                confidence=_mean_confidence(words), words=words))
+    return kept
+
+
+def _mean_confidence(words: Sequence[UtteredWord]) -> Optional[float]:
+    return sum(w.confidence for w in words) / len(words) if words else None
+
+
+def merge(parts: Sequence[Transcript], segments: Sequence[Segment]) -> Transcript:
+    """Merges the transcripts of consecutive segments into one transcript of the whole audio.
+
+    Timestamps are shifted by the segment offsets and overlaps are cut at their middle. `text` and `confidence` are
+    recomputed from the merged words. Results that only summarize a segment as a whole, auto highlights and IAB
+    categories, are left out. Lists that are None in every segment, e.g. utterances without speaker labels, stay None.
+
+    Throws:
+        ValueError: If a segment transcript is not completed.
+    """
+    if len(parts) != len(segments) or not parts:
+        raise ValueError(f"Expected one transcript per segment, got {len(parts)} for {len(segments)} segments")
+    for part, segment in zip(parts, segments):
+        if part.status != TranscriptStatus.completed:
+            raise ValueError(f"Transcript {part.id} of segment {segment.index} ({segment.start_ms}-{segment.end_ms} ms) is {_status(part.status)}")
+
+    # Bounds of each segment's share of the audio: the middles of its overlaps with its neighbours.
+    cuts = [(after.start_ms + before.end_ms) // 2 for before, after in zip(segments, segments[1:])]
+    bounds: List[Tuple[float, float]] = list(zip([-math.inf] + cuts, cuts + [math.inf]))
+
+    words: List[UtteredWord] = []
+    utterances: List[Utterance] = []
+    merged: Any = {"chapters": [], "entities": [], "sentiment_analysis_results": []}
+    for part, segment, (low, high) in zip(parts, segments, bounds):
+        words.extend(_keep(part.words or [], segment.start_ms, low, high))
+        utterances.extend(_keep_utterances(part.utterances or [], segment.start_ms, low, high))
+        for name, items in merged.items():
+            items.extend(_keep(getattr(part, name) or [], segment.start_ms, low, high))
+    for name in merged:
+        if all(getattr(part, name) is None for part in parts):
+            merged[name] = None
+
+    return replace(
+        parts[0], id=None, audio_url=None, resource_url=None, audio_duration=segments[-1].end_ms / 1000,
+        text=" ".join(w.text for w in words), confidence=_mean_confidence(words), words=words,
+        utterances=None if all(p.utterances is None for p in parts) else utterances,
+        auto_highlights_result=None, iab_categories_result=None, completed=max(p.completed or "" for p in parts) or None, **merged)
+
+
+def _status(status: Any) -> str:
+    return status.value if isinstance(status, TranscriptStatus) else str(status)
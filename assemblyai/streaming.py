@@ -0,0 +1,75 @@
+"""Framing of PCM audio for the stream endpoint."""
+
+import base64
+import wave
+from dataclasses import dataclass
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, Tuple
+
+
+@dataclass(frozen=True)
+class AudioFormat:
+    """Layout of raw PCM audio. The stream endpoint expects 16 bit, 8 kHz, mono PCM."""
+    sample_rate: int = 8000
+    sample_width: int = 2
+    channels: int = 1
+
+    @property
+    def block_size(self) -> int:
+        """Bytes per sample across all channels. Frames are always a multiple of this."""
+        return self.sample_width * self.channels
+
+    def frame_bytes(self, frame_ms: int) -> int:
+        """Size in bytes of `frame_ms` milliseconds of audio."""
+        return max(1, self.sample_rate * frame_ms // 1000) * self.block_size
+
+
+def encode_frame(frame: bytes) -> str:
+    """Base64 text of a frame, as sent in `audio_data`."""
+    return base64.b64encode(frame).decode("ascii")
+
+
+def frame_pcm(chunks: Iterable[bytes], frame_bytes: int) -> Iterator[bytes]:
+    """Re-slices chunks of any size into frames of exactly `frame_bytes`. The last frame may be shorter."""
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= frame_bytes:
+            yield bytes(buffer[:frame_bytes])
+            del buffer[:frame_bytes]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def aframe_pcm(chunks: AsyncIterable[bytes], frame_bytes: int) -> AsyncIterator[bytes]:
+    """frame_pcm() over an async iterable."""
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= frame_bytes:
+            yield bytes(buffer[:frame_bytes])
+            del buffer[:frame_bytes]
+    if buffer:
+        yield bytes(buffer)
+
+
+def read_wav(filename: str, chunk_frames: int = 8000) -> Tuple[AudioFormat, Iterator[bytes]]:
+    """The format of a WAV file and a generator of its PCM data, read `chunk_frames` samples at a time."""
+    wav = wave.open(filename, "rb")
+    audio_format = AudioFormat(wav.getframerate(), wav.getsampwidth(), wav.getnchannels())
+
+    def chunks() -> Iterator[bytes]:
+        with wav:
+            while True:
+                data = wav.readframes(chunk_frames)
+                if not data:
+                    break
+                yield data
+
+    return audio_format, chunks()
+
+
+def is_wav(filename: str) -> bool:
+    """Whether a file starts with a RIFF/WAVE header."""
+    with open(filename, "rb") as f:
+        header = f.read(12)
+    return header[:4] == b"RIFF" and header[8:12] == b"WAVE"
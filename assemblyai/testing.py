@@ -0,0 +1,178 @@
+"""In-memory stand-in for the AssemblyAI API, for exercising the SDK without network access.
+
+    fake = FakeAssemblyAI()
+    client = Client("key", transport=fake.transport())
+"""
+
+import base64
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import httpx
+
+from assemblyai.client import BASE_URL_V2
+
+
+class FakeAssemblyAI:
+    """Serves the transcript, upload and stream endpoints from memory through a httpx.MockTransport.
+
+    Transcripts stay queued until complete() or fail() is called. If a transcript has a `webhook_url`, finishing it
+    calls `webhook_sender(url, payload)`, which by default POSTs the payload to the URL.
+
+    Streamed frames are kept in `streamed` and answered, after `stream_latency` seconds, with a payload whose text
+    is the frame size. Set `stream_latency` only with a Client: the delay blocks the event loop of an AsyncClient.
+    """
+
+    def __init__(self, webhook_sender: Optional[Callable[[str, Dict[str, Any]], Any]] = None) -> None:
+        self.transcripts: Dict[str, Dict[str, Any]] = {}
+        self.sentences: Dict[str, List[Dict[str, Any]]] = {}
+        self.paragraphs: Dict[str, List[Dict[str, Any]]] = {}
+        self.uploads: Dict[str, bytes] = {}
+        self.streamed: List[bytes] = []
+        self.stream_latency = 0.0
+        self.requests: Counter = Counter()
+        self.faults: Dict[Tuple[str, str], List[Any]] = {}
+        self.webhook_sender = webhook_sender or self._post_webhook
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def transport(self) -> httpx.MockTransport:
+        """A transport usable by both Client and AsyncClient."""
+        return httpx.MockTransport(self.handle)
+
+    def add_transcript(self, transcript: Dict[str, Any]) -> str:
+        """Stores a transcript as if it had been created through the API. Returns its id."""
+        with self._lock:
+            transcript_id = transcript.get("id") or f"fake-{next(self._ids)}"
+            self.transcripts[transcript_id] = {"status": "queued", **transcript, "id": transcript_id}
+            return transcript_id
+
+    def complete(self, transcript_id: str, sentences: Optional[List[Dict[str, Any]]] = None, paragraphs: Optional[List[Dict[str, Any]]] = None, **fields: Any) -> None:
+        """Marks a transcript completed, updating it with `fields`, and sends its webhook."""
+        with self._lock:
+            self.transcripts[transcript_id].update(fields, status="completed")
+            self.sentences[transcript_id] = sentences or []
+            self.paragraphs[transcript_id] = paragraphs or []
+        self._send_webhook(transcript_id)
+
+    def fail(self, transcript_id: str, error: str = "failed") -> None:
+        """Marks a transcript errored and sends its webhook."""
+        with self._lock:
+            self.transcripts[transcript_id].update(status="error", error=error)
+        self._send_webhook(transcript_id)
+
+    def fail_next(self, method: str, route: str, count: int = 1, status: int = 503, headers: Optional[Dict[str, str]] = None, exception: Optional[Exception] = None) -> None:
+        """Makes the next `count` requests to a route, e.g. ("POST", "upload") or ("GET", "transcript/{id}"), fail.
+
+        The request body is read first, as if the server had received it. A failing request then raises `exception`,
+        if given, as a dropped connection would. Otherwise it is answered with `status` and `headers`.
+        """
+        with self._lock:
+            self.faults.setdefault((method, route), []).extend([exception or httpx.Response(status, headers=headers, json={"error": "Injected failure"})] * count)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Routes a request to the in-memory API."""
+        path = str(request.url).split("?")[0][len(BASE_URL_V2):].strip("/")
+        parts = path.split("/")
+        route = "/".join("{id}" if i == 1 else p for i, p in enumerate(parts))
+        with self._lock:
+            self.requests[(request.method, route)] += 1
+            faults = self.faults.get((request.method, route))
+            fault = faults.pop(0) if faults else None
+        if fault is not None:
+            request.read()
+            if isinstance(fault, Exception):
+                raise fault
+            return fault
+
+        if parts[0] == "upload" and request.method == "POST":
+            return self._upload(request)
+        if parts[0] == "stream" and request.method == "POST":
+            return self._stream(request)
+        if parts[0] != "transcript":
+            return httpx.Response(404, json={"error": "Not found"})
+
+        if len(parts) == 1:
+            if request.method == "POST":
+                return self._create(json.loads(request.read()))
+            return self._list(request)
+
+        transcript = self.transcripts.get(parts[1])
+        if transcript is None:
+            return httpx.Response(404, json={"error": "Transcript not found"})
+        if len(parts) == 3 and parts[2] in ("sentences", "paragraphs"):
+            if transcript["status"] != "completed":
+                return httpx.Response(400, json={"error": "Transcript is not completed"})
+            store = self.sentences if parts[2] == "sentences" else self.paragraphs
+            return httpx.Response(200, json={"id": parts[1], parts[2]: store.get(parts[1], [])})
+        if request.method == "DELETE":
+            with self._lock:
+                transcript.update(text="", words=[], utterances=[])
+            return httpx.Response(200, json=transcript)
+        return httpx.Response(200, json=transcript)
+
+    def _create(self, body: Dict[str, Any]) -> httpx.Response:
+        transcript_id = self.add_transcript(body)
+        return httpx.Response(200, json=self.transcripts[transcript_id])
+
+    def _list(self, request: httpx.Request) -> httpx.Response:
+        params = {k: v[-1] for k, v in parse_qs(request.url.query.decode()).items()}
+        content = request.read()
+        if content:
+            params.update({k: v for k, v in json.loads(content).items() if v is not None})
+
+        limit = int(params.get("limit") or 10)
+        with self._lock:
+            summaries = [
+                {k: t.get(k) for k in ("id", "status", "audio_url", "resource_url", "created", "completed")}
+                for t in reversed(list(self.transcripts.values()))
+                if not params.get("status") or t["status"] == params["status"]
+            ]
+
+        if params.get("before_id"):
+            ids = [s["id"] for s in summaries]
+            summaries = summaries[ids.index(params["before_id"]) + 1:] if params["before_id"] in ids else []
+        if params.get("after_id"):
+            ids = [s["id"] for s in summaries]
+            summaries = summaries[:ids.index(params["after_id"])] if params["after_id"] in ids else summaries
+
+        page = summaries[:limit]
+        current_url = str(request.url)
+        next_url = None
+        if len(summaries) > limit:
+            next_url = f"{BASE_URL_V2}transcript?limit={limit}&before_id={page[-1]['id']}"
+            for name in ("status", "after_id"):
+                if params.get(name):
+                    next_url += f"&{name}={params[name]}"
+        return httpx.Response(200, json={
+            "page_details": {"limit": limit, "result_count": len(page), "current_url": current_url, "prev_url": None, "next_url": next_url},
+            "transcripts": page,
+        })
+
+    def _upload(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            upload_id = f"upload-{next(self._ids)}"
+            self.uploads[upload_id] = request.read()
+        return httpx.Response(200, json={"upload_url": f"https://cdn.assemblyai.com/upload/{upload_id}"})
+
+    def _stream(self, request: httpx.Request) -> httpx.Response:
+        audio = base64.b64decode(json.loads(request.read())["audio_data"], validate=True)
+        with self._lock:
+            self.streamed.append(audio)
+            stream_id = f"stream-{next(self._ids)}"
+        if self.stream_latency:
+            time.sleep(self.stream_latency)
+        return httpx.Response(200, json={"id": stream_id, "status": "completed", "confidence": 1.0, "text": f"{len(audio)} bytes", "words": []})
+
+    def _send_webhook(self, transcript_id: str) -> None:
+        transcript = self.transcripts[transcript_id]
+        if transcript.get("webhook_url"):
+            self.webhook_sender(transcript["webhook_url"], {"transcript_id": transcript_id, "status": transcript["status"]})
+
+    def _post_webhook(self, url: str, payload: Dict[str, Any]) -> None:
+        httpx.post(url, json=payload)
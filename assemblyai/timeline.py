@@ -0,0 +1,148 @@
+"""Time-interval index over the timestamped parts of a transcript."""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from assemblyai.columnar import WordArray
+from assemblyai.model import Chapter, Transcript, Utterance, UtteredWord
+
+def _span(item: Any) -> Tuple[int, int]:
+    """The (start, end) of a timestamped item, in ms."""
+    timestamp = getattr(item, "timestamp", None)
+    if timestamp is not None:
+        return timestamp.start, timestamp.end
+    return item.start, item.end
+
+
+class TimelineLayer:
+    """Items of one kind, sorted by start time.
+
+    Alongside the starts, keeps the running maximum of the ends. Both are sorted, so the items overlapping a range
+    are found with two bisections, plus a scan over items nested inside longer ones.
+    """
+
+    def __init__(self, items: Sequence[Any], starts: Sequence[int], ends: Sequence[int]) -> None:
+        self.items = items
+        self.starts = starts
+        self.ends = ends
+        self.max_ends: List[int] = []
+        running = None
+        for end in ends:
+            running = end if running is None or end > running else running
+            self.max_ends.append(running)
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any], spans: Optional[Iterable[Tuple[int, int]]] = None) -> "TimelineLayer":
+        """Builds a layer from items with `start`/`end` (or `timestamp`) attributes, or from explicit spans."""
+        items = list(items)
+        spans = list(spans) if spans is not None else [_span(i) for i in items]
+        order = sorted(range(len(items)), key=lambda i: spans[i][0])
+        return cls([items[i] for i in order], [spans[i][0] for i in order], [spans[i][1] for i in order])
+
+    @classmethod
+    def from_words(cls, words: WordArray) -> "TimelineLayer":
+        """Builds a layer over a WordArray without materializing its words. Words are already in time order."""
+        return cls(words, list(words.starts()), list(words.ends()))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def overlapping_indexes(self, start: int, end: int) -> List[int]:
+        """Indexes of the items whose [start, end] overlaps [start, end]."""
+        lo = bisect_left(self.max_ends, start)
+        hi = bisect_right(self.starts, end)
+        ends = self.ends
+        return [i for i in range(lo, hi) if ends[i] >= start]
+
+    def overlapping(self, start: int, end: int) -> List[Any]:
+        """Items whose [start, end] overlaps [start, end], in start order."""
+        items = self.items
+        return [items[i] for i in self.overlapping_indexes(start, end)]
+
+    def at(self, t: int) -> Optional[Any]:
+        """The latest-starting item that contains time t, None if no item does."""
+        indexes = self.overlapping_indexes(t, t)
+        return self.items[indexes[-1]] if indexes else None
+
+    def starting_within(self, start: int, end: int) -> List[Any]:
+        """Items whose start lies in [start, end]."""
+        return [self.items[i] for i in range(bisect_left(self.starts, start), bisect_right(self.starts, end))]
+
+
+@dataclass
+class ChapterSlice:
+    """The items of each layer that start within one chapter."""
+    chapter: Chapter
+    items: Dict[str, List[Any]] = field(default_factory=dict)
+
+    def __getitem__(self, layer: str) -> List[Any]:
+        return self.items.get(layer, [])
+
+
+class TimelineIndex:
+    """Answers time-range queries over a transcript, built once in O(n log n).
+
+    Layers: words, utterances, chapters, sentiment_analysis_results, entities, iab_categories (IAB results by timestamp),
+    auto_highlights (one entry per highlight timestamp) and, when given, sentences and paragraphs.
+    """
+
+    def __init__(self, transcript: Transcript, sentences: Optional[Sequence[UtteredWord]] = None, paragraphs: Optional[Sequence[Utterance]] = None) -> None:
+        self.layers: Dict[str, TimelineLayer] = {}
+
+        words = transcript.words or []
+        self.layers["words"] = TimelineLayer.from_words(words) if isinstance(words, WordArray) else TimelineLayer.from_items(words)
+        self.layers["utterances"] = TimelineLayer.from_items(transcript.utterances or [])
+        self.layers["chapters"] = TimelineLayer.from_items(transcript.chapters or [])
+        self.layers["sentiment_analysis_results"] = TimelineLayer.from_items(transcript.sentiment_analysis_results or [])
+        self.layers["entities"] = TimelineLayer.from_items(transcript.entities or [])
+        iab = transcript.iab_categories_result
+        self.layers["iab_categories"] = TimelineLayer.from_items(iab.results if iab else [])
+        highlights = transcript.auto_highlights_result.results if transcript.auto_highlights_result else []
+        self.layers["auto_highlights"] = TimelineLayer.from_items(
+            [h for h in highlights for _ in h.timestamps],
+            [(ts.start, ts.end) for h in highlights for ts in h.timestamps],
+        )
+        if sentences is not None:
+            self.layers["sentences"] = TimelineLayer.from_items(sentences)
+        if paragraphs is not None:
+            self.layers["paragraphs"] = TimelineLayer.from_items(paragraphs)
+
+    def __getitem__(self, layer: str) -> TimelineLayer:
+        return self.layers[layer]
+
+    def overlapping(self, start: int, end: int, layer: str = "utterances") -> List[Any]:
+        """Items of a layer overlapping [start, end] (ms), in start order."""
+        return self.layers[layer].overlapping(start, end)
+
+    def everything_overlapping(self, start: int, end: int) -> Dict[str, List[Any]]:
+        """Items of every layer overlapping [start, end] (ms)."""
+        return {name: layer.overlapping(start, end) for name, layer in self.layers.items()}
+
+    def word_at(self, t: int) -> Optional[UtteredWord]:
+        """The word spoken at time t (ms), None between words."""
+        return self.layers["words"].at(t)
+
+    def align_to_chapters(self, layers: Optional[Iterable[str]] = None) -> List[ChapterSlice]:
+        """Assigns the items of each layer to the chapter their start falls in, in one merge pass per layer.
+
+        Items starting outside every chapter are left out. Chapters are expected not to overlap.
+        """
+        chapters = self.layers["chapters"]
+        names = [n for n in (layers or self.layers) if n != "chapters" and n in self.layers]
+        slices = [ChapterSlice(c) for c in chapters.items]
+
+        for name in names:
+            layer = self.layers[name]
+            for s in slices:
+                s.items[name] = []
+            i = 0
+            for c, s in enumerate(slices):
+                chapter_start, chapter_end = chapters.starts[c], chapters.ends[c]
+                while i < len(layer) and layer.starts[i] < chapter_start:
+                    i += 1
+                bucket = s.items[name]
+                while i < len(layer) and layer.starts[i] <= chapter_end:
+                    bucket.append(layer.items[i])
+                    i += 1
+        return slices
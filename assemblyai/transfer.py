@@ -0,0 +1,203 @@
+"""Chunk sources, read-ahead and progress reporting for uploads."""
+
+import asyncio
+import mmap
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional, Union
+
+Chunk = Union[bytes, memoryview]
+
+
+@dataclass
+class UploadProgress:
+    """Progress of one upload attempt, passed to the `progress` callback of an upload."""
+    bytes_sent: int
+    total_bytes: Optional[int]
+    elapsed: float
+    attempt: int = 0
+    done: bool = False
+
+    @property
+    def mb_per_s(self) -> float:
+        """Average throughput of the attempt so far, in MB/s."""
+        return self.bytes_sent / self.elapsed / 1e6 if self.elapsed > 0 else 0.0
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share of the content sent, None if the total size is unknown."""
+        return self.bytes_sent / self.total_bytes if self.total_bytes else None
+
+
+class ProgressMeter:
+    """Counts the bytes of chunks as the HTTP client pulls them and reports them to a callback."""
+
+    def __init__(self, callback: Optional[Callable[[UploadProgress], Any]], total_bytes: Optional[int], attempt: int = 0) -> None:
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self.attempt = attempt
+        self.bytes_sent = 0
+        self.started = time.monotonic()
+
+    def report(self, done: bool = False) -> None:
+        if self.callback is not None:
+            self.callback(UploadProgress(self.bytes_sent, self.total_bytes, time.monotonic() - self.started, self.attempt, done))
+
+    def wrap(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        """Yields the chunks, counting each once the HTTP client asks for the next. Closes `chunks` when done or abandoned."""
+        try:
+            for chunk in chunks:
+                yield chunk
+                self.bytes_sent += len(chunk)
+                self.report()
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    async def awrap(self, chunks: AsyncIterable[Chunk]) -> AsyncIterator[Chunk]:
+        """Async version of wrap()."""
+        try:
+            async for chunk in chunks:
+                yield chunk
+                self.bytes_sent += len(chunk)
+                self.report()
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def split(content: bytes, chunk_size: int) -> Iterator[memoryview]:
+    """Zero-copy chunks of an in-memory payload."""
+    view = memoryview(content)
+    for offset in range(0, len(view), chunk_size):
+        yield view[offset:offset + chunk_size]
+
+
+async def aiter_split(content: bytes, chunk_size: int) -> AsyncIterator[memoryview]:
+    """split() as an async iterable, for AsyncClient requests."""
+    for chunk in split(content, chunk_size):
+        yield chunk
+
+
+def mmap_chunks(filename: str, chunk_size: int, hasher: Any = None) -> Iterator[Chunk]:
+    """Zero-copy chunks of a file, as slices of a read-only memory map. Each chunk is fed to `hasher`, if given."""
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        for offset in range(0, len(view), chunk_size):
+            chunk = view[offset:offset + chunk_size]
+            if hasher is not None:
+                hasher.update(chunk)
+            yield chunk
+    finally:
+        try:
+            view.release()
+            mapped.close()
+        except BufferError:
+            # The HTTP client still holds a chunk; the map is closed once that is garbage collected.
+            pass
+
+
+def read_ahead(chunks: Iterable[Chunk], buffer_chunks: int) -> Iterator[Chunk]:
+    """Pulls chunks from `chunks` on a background thread, keeping up to `buffer_chunks` of them ready.
+
+    Reading is overlapped with sending. Errors of the source are raised to the consumer. Closing the returned
+    generator stops the thread.
+    """
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, buffer_chunks))
+    stopped = threading.Event()
+    end = object()
+
+    def produce() -> None:
+        item: Any = end
+        source = iter(chunks)
+        try:
+            for chunk in source:
+                if not _put(chunk):
+                    return
+        except BaseException as error:
+            item = error
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+        _put(item)
+
+    def _put(item: Any) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    thread = threading.Thread(target=produce, name="assemblyai-read-ahead", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is end:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Not joined: the thread may be blocked reading a pipe. It exits at its next chunk.
+        stopped.set()
+
+
+async def aread_ahead(chunks: AsyncIterable[Chunk], buffer_chunks: int) -> AsyncIterator[Chunk]:
+    """Pulls chunks from an async iterable in a background task, keeping up to `buffer_chunks` of them ready."""
+    buffer: "asyncio.Queue[Any]" = asyncio.Queue(maxsize=max(1, buffer_chunks))
+    end = object()
+
+    async def produce() -> None:
+        try:
+            async for chunk in chunks:
+                await buffer.put(chunk)
+        except Exception as error:
+            await buffer.put(error)
+            return
+        await buffer.put(end)
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item = await buffer.get()
+            if item is end:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+async def aiter_sync(chunks: Iterable[Chunk]) -> AsyncIterator[Chunk]:
+    """Iterates a blocking iterable, such as a pipe or a file reader, from the default executor."""
+    loop = asyncio.get_running_loop()
+    source = iter(chunks)
+    end = object()
+    try:
+        while True:
+            chunk = await loop.run_in_executor(None, next, source, end)
+            if chunk is end:
+                return
+            yield chunk
+    finally:
+        close = getattr(source, "close", None)
+        if close is not None:
+            try:
+                await loop.run_in_executor(None, close)
+            except ValueError:
+                # Abandoned while a next() call is still running in the executor.
+                pass
@@ -0,0 +1,252 @@
+"""Push-based transcript completion through AssemblyAI webhooks."""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from assemblyai.model import Transcript, TranscriptStatus
+from assemblyai.poller import TranscriptPoller
+
+if TYPE_CHECKING:
+    from assemblyai.api_endpoints import TranscriptEndpoint
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingTranscript:
+    future: "Future[Transcript]"
+    registered_at: float
+    polling: bool = False
+    callbacks: List[Callable[[Transcript], Any]] = field(default_factory=list)
+
+
+class WebhookReceiver:
+    """Resolves pending transcripts when AssemblyAI calls their webhook_url.
+
+    Register each transcript with expect() after creating it with `webhook_url` pointing at this receiver. Final-status
+    webhooks that arrive before their transcript is expected are buffered, up to `max_unmatched` of them, so a transcript
+    that completes before expect() is still resolved.
+    The receiver runs either as an ASGI app (the instance is callable) or as a threaded HTTP server via serve().
+    Completed transcripts are fetched on a pool of `max_concurrency` threads. Transcripts whose callback has not arrived
+    within `fallback_after` seconds are handed to a TranscriptPoller. Exceptions raised by callbacks are logged to the
+    `assemblyai.webhook` logger.
+
+    *[Reference](https://www.assemblyai.com/docs/walkthroughs#using-webhooks)*
+    """
+
+    def __init__(self, endpoint: "TranscriptEndpoint", max_concurrency: int = 8, fallback_after: Optional[float] = 300.0, fallback_interval: float = 5.0, auth_header: Optional[Tuple[str, str]] = None, poller: Optional[TranscriptPoller] = None, max_unmatched: int = 1024) -> None:
+        self.endpoint = endpoint
+        self.max_concurrency = max_concurrency
+        self.max_unmatched = max_unmatched
+        self.fallback_after = fallback_after
+        self.fallback_interval = fallback_interval
+        self.auth_header = auth_header
+        self.poller = poller or TranscriptPoller(endpoint, max_concurrency=max_concurrency)
+        self._pending: Dict[str, _PendingTranscript] = {}
+        # IDs of final-status webhooks that arrived before expect(), oldest first.
+        self._unmatched: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        self._stopped = threading.Event()
+        self._fallback_thread: Optional[threading.Thread] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def expect(self, transcript_id: str, callback: Optional[Callable[[Transcript], Any]] = None) -> "Future[Transcript]":
+        """Registers a transcript whose webhook is expected.
+
+        The returned future resolves to the full Transcript once it is completed or errored. `callback` is called with the same Transcript.
+        """
+        with self._lock:
+            pending = self._pending.get(transcript_id)
+            arrived = False
+            if pending is None:
+                pending = _PendingTranscript(Future(), time.monotonic())
+                self._pending[transcript_id] = pending
+                arrived = self._unmatched.pop(transcript_id, False) is None
+            if callback:
+                pending.callbacks.append(callback)
+        if arrived:
+            self._pool.submit(self._fetch, transcript_id)
+        return pending.future
+
+    @property
+    def pending(self) -> List[str]:
+        """IDs of expected transcripts that have not been resolved."""
+        with self._lock:
+            return list(self._pending)
+
+    def handle(self, payload: Dict[str, Any]) -> bool:
+        """Handles a decoded webhook payload. Returns True iff it matched a pending transcript.
+
+        Fetching the transcript happens in the background. A final status of a transcript that is not expected yet is
+        buffered for a later expect().
+        """
+        transcript_id = payload.get("transcript_id")
+        if payload.get("status") not in (TranscriptStatus.completed, TranscriptStatus.error):
+            return False
+
+        with self._lock:
+            pending = self._pending.get(transcript_id)
+            if pending is None:
+                if transcript_id:
+                    self._unmatched[transcript_id] = None
+                    self._unmatched.move_to_end(transcript_id)
+                    while len(self._unmatched) > self.max_unmatched:
+                        self._unmatched.popitem(last=False)
+                return False
+            if pending.polling:
+                self.poller.untrack(transcript_id)
+                pending.polling = False
+
+        self._pool.submit(self._fetch, transcript_id)
+        return True
+
+    def handle_request(self, body: bytes, headers: Dict[str, str]) -> int:
+        """Handles a raw webhook request. Returns the HTTP status code to respond with."""
+        if self.auth_header:
+            name, value = self.auth_header
+            if headers.get(name.lower()) != value:
+                return 401
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return 400
+        if not isinstance(payload, dict):
+            return 400
+        self.handle(payload)
+        return 200
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        """ASGI entrypoint."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    self.start()
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    # stop() waits for in-flight fetches, which must not block the event loop.
+                    import asyncio
+
+                    await asyncio.get_running_loop().run_in_executor(None, self.stop)
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        if scope["method"] != "POST":
+            status = 405
+        else:
+            body = b""
+            more_body = True
+            while more_body:
+                message = await receive()
+                body += message.get("body", b"")
+                more_body = message.get("more_body", False)
+            headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+            status = self.handle_request(body, headers)
+
+        await send({"type": "http.response.start", "status": status, "headers": [(b"content-length", b"0")]})
+        await send({"type": "http.response.body", "body": b""})
+
+    def serve(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Serves webhooks from a threaded HTTP server in the background. Returns the bound (host, port)."""
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                body = self.rfile.read(int(self.headers.get("content-length", 0)))
+                status = receiver.handle_request(body, {k.lower(): v for k, v in self.headers.items()})
+                self.send_response(status)
+                self.send_header("content-length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self.start()
+        return self._server.server_address[:2]
+
+    def start(self) -> None:
+        """Starts the background thread that polls for transcripts whose webhook never arrived."""
+        if self.fallback_after is None or self._fallback_thread is not None:
+            return
+        self._stopped.clear()
+        self._fallback_thread = threading.Thread(target=self._run_fallback, daemon=True)
+        self._fallback_thread.start()
+
+    def stop(self) -> None:
+        """Stops the HTTP server, if any, and the fallback poller, and waits for in-flight fetches. The receiver can be started again."""
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._fallback_thread is not None:
+            self._fallback_thread.join()
+            self._fallback_thread = None
+        # A fresh executor starts no threads until used, so a later start() can still fetch.
+        pool, self._pool = self._pool, ThreadPoolExecutor(max_workers=self.max_concurrency)
+        pool.shutdown(wait=True)
+        self.poller.close()
+
+    def close(self) -> None:
+        """Stops the receiver and waits for in-flight fetches."""
+        self.stop()
+
+    def _run_fallback(self) -> None:
+        while not self._stopped.wait(self.fallback_interval):
+            self._poll_stale()
+            if self.poller.pending:
+                self.poller.poll_once()
+
+    def _poll_stale(self) -> None:
+        """Hands transcripts that have waited longer than fallback_after to the poller."""
+        now = time.monotonic()
+        with self._lock:
+            stale = [(i, p) for i, p in self._pending.items() if not p.polling and now - p.registered_at >= self.fallback_after]
+            for _, pending in stale:
+                pending.polling = True
+
+        for transcript_id, _ in stale:
+            self.poller.track(transcript_id).add_done_callback(lambda f, i=transcript_id: self._resolve(i, f))
+
+    def _fetch(self, transcript_id: str) -> None:
+        future: "Future[Transcript]" = Future()
+        try:
+            future.set_result(self.endpoint.get(transcript_id))
+        except Exception as e:
+            future.set_exception(e)
+        self._resolve(transcript_id, future)
+
+    def _resolve(self, transcript_id: str, result: "Future[Transcript]") -> None:
+        if result.cancelled():
+            # The poller was told to stop, because the webhook arrived: the fetch resolves the transcript.
+            return
+        with self._lock:
+            pending = self._pending.pop(transcript_id, None)
+        if pending is None:
+            return
+
+        if result.exception() is not None:
+            pending.future.set_exception(result.exception())
+            return
+
+        transcript = result.result()
+        pending.future.set_result(transcript)
+        for callback in pending.callbacks:
+            try:
+                callback(transcript)
+            except Exception:
+                # Raised on a pool thread, where nobody would see it.
+                logger.exception("Callback for transcript %s failed", transcript_id)
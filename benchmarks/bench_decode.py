@@ -0,0 +1,70 @@
+"""Benchmark decoding a large transcript with Transcript.from_dict against assemblyai.decoding.
+
+    python benchmarks/bench_decode.py --words 200000
+"""
+
+import argparse
+import dataclasses
+import json
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assemblyai import decoding  # noqa: E402
+from assemblyai.model import Transcript  # noqa: E402
+from benchmarks.synthetic import synthetic_transcript  # noqa: E402
+
+
+def same(a, b) -> bool:
+    """Deep comparison that, unlike ==, also checks types (e.g. an Enum member against its str value)."""
+    if type(a) is not type(b):
+        return False
+    if dataclasses.is_dataclass(a):
+        return all(same(getattr(a, f.name), getattr(b, f.name)) for f in dataclasses.fields(a))
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(same(a[k], b[k]) for k in a)
+    return a == b
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    payload = synthetic_transcript(words=args.words, utterances=args.words // 50)
+    body = json.dumps(payload).encode()
+
+    if not same(decoding.decode(Transcript, payload), Transcript.from_dict(payload)):
+        raise SystemExit("decoding.decode() and Transcript.from_dict() disagree")
+
+    results = {
+        "words": args.words,
+        "body_bytes": len(body),
+        "orjson": decoding.orjson is not None,
+        "json_loads_s": best_of(args.repeat, lambda: json.loads(body)),
+        "fast_loads_s": best_of(args.repeat, lambda: decoding.loads(body)),
+        "from_dict_s": best_of(args.repeat, lambda: Transcript.from_dict(payload)),
+        "decode_s": best_of(args.repeat, lambda: decoding.decode(Transcript, payload)),
+    }
+    results["speedup"] = results["from_dict_s"] / results["decode_s"]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark peak memory (RSS) of retrieving one long transcript with get() against get_streaming().
+
+The transcript body is written to a temporary file once and streamed from it by a mock transport, so the fake server adds
+no memory. Each mode runs in a fresh interpreter and reports how much its peak RSS grew during the call.
+
+    python benchmarks/bench_get_memory.py --words 500000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "get": "client.transcript.get('t')",
+    "get_compact": "client.transcript.get('t', compact_words=True)",
+    "get_lazy": "client.transcript.get('t', lazy=True)",
+    "get_streaming": "client.transcript.get_streaming('t', compact_words=True)",
+    "get_streaming_callbacks": "client.transcript.get_streaming('t', on_word=lambda w: None, on_utterance=lambda u: None)",
+}
+
+# Runs in the child interpreter: {body} is the file to serve, {call} the mode.
+CHILD = """
+import json, resource, sys, time, warnings
+warnings.simplefilter("ignore")
+sys.path.insert(0, {root!r})
+import httpx
+from assemblyai.client import Client
+import assemblyai.api_endpoints
+
+def serve(request):
+    def chunks():
+        with open({body!r}, "rb") as f:
+            for chunk in iter(lambda: f.read(65536), b""):
+                yield chunk
+    return httpx.Response(200, content=chunks(), headers={{"content-type": "application/json"}})
+
+client = Client("key", transport=httpx.MockTransport(serve))
+client.transcript.get_streaming  # create the endpoint before the baseline
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+started = time.perf_counter()
+result = {call}
+elapsed = time.perf_counter() - started
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"baseline_mb": baseline / 1024, "peak_growth_mb": (peak - baseline) / 1024, "elapsed_s": elapsed, "words": len(result.words)}}))
+"""
+
+
+def write_body(path: str, words: int) -> int:
+    """Writes a synthetic transcript body to path from a child interpreter.
+
+    Linux keeps a process's peak RSS across exec, so building the payload here would inflate the baseline of every mode.
+    """
+    code = (f"import json, sys; sys.path.insert(0, {ROOT!r}); from benchmarks.synthetic import synthetic_transcript; "
+            f"json.dump(synthetic_transcript(words={words}, utterances={max(1, words // 50)}, chapters=20), open({path!r}, 'w'))")
+    subprocess.run([sys.executable, "-c", code], check=True)
+    return os.path.getsize(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=300000, help="words in the transcript; about 6000 per hour of audio")
+    parser.add_argument("--only", nargs="+", choices=sorted(MODES))
+    args = parser.parse_args()
+
+    try:
+        import resource  # noqa: F401
+    except ImportError:
+        raise SystemExit("peak RSS is measured with the resource module, which is not available on this platform")
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as directory:
+        body = os.path.join(directory, "transcript.json")
+        size = write_body(body, args.words)
+        results = {}
+        for name in args.only or MODES:
+            code = CHILD.format(root=ROOT, body=body, call=MODES[name])
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+            results[name] = json.loads(output)
+    print(json.dumps({"words": args.words, "body_mb": size / 1e6, "results": results, "elapsed_s": time.perf_counter() - started}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
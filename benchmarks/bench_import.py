@@ -0,0 +1,61 @@
+"""Benchmark the import time of the package, each measured in a fresh interpreter.
+
+Also checks that importing the client alone does not import the heavy modules only needed once a request is made.
+
+    python benchmarks/bench_import.py --runs 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STATEMENTS = {
+    "package": "import assemblyai",
+    "client": "from assemblyai.client import Client",
+    "model": "import assemblyai.model",
+    "first_decode": "from assemblyai.model import Transcript; Transcript.from_dict({'id': 'x', 'status': 'completed'})",
+    "client_endpoints": "from assemblyai.client import Client; Client('key').transcript",
+}
+
+# Modules that `from assemblyai.client import Client` must not import.
+DEFERRED_MODULES = ("asyncio", "dataclasses_json", "marshmallow", "http.server", "assemblyai.api_endpoints", "assemblyai.model")
+
+
+def time_statement(statement: str) -> float:
+    """Seconds taken by `statement` in a fresh interpreter, excluding interpreter start-up."""
+    code = f"import time; started = time.perf_counter(); {statement}; print(time.perf_counter() - started)"
+    output = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True, cwd=ROOT).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def imported_by_client() -> list:
+    code = f"import sys; from assemblyai.client import Client; print(' '.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    return subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT).stdout.split()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters per statement; the median is reported")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = {name: statistics.median(time_statement(statement) for _ in range(args.runs)) * 1000 for name, statement in STATEMENTS.items()}
+    imported = imported_by_client()
+    print(json.dumps({
+        "runs": args.runs,
+        "median_ms": results,
+        "imported_by_client": imported,
+        "elapsed_s": time.perf_counter() - started,
+    }, indent=2))
+    if imported:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
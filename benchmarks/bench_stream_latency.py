@@ -0,0 +1,67 @@
+"""Benchmark end-to-end latency of StreamEndpoint.stream against FakeAssemblyAI with a simulated server delay.
+
+Latency is the time from a frame's last byte being produced to its StreamPayload reaching the caller.
+
+    python benchmarks/bench_stream_latency.py --seconds 10 --server-latency 0.2 --realtime
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assemblyai.client import Client  # noqa: E402
+from assemblyai.streaming import AudioFormat  # noqa: E402
+from assemblyai.testing import FakeAssemblyAI  # noqa: E402
+
+
+def run(seconds: float, frame_ms: int, max_in_flight: int, server_latency: float, realtime: bool) -> dict:
+    fake = FakeAssemblyAI()
+    fake.stream_latency = server_latency
+    client = Client("key", transport=fake.transport())
+    frame = os.urandom(AudioFormat().frame_bytes(frame_ms))
+    frames = int(seconds * 1000 // frame_ms)
+    produced = []
+
+    def microphone():
+        started = time.perf_counter()
+        for i in range(frames):
+            if realtime:
+                time.sleep(max(0.0, started + (i + 1) * frame_ms / 1000 - time.perf_counter()))
+            produced.append(time.perf_counter())
+            yield frame
+
+    started = time.perf_counter()
+    latencies = [time.perf_counter() - produced[i] for i, _ in enumerate(client.stream.stream(microphone(), frame_ms=frame_ms, max_in_flight=max_in_flight))]
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "max_in_flight": max_in_flight,
+        "frames": frames,
+        "elapsed_s": elapsed,
+        "audio_x_realtime": seconds / elapsed,
+        "latency_p50_ms": statistics.median(latencies) * 1000,
+        "latency_p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "latency_max_ms": latencies[-1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of audio streamed")
+    parser.add_argument("--frame-ms", type=int, default=250)
+    parser.add_argument("--server-latency", type=float, default=0.2, help="seconds the fake server takes per frame")
+    parser.add_argument("--realtime", action="store_true", help="produce audio at real-time pace, like a live call")
+    parser.add_argument("--in-flight", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    results = [run(args.seconds, args.frame_ms, n, args.server_latency, args.realtime) for n in args.in_flight]
+    print(json.dumps({"frame_ms": args.frame_ms, "server_latency_s": args.server_latency, "realtime": args.realtime, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
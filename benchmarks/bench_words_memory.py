@@ -0,0 +1,46 @@
+"""Benchmark memory used by a transcript's words as UtteredWord objects against a columnar.WordArray.
+
+    python benchmarks/bench_words_memory.py --words 200000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assemblyai.decoding import decode  # noqa: E402
+from assemblyai.model import Transcript  # noqa: E402
+from benchmarks.synthetic import synthetic_transcript  # noqa: E402
+
+
+def allocated(fn) -> int:
+    """Bytes still allocated by the result of fn()."""
+    tracemalloc.start()
+    result = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--words", type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = synthetic_transcript(words=args.words, utterances=args.words // 50)
+    dataclass_bytes = allocated(lambda: decode(Transcript, payload))
+    compact_bytes = allocated(lambda: decode(Transcript, payload, compact_words=True))
+    print(json.dumps({
+        "words": args.words,
+        "dataclass_bytes": dataclass_bytes,
+        "compact_bytes": compact_bytes,
+        "ratio": dataclass_bytes / compact_bytes,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Reproducible benchmark suite against FakeAssemblyAI, an in-memory stand-in for the API.
+
+Measures decoding, all() pagination, uploads, completion polling, concurrent creates and caption export, with an optional simulated
+network latency per request. Results are printed (and optionally written) as JSON. Passing the results of an earlier
+run as --baseline reports every benchmark whose throughput dropped by more than --tolerance and exits with status 1.
+
+    python benchmarks/suite.py --out results.json
+    python benchmarks/suite.py --baseline results.json --only decode pagination
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from assemblyai import decoding, export  # noqa: E402
+from assemblyai.client import Client  # noqa: E402
+from assemblyai.model import Transcript  # noqa: E402
+from assemblyai.poller import AdaptiveBackoff, TranscriptPoller  # noqa: E402
+from assemblyai.testing import FakeAssemblyAI  # noqa: E402
+from benchmarks.bench_decode import best_of  # noqa: E402
+from benchmarks.synthetic import synthetic_transcript  # noqa: E402
+
+# The metric compared against a baseline, for each benchmark. All are "higher is better".
+PRIMARY_METRICS = {
+    "decode": "transcripts_per_s",
+    "pagination": "transcripts_per_s",
+    "upload": "mb_per_s",
+    "poll": "resolved_per_request",
+    "create": "creates_per_s",
+    "export": "words_per_s",
+}
+
+
+def client_for(fake: FakeAssemblyAI, latency: float) -> Client:
+    """A Client served by `fake`, with `latency` seconds added to every request."""
+    def handle(request: httpx.Request) -> httpx.Response:
+        if latency:
+            time.sleep(latency)
+        return fake.handle(request)
+    return Client("key", transport=httpx.MockTransport(handle))
+
+
+def bench_decode(args: argparse.Namespace) -> Dict[str, Any]:
+    payload = synthetic_transcript(words=args.words, utterances=args.utterances, chapters=args.chapters)
+    body = json.dumps(payload).encode()
+    from_dict_s = best_of(args.repeat, lambda: Transcript.from_dict(json.loads(body)))
+    decode_s = best_of(args.repeat, lambda: decoding.decode(Transcript, decoding.loads(body)))
+    compact_s = best_of(args.repeat, lambda: decoding.decode(Transcript, decoding.loads(body), compact_words=True))
+    return {
+        "body_bytes": len(body),
+        "from_dict_s": from_dict_s,
+        "decode_s": decode_s,
+        "decode_compact_s": compact_s,
+        "speedup": from_dict_s / decode_s,
+        "transcripts_per_s": 1 / decode_s,
+        "words_per_s": args.words / decode_s,
+    }
+
+
+def bench_pagination(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeAssemblyAI()
+    for i in range(args.pages * args.page_size):
+        fake.add_transcript({"audio_url": f"https://example.com/{i}.mp3"})
+    client = client_for(fake, args.latency)
+    results: Dict[str, Any] = {"pages": args.pages, "page_size": args.page_size}
+    for name, fetch in (
+        ("all", lambda: client.transcript.all(limit=args.page_size, first_page_only=False)),
+        ("iter_all", lambda: list(client.transcript.iter_all(limit=args.page_size, prefetch=False))),
+        ("iter_all_prefetch", lambda: list(client.transcript.iter_all(limit=args.page_size))),
+    ):
+        results[f"{name}_s"] = best_of(args.repeat, fetch)
+    results["transcripts_per_s"] = args.pages * args.page_size / results["iter_all_prefetch_s"]
+    return results
+
+
+def bench_upload(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeAssemblyAI()
+    client = client_for(fake, args.latency)
+    size = int(args.upload_mb * 1024 * 1024)
+    results: Dict[str, Any] = {"bytes": size}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "audio.wav")
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+        for name, kwargs in (("buffered", {"read_ahead": 0}), ("read_ahead", {"read_ahead": 4}), ("mmap", {"use_mmap": True, "read_ahead": 0})):
+            seconds = best_of(args.repeat, lambda: client.upload.upload_file(path, **kwargs))
+            results[f"{name}_mb_per_s"] = size / seconds / 1e6
+            fake.uploads.clear()
+    results["mb_per_s"] = max(v for k, v in results.items() if k.endswith("_mb_per_s"))
+    return results
+
+
+def bench_poll(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeAssemblyAI()
+    client = client_for(fake, args.latency)
+    rng = random.Random(0)
+    ids = [fake.add_transcript({"audio_url": f"https://example.com/{i}.mp3", "status": "processing"}) for i in range(args.transcripts)]
+    schedule = sorted((rng.uniform(0, args.poll_window), transcript_id) for transcript_id in ids)
+
+    def complete_on_schedule() -> None:
+        started = time.monotonic()
+        for at, transcript_id in schedule:
+            time.sleep(max(0.0, started + at - time.monotonic()))
+            fake.complete(transcript_id, text="done")
+
+    completer = threading.Thread(target=complete_on_schedule, daemon=True)
+    poller = TranscriptPoller(client.transcript, backoff=AdaptiveBackoff(min_interval=0.05, max_interval=0.5), page_size=100)
+    started = time.perf_counter()
+    completer.start()
+    poller.wait(ids, timeout=args.poll_window + 60)
+    elapsed = time.perf_counter() - started
+    completer.join()
+    gets, lists = fake.requests[("GET", "transcript/{id}")], fake.requests[("GET", "transcript")]
+    return {
+        "transcripts": args.transcripts,
+        "window_s": args.poll_window,
+        "elapsed_s": elapsed,
+        "get_requests": gets,
+        "list_requests": lists,
+        "resolved_per_request": args.transcripts / (gets + lists),
+    }
+
+
+def bench_create(args: argparse.Namespace) -> Dict[str, Any]:
+    fake = FakeAssemblyAI()
+    client = client_for(fake, args.latency)
+    requests = [Transcript(audio_url=f"https://example.com/{i}.mp3") for i in range(args.transcripts)]
+    results: Dict[str, Any] = {"transcripts": args.transcripts, "latency_s": args.latency}
+    for concurrency in (1, args.concurrency):
+        started = time.perf_counter()
+        job = client.transcript.create_many(requests, max_concurrency=concurrency)
+        elapsed = time.perf_counter() - started
+        if job.failed:
+            raise SystemExit(f"{len(job.failed)} creates failed")
+        results[f"concurrency_{concurrency}_creates_per_s"] = args.transcripts / elapsed
+    results["creates_per_s"] = results[f"concurrency_{args.concurrency}_creates_per_s"]
+    return results
+
+
+def bench_export(args: argparse.Namespace) -> Dict[str, Any]:
+    transcript = decoding.decode(Transcript, synthetic_transcript(words=args.words, utterances=args.utterances, chapters=args.chapters))
+    results: Dict[str, Any] = {"words": args.words}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, chunks in (("srt", lambda: export.srt(transcript.words)), ("webvtt", lambda: export.webvtt(transcript.words)), ("jsonl", lambda: export.jsonl(transcript.words))):
+            path = os.path.join(directory, f"export.{name}")
+            results[f"{name}_s"] = best_of(args.repeat, lambda: export.write(chunks(), path))
+    results["words_per_s"] = args.words / results["srt_s"]
+    return results
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, Any]]] = {
+    "decode": bench_decode,
+    "pagination": bench_pagination,
+    "upload": bench_upload,
+    "poll": bench_poll,
+    "create": bench_create,
+    "export": bench_export,
+}
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Benchmarks whose primary metric dropped by more than `tolerance` against the baseline."""
+    found = []
+    for name, metric in PRIMARY_METRICS.items():
+        old = baseline.get("results", {}).get(name, {}).get(metric)
+        new = results["results"].get(name, {}).get(metric)
+        if old and new is not None and new < old * (1 - tolerance):
+            found.append(f"{name}.{metric}: {new:.4g} < {old:.4g} (-{(1 - new / old) * 100:.0f}%)")
+    return found
+
+
+def revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run, by default all")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the best is kept")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds of simulated network latency per request")
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--utterances", type=int, default=400)
+    parser.add_argument("--chapters", type=int, default=10)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--upload-mb", type=float, default=64)
+    parser.add_argument("--transcripts", type=int, default=200, help="transcripts polled and created")
+    parser.add_argument("--poll-window", type=float, default=2.0, help="seconds over which polled transcripts complete")
+    parser.add_argument("--concurrency", type=int, default=8, help="max_concurrency of the create benchmark")
+    parser.add_argument("--out", help="also write the results to this file")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="relative drop of a primary metric reported as a regression")
+    args = parser.parse_args()
+
+    warnings.simplefilter("ignore")
+    results = {
+        "meta": {
+            "revision": revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "orjson": decoding.orjson is not None,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "args": {k: v for k, v in vars(args).items() if k not in ("out", "baseline")},
+        },
+        "results": {name: BENCHMARKS[name](args) for name in (args.only or BENCHMARKS)},
+    }
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
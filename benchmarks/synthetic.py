@@ -0,0 +1,95 @@
+"""Synthetic AssemblyAI API payloads for benchmarks."""
+
+import random
+from typing import Any, Dict, List
+
+VOCABULARY = ["the", "a", "podcast", "episode", "audio", "transcript", "speaker", "chapter", "today", "we", "talk", "about", "money", "mindset", "church", "assets", "report", "interview", "and", "so"]
+
+
+def synthetic_words(count: int, start: int = 0, speakers: str = "AB", seed: int = 0) -> List[Dict[str, Any]]:
+    """Words of roughly 300ms each, alternating speakers every 50 words."""
+    rng = random.Random(seed)
+    words = []
+    t = start
+    for i in range(count):
+        duration = rng.randint(120, 480)
+        words.append({
+            "text": rng.choice(VOCABULARY),
+            "start": t,
+            "end": t + duration,
+            "confidence": round(rng.uniform(0.5, 1.0), 5),
+            "speaker": speakers[(i // 50) % len(speakers)],
+        })
+        t += duration + rng.randint(0, 60)
+    return words
+
+
+def synthetic_transcript(words: int = 10000, utterances: int = 200, chapters: int = 10, sentiments: int = 100, entities: int = 100, transcript_id: str = "synthetic", seed: int = 0) -> Dict[str, Any]:
+    """A completed transcript dict, as returned by GET /v2/transcript/{id}, with the given number of each item."""
+    rng = random.Random(seed)
+    word_list = synthetic_words(words, seed=seed)
+    end = word_list[-1]["end"] if word_list else 0
+
+    def spans(count: int) -> List[List[Dict[str, Any]]]:
+        size = max(1, len(word_list) // max(1, count))
+        return [word_list[i:i + size] for i in range(0, len(word_list), size)][:count]
+
+    def text(span: List[Dict[str, Any]]) -> str:
+        return " ".join(w["text"] for w in span)
+
+    return {
+        "id": transcript_id,
+        "status": "completed",
+        "audio_url": f"https://example.com/{transcript_id}.mp3",
+        "text": text(word_list),
+        "confidence": 0.9,
+        "audio_duration": end / 1000,
+        "punctuate": True,
+        "format_text": True,
+        "dual_channel": False,
+        "webhook_url": None,
+        "webhook_status_code": None,
+        "audio_start_from": None,
+        "audio_end_at": None,
+        "word_boost": [],
+        "boost_param": None,
+        "filter_profanity": False,
+        "redact_pii": False,
+        "redact_pii_audio": False,
+        "redact_pii_sub": None,
+        "speaker_labels": True,
+        "content_safety": False,
+        "iab_categories": True,
+        "disfluencies": False,
+        "sentiment_analysis": True,
+        "auto_chapters": True,
+        "entity_detection": True,
+        "language_code": "en_us",
+        "words": word_list,
+        "utterances": [
+            {"start": s[0]["start"], "end": s[-1]["end"], "text": text(s), "confidence": 0.9, "speaker": s[0]["speaker"], "words": s}
+            for s in spans(utterances)
+        ],
+        "auto_highlights_result": {"status": "success", "results": [
+            {"count": 2, "rank": 0.08, "text": w["text"], "timestamps": [{"start": w["start"], "end": w["end"]}]} for w in word_list[:20]
+        ]},
+        "chapters": [
+            {"start": s[0]["start"], "end": s[-1]["end"], "summary": text(s[:80]), "gist": text(s[:3]), "headline": text(s[:10])}
+            for s in spans(chapters)
+        ],
+        "sentiment_analysis_results": [
+            {"text": text(s), "start": s[0]["start"], "end": s[-1]["end"], "sentiment": rng.choice(["POSITIVE", "NEGATIVE", "NEUTRAL"]), "speaker": s[0]["speaker"], "confidence": 0.8}
+            for s in spans(sentiments)
+        ],
+        "entities": [
+            {"entity_type": "person_name", "text": s[0]["text"], "start": s[0]["start"], "end": s[0]["end"]}
+            for s in spans(entities)
+        ],
+        "iab_categories_result": {"status": "success", "summary": {"Business>Finance": 0.9}, "results": [
+            {"text": text(s), "timestamp": {"start": s[0]["start"], "end": s[-1]["end"]}, "labels": [{"label": "Business>Finance", "relevance": 0.9}]}
+            for s in spans(chapters)
+        ]},
+        "resource_url": None,
+        "completed": "2022-07-18T00:00:00.000000",
+        "created": "2022-07-17T23:50:00.000000",
+    }
@@ -3,8 +3,10 @@ import os
 from typing import Any, Optional, List
 from venv import create
 
+from assemblyai import export
 from assemblyai.client import Client as AssemblyClient
 from assemblyai.model import Chapter, Transcript, Utterance, UtteredWord
+from assemblyai.timeline import ChapterSlice, TimelineIndex
 
 from notion_client import Client as NotionClient
 
@@ -35,13 +37,12 @@ def main():
 
 def create_podcast_episode(transcript_id: str, episode_name: str, audio: str) -> PodcastEpisode:
     assembly = AssemblyClient(os.environ["ASSEMBLY_KEY"])
-    t = assembly.transcript.get(transcript_id)
-    s = assembly.transcript.sentences(transcript_id)
+    bundle = next(assembly.transcript.fetch_bundle([transcript_id], parts=("transcript", "sentences"))).raise_for_error()
     return PodcastEpisode(
-        t,
+        bundle.transcript,
         audio,
         episode_name,
-        s
+        bundle.sentences
     )
 
 
@@ -89,18 +90,19 @@ def create_notion_page(notion: NotionClient, episode: PodcastEpisode):
             SimpleEmbed(episode.audio_link)
         ] + [
             SimpleHeading("Chapters", 2),
-        ] + [CreateNotionChapter(c, episode.transcript, episode.sentences) for c in episode.transcript.chapters]
+        ] + [CreateNotionChapter(s, episode.transcript) for s in TimelineIndex(episode.transcript, sentences=episode.sentences).align_to_chapters(["utterances", "sentences"])]
     )
 
-def CreateNotionChapter(c: Chapter, transcript: Transcript, sentences: List[UtteredWord]) -> any:
+def CreateNotionChapter(chapter_slice: ChapterSlice, transcript: Transcript) -> any:
+    c = chapter_slice.chapter
     duration_secs = (c.end - c.start)/1000
     duration_mins = duration_secs // 60
     start_time = format_ms_time(c.start)
     chapter_duration = f"{int(duration_mins)} min {int(duration_secs % 60)} secs"
 
     # Filter based on start only, because chapters aren't linked exactly to utterances. 
-    utterances = list(filter(lambda x: x.start >= c.start and x.start <= c.end, transcript.utterances))
-    chapter_sentences = list(filter(lambda x: x.start >= c.start and x.start <= c.end, sentences))
+    utterances = chapter_slice["utterances"]
+    chapter_sentences = chapter_slice["sentences"]
     if len(utterances) == 0:
         utterances = chapter_sentences
 
@@ -122,28 +124,17 @@ def CreateNotionChapter(c: Chapter, transcript: Transcript, sentences: List[Utte
 def create_summary_paragraphs(summary: str) -> List[Any]:
     result = []
 
-    y = 2000
-    chunks =  [summary[y*i:y*(i+1)] for i in range((len(summary)//y)+1)]
-    SimpleParagraph(summary, bold_prefix = "Summary: "),
-    result.append(SimpleParagraph(chunks[0], bold_prefix = "Summary: "))
-
-    if len(chunks) > 1:
-        result.extend([SimpleParagraph(c) for c in chunks[1:]])
+    # Notion only lets paragraphs <=2000
+    for chunk in export.text_chunks([Utterance(0, 0, summary, 1.0, None)], max_chars=2000):
+        result.append(SimpleParagraph(chunk.text, bold_prefix = "Summary: " if chunk.first else None))
     return result
 
 def convert_utterances_to_paragraphs(utterances: List[Utterance]) -> List[Any]:
     result = []
 
-    for u in utterances:
-        # Notion only lets paragraphs <=2000
-        y = 2000
-        chunks =  [u.text[y*i:y*(i+1)] for i in range((len(u.text)//y)+1)]
-        print([len(c) for c in chunks])
-        result.append(SimpleParagraph(chunks[0], bold_prefix = f"Speaker {u.speaker}: "))
-
-        # Add extra chunks without speaker prefix.
-        if len(chunks) > 1:
-            result.extend([SimpleParagraph(c) for c in chunks[1:]])
+    # Notion only lets paragraphs <=2000. Extra chunks are added without speaker prefix.
+    for chunk in export.text_chunks(utterances, max_chars=2000):
+        result.append(SimpleParagraph(chunk.text, bold_prefix = f"Speaker {chunk.speaker}: " if chunk.first else None))
 
     return result
 
@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator, List
+
+import pytest
+
+from assemblyai.client import Client
+from assemblyai.policy import RequestPolicy
+from assemblyai.testing import FakeAssemblyAI
+
+
+@pytest.fixture
+def fake() -> FakeAssemblyAI:
+    return FakeAssemblyAI()
+
+
+@pytest.fixture
+def client(fake: FakeAssemblyAI) -> Iterator[Client]:
+    with Client("key", transport=fake.transport(), policy=RequestPolicy(backoff=0.01)) as client:
+        yield client
+
+
+class LocalAPI:
+    """A keep-alive HTTP server answering every GET with a completed transcript, for tests that need real connections."""
+
+    def __init__(self, delay: float = 0.0, text_size: int = 1) -> None:
+        self.delay = delay
+        self.text = "x" * text_size
+        self.connections: List[object] = []
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                api.connections.append(self.client_address)
+                time.sleep(api.delay)
+                body = json.dumps({"id": self.path.rstrip("/").split("/")[-1], "status": "completed", "text": api.text}).encode()
+                self.send_response(200)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v2/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def local_api() -> Iterator[LocalAPI]:
+    api = LocalAPI()
+    yield api
+    api.close()
@@ -0,0 +1,157 @@
+import os
+import time
+
+import httpx
+import pytest
+
+from assemblyai.cache import DiskCache, MemoryCache, TieredCache, UploadCache
+from assemblyai.client import Client
+from assemblyai.model import Upload
+
+GET = ("GET", "transcript/{id}")
+UPLOAD = ("POST", "upload")
+
+
+def test_disk_caches_sharing_a_directory_see_each_others_entries(tmp_path):
+    first, second = DiskCache(str(tmp_path)), DiskCache(str(tmp_path))
+    first.set("transcript/t1", b"one")
+
+    assert second.get("transcript/t1") == b"one"
+    assert second.stats.entries == 1 and second.stats.bytes == 3
+
+    second.delete("transcript/t1")
+    assert first.get("transcript/t1") is None
+    assert first.stats.entries == 0 and first.stats.misses == 1
+
+
+def test_disk_cache_entry_evicted_while_read(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    cache.set("transcript/t1", b"one")
+
+    def evicted(path, times=None):
+        # Another process removes the entry between the read and the update of its last use.
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("transcript/t1") == b"one"
+    assert cache.stats.entries == 0 and cache.stats.bytes == 0
+
+    def read_only(path, times=None):
+        raise PermissionError(path)
+
+    monkeypatch.setattr(os, "utime", read_only)
+    cache.set("transcript/t2", b"two")
+    assert cache.get("transcript/t2") == b"two"
+
+
+def test_disk_cache_reopens_in_order_of_last_use(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for key in ("a", "b", "c"):
+        cache.set(key, b"x")
+    past = time.time() - 60
+    for i, key in enumerate(("b", "c", "a")):
+        os.utime(os.path.join(str(tmp_path), key + DiskCache.SUFFIX), (past + i, past + i))
+
+    reopened = DiskCache(str(tmp_path), max_entries=2)
+    assert reopened.get("b") is None and reopened.get("c") == b"x" and reopened.get("a") == b"x"
+    assert reopened.stats.evictions == 1
+
+
+def test_upload_cache_entries_expire(tmp_path):
+    uploads = UploadCache(DiskCache(str(tmp_path)), ttl=0.05)
+    digest = uploads.digest_bytes(b"audio")
+    uploads.set(digest, Upload(upload_url="https://cdn.example.org/1"))
+
+    assert UploadCache(DiskCache(str(tmp_path))).get(digest).upload_url == "https://cdn.example.org/1"
+    time.sleep(0.06)
+    assert uploads.get(digest) is None
+
+
+def test_upload_cache_hashes_files_with_and_without_mmap(tmp_path):
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"audio" * 1000)
+    assert UploadCache(mmap_threshold=1).digest_file(str(path)) == UploadCache().digest_file(str(path)) == UploadCache().digest_bytes(b"audio" * 1000)
+
+
+def test_same_audio_is_uploaded_once(fake, tmp_path):
+    client = Client("key", transport=fake.transport(), upload_cache=UploadCache())
+    path = tmp_path / "audio.wav"
+    path.write_bytes(b"audio" * 1000)
+
+    first = client.upload.upload_file(str(path), backoff=0.01)
+    assert client.upload.upload_file(str(path)) == first
+    assert client.upload.upload_bytes(b"audio" * 1000) == first
+    assert fake.requests[UPLOAD] == 1
+
+    assert client.upload.upload_bytes(b"other") != first
+    assert fake.requests[UPLOAD] == 2
+
+
+def test_failed_uploads_are_not_cached(fake):
+    client = Client("key", transport=fake.transport(), upload_cache=UploadCache(MemoryCache()))
+    fake.fail_next(*UPLOAD, status=400)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.upload.upload_bytes(b"audio")
+    client.upload.upload_bytes(b"audio")
+    assert fake.requests[UPLOAD] == 2
+
+
+def test_memory_cache_evicts_least_recently_used_entries():
+    cache = MemoryCache(max_entries=2, max_bytes=10)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+    assert cache.get("b") is None and cache.get("a") == b"1" and cache.get("c") == b"3"
+
+    cache.set("d", b"123456789")
+    assert cache.get("a") is None and cache.get("c") == b"3"
+    # A value larger than the cache is not stored.
+    cache.set("e", b"x" * 11)
+    assert cache.get("e") is None
+
+    stats = cache.stats
+    assert (stats.entries, stats.bytes, stats.evictions, stats.stores) == (2, 10, 2, 5)
+    assert stats.hit_rate == 4 / 7
+
+
+def test_stats_is_a_snapshot():
+    cache = MemoryCache()
+    before = cache.stats
+    cache.set("a", b"1")
+    assert before.stores == 0 and cache.stats.stores == 1
+
+
+def test_tiered_cache_promotes_disk_hits(tmp_path):
+    disk = DiskCache(str(tmp_path))
+    disk.set("a", b"1")
+    cache = TieredCache(MemoryCache(), disk)
+
+    assert cache.get("a") == b"1" and cache.memory.get("a") == b"1"
+    cache.set("b", b"22")
+    assert disk.get("b") == b"22"
+    cache.delete("a")
+    assert cache.get("a") is None
+
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries, stats.bytes) == (1, 1, 1, 2)
+
+
+def test_completed_transcripts_are_served_from_the_cache(fake):
+    client = Client("key", transport=fake.transport(), cache=MemoryCache())
+    transcript_id = fake.add_transcript({"audio_url": "https://example.org/a.mp3"})
+    client.transcript.get(transcript_id)
+    client.transcript.get(transcript_id)
+    # A transcript still processing is fetched again.
+    assert fake.requests[GET] == 2
+
+    fake.complete(transcript_id, text="done", sentences=[{"text": "done", "start": 0, "end": 1, "confidence": 1.0, "speaker": None}])
+    for _ in range(3):
+        assert client.transcript.get(transcript_id).text == "done"
+        client.transcript.sentences(transcript_id)
+    assert fake.requests[GET] == 3
+    assert fake.requests[("GET", "transcript/{id}/sentences")] == 1
+
+    client.transcript.delete(transcript_id)
+    assert client.cache.get(f"transcript/{transcript_id}") is None
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from assemblyai.client import AsyncClient, Client
+from assemblyai.model import Transcript
+from assemblyai.pool import ConnectionPool
+
+
+def test_map_yields_results_in_input_order(client):
+    def slow_double(x):
+        time.sleep(0.001 * (10 - x))
+        return x * 2
+
+    assert list(client.map(slow_double, range(10), workers=4)) == [x * 2 for x in range(10)]
+
+
+def test_map_unordered_yields_every_result(client):
+    assert sorted(client.map(lambda x: x, range(25), workers=3, ordered=False)) == list(range(25))
+
+
+def test_map_keeps_at_most_workers_calls_in_flight(client):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def call(x):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.005)
+        with lock:
+            active[0] -= 1
+        return x
+
+    assert list(client.map(call, range(30), workers=3)) == list(range(30))
+    assert peak[0] <= 3
+
+
+def test_map_raises_the_first_error_in_input_order(client):
+    def call(x):
+        if x in (3, 6):
+            raise KeyError(x)
+        return x
+
+    results = []
+    with pytest.raises(KeyError) as error:
+        for result in client.map(call, range(10), workers=2):
+            results.append(result)
+    assert error.value.args == (3,)
+    assert results == [0, 1, 2]
+
+
+def test_map_fetches_transcripts(fake, client):
+    ids = [fake.add_transcript({"audio_url": f"https://example.org/{i}.mp3"}) for i in range(20)]
+    assert [t.id for t in client.map(client.transcript.get, ids, workers=5)] == ids
+
+
+def test_async_map_yields_results_in_input_order(fake):
+    ids = [fake.add_transcript({"audio_url": f"https://example.org/{i}.mp3"}) for i in range(20)]
+
+    async def main():
+        client = AsyncClient("key", transport=fake.transport())
+        try:
+            return [t.id async for t in client.map(client.transcript.get, ids, workers=4)]
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(main()) == ids
+
+
+def test_one_client_shared_across_threads(fake, client):
+    def create_and_get(i):
+        created = client.transcript.create(Transcript(audio_url=f"https://example.org/{i}.mp3"))
+        return client.transcript.get(created.id)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        transcripts = list(pool.map(create_and_get, range(100)))
+
+    assert len({t.id for t in transcripts}) == 100
+    assert sorted(t.audio_url for t in transcripts) == sorted(f"https://example.org/{i}.mp3" for i in range(100))
+    assert fake.requests[("POST", "transcript")] == 100
+    assert fake.requests[("GET", "transcript/{id}")] == 100
+
+
+def test_one_client_shared_across_threads_over_real_connections(local_api):
+    with ConnectionPool(max_connections=16, trust_env=False) as pool:
+        with Client("key", pool=pool) as client:
+            client.base_url = local_api.base_url
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                ids = list(executor.map(lambda i: client.transcript.get(f"t{i}").id, range(64)))
+        assert ids == [f"t{i}" for i in range(64)]
+        assert pool.stats.requests == 64 and pool.stats.errors == 0
+
+
+def test_transport_and_pool_are_exclusive(fake):
+    with pytest.raises(ValueError):
+        Client("key", transport=fake.transport(), pool=ConnectionPool(trust_env=False))
+
+
+def test_request_errors_surface_as_http_status_errors(client):
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        client.transcript.get("missing")
+    assert error.value.response.status_code == 404
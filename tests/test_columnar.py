@@ -0,0 +1,70 @@
+import pickle
+from array import array
+
+import pytest
+
+from assemblyai import columnar
+from assemblyai.columnar import WordArray
+from assemblyai.decoding import decode
+from assemblyai.model import Transcript, UtteredWord
+
+WORDS = [UtteredWord(start=i * 10, end=i * 10 + 9, text=text, confidence=i / 10, speaker=speaker)
+         for i, (text, speaker) in enumerate([("Hello", "A"), ("wörld", "B"), ("", None), ("again", "A")])]
+
+
+@pytest.fixture
+def words():
+    return WordArray.from_words(WORDS)
+
+
+def test_behaves_like_a_list_of_words(words):
+    assert len(words) == 4 and list(words) == WORDS
+    assert words[1] == WORDS[1] and words[-1] == WORDS[-1]
+    assert words == WORDS and words != WORDS[:3]
+    with pytest.raises(IndexError):
+        words[4]
+    assert repr(words) == "WordArray(4 words)"
+
+
+def test_slices_are_word_arrays(words):
+    assert isinstance(words[1:3], WordArray) and words[1:3] == WORDS[1:3]
+    assert words[::-2] == WORDS[::-2]
+
+
+def test_appending_after_reading(words):
+    words.texts()
+    words.append(40, 49, "more", 0.5, "C")
+    assert words.texts() == ["Hello", "wörld", "", "again", "more"]
+    assert words[4] == UtteredWord(start=40, end=49, text="more", confidence=0.5, speaker="C")
+
+
+def test_columns(words):
+    assert list(words.starts()) == [0, 10, 20, 30] and list(words.ends()) == [9, 19, 29, 39]
+    assert list(words.confidences()) == [0.0, 0.1, 0.2, 0.3]
+    assert words.speakers() == ["A", "B", None, "A"]
+    assert words.speaker_table() == [None, "A", "B"] and list(words.speaker_codes()) == [1, 2, 0, 1]
+    assert words.nbytes > 0
+
+
+def test_columns_are_copies(words, monkeypatch):
+    monkeypatch.setattr(columnar, "numpy", None)
+    starts = words.starts()
+    assert isinstance(starts, array)
+    starts[0] = 99
+    assert words[0].start == 0
+
+
+def test_from_dicts_equals_from_words(words):
+    dicts = [{"start": w.start, "end": w.end, "text": w.text, "confidence": w.confidence, "speaker": w.speaker} for w in WORDS]
+    assert WordArray.from_dicts(dicts) == words
+
+
+def test_survives_pickling(words):
+    assert pickle.loads(pickle.dumps(words)) == words
+
+
+def test_compact_words_decoding():
+    data = {"id": "t", "words": [{"start": 0, "end": 5, "text": "hi", "confidence": 0.5, "speaker": None}]}
+    transcript = decode(Transcript, data, compact_words=True)
+    assert isinstance(transcript.words, WordArray)
+    assert transcript.words == decode(Transcript, data).words
@@ -0,0 +1,93 @@
+import dataclasses
+from typing import Dict, List, Optional
+
+import pytest
+
+from assemblyai.decoding import decode, decoder_for, loads
+from assemblyai.model import (AutoHighlightResults, BoostType, EntityType, IABCategoryResults, Sentiment, SupportedLanguageCode,
+                              Transcript, TranscriptStatus, UtteredWord)
+
+WORD = {"start": 0, "end": 500, "text": "hello", "confidence": 0.9, "speaker": "A"}
+TRANSCRIPT = {
+    "id": "t1",
+    "status": "completed",
+    "text": "hello",
+    "confidence": 1,
+    "audio_duration": 12,
+    "punctuate": True,
+    "boost_param": "high",
+    "language_code": "en_us",
+    "word_boost": ["hello"],
+    "words": [WORD, {**WORD, "speaker": None}],
+    "utterances": [{"start": 0, "end": 500, "text": "hello", "confidence": 0.9, "speaker": "A", "words": [WORD]}],
+    "auto_highlights_result": {"status": "success", "results": [{"count": 1, "rank": 0.5, "text": "hello", "timestamps": [{"start": 0, "end": 500}]}]},
+    "chapters": [{"start": 0, "end": 500, "summary": "s", "gist": "g", "headline": "h"}],
+    "sentiment_analysis_results": [{"text": "hello", "start": 0, "end": 500, "sentiment": "POSITIVE", "speaker": None, "confidence": 0.8}],
+    "entities": [{"entity_type": "location", "text": "hello", "start": 0, "end": 500}],
+    "iab_categories_result": {"status": "success", "summary": {"a>b": 0.5},
+                              "results": [{"text": "hello", "timestamp": {"start": 0, "end": 500}, "labels": [{"label": "a>b", "relevance": 1}]}]},
+    "webhook_status_code": None,
+    "unknown_field": "ignored",
+}
+
+
+def test_decode_matches_from_dict():
+    transcript = decode(Transcript, TRANSCRIPT)
+    assert transcript == Transcript.from_dict(TRANSCRIPT)
+    assert transcript.status is TranscriptStatus.completed and transcript.boost_param is BoostType.high
+    assert transcript.language_code is SupportedLanguageCode.english_american
+    assert transcript.sentiment_analysis_results[0].sentiment is Sentiment.positive
+    assert transcript.entities[0].entity_type is EntityType.location
+    assert isinstance(transcript.auto_highlights_result, AutoHighlightResults)
+    assert isinstance(transcript.iab_categories_result, IABCategoryResults)
+    assert transcript.iab_categories_result.results[0].timestamp.end == 500
+
+
+def test_primitive_values_are_coerced_like_from_dict():
+    transcript = decode(Transcript, TRANSCRIPT)
+    assert type(transcript.confidence) is float and type(transcript.audio_duration) is float
+    assert type(transcript.iab_categories_result.results[0].labels[0].relevance) is float
+    word = decode(UtteredWord, {**WORD, "start": "10", "text": 5})
+    assert word == UtteredWord.from_dict({**WORD, "start": "10", "text": 5}) and word.start == 10 and word.text == "5"
+
+
+def test_missing_fields_take_their_defaults():
+    transcript = decode(Transcript, {"id": "t"})
+    assert transcript == Transcript(id="t")
+    # Defaults made by a factory are not shared between instances.
+    assert transcript.words == [] and transcript.words is not decode(Transcript, {"id": "t"}).words
+    assert decode(Transcript, {"id": "t", "words": None}).words is None
+
+
+def test_missing_required_fields_raise():
+    with pytest.raises(KeyError):
+        decode(UtteredWord, {"start": 0})
+
+
+def test_decoders_are_generated_once_per_class():
+    assert decoder_for(Transcript) is decoder_for(Transcript)
+    assert decoder_for(Transcript, compact_words=True) is not decoder_for(Transcript)
+
+
+def test_instances_of_the_class_are_returned_as_is():
+    word = UtteredWord(**WORD)
+    assert decode(UtteredWord, word) is word
+
+
+def test_any_dataclass():
+    @dataclasses.dataclass
+    class Checked:
+        name: str
+        counts: Dict[str, int]
+        nested: Optional[List[UtteredWord]] = None
+        label: str = dataclasses.field(init=False, default="")
+
+        def __post_init__(self):
+            self.label = self.name.upper()
+
+    checked = decode(Checked, {"name": "n", "counts": {"a": "1"}, "nested": [WORD]})
+    assert checked.label == "N" and checked.counts == {"a": 1} and checked.nested == [UtteredWord(**WORD)]
+
+
+def test_loads():
+    assert loads(b'{"a": [1, 2.5, null]}') == {"a": [1, 2.5, None]}
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+import types
+
+import pytest
+
+from assemblyai.instrumentation import OpenTelemetryHook, RequestEvent
+
+# Run in a fresh interpreter: records every module an import of the client loads, and refuses OpenTelemetry as if it
+# were installed but slow to import.
+CHECK = """
+import sys
+
+class Refuse:
+    def find_spec(self, name, path=None, target=None):
+        if name.split(".")[0] == "opentelemetry":
+            raise AssertionError("imported " + name)
+
+sys.meta_path.insert(0, Refuse())
+from assemblyai.client import Client
+from assemblyai.instrumentation import Instrumentation, Metrics
+
+Client("key", instrumentation=Instrumentation(Metrics())).close()
+print(" ".join(sorted(sys.modules)))
+"""
+
+
+def test_importing_the_client_does_not_import_heavy_modules():
+    result = subprocess.run([sys.executable, "-c", CHECK], capture_output=True, text=True, check=True)
+    modules = set(result.stdout.split())
+    assert "assemblyai.client" in modules
+    for name in ("opentelemetry", "dataclasses_json", "marshmallow", "assemblyai.api_endpoints", "assemblyai.model", "http.server"):
+        assert name not in modules
+
+
+def test_opentelemetry_is_imported_by_the_first_hook(monkeypatch):
+    spans = []
+
+    class FakeSpan:
+        def __init__(self, name, **kwargs):
+            self.name, self.kwargs, self.status = name, kwargs, None
+            spans.append(self)
+
+        def set_status(self, status):
+            self.status = status
+
+        def end(self, end_time):
+            self.end_time = end_time
+
+    trace = types.SimpleNamespace(
+        SpanKind=types.SimpleNamespace(CLIENT="client"), Status=lambda code: code, StatusCode=types.SimpleNamespace(ERROR="error"),
+        get_tracer=lambda name: types.SimpleNamespace(start_span=FakeSpan))
+    package = types.ModuleType("opentelemetry")
+    package.trace = trace
+    monkeypatch.setitem(sys.modules, "opentelemetry", package)
+    monkeypatch.setitem(sys.modules, "opentelemetry.trace", trace)
+
+    hook = OpenTelemetryHook()
+    hook.after_request(RequestEvent("GET", "transcript/{id}", "https://api.example.org/v2/transcript/t", 0, 1.0, 0.5, status_code=500))
+    assert spans[0].name == "GET transcript/{id}" and spans[0].kwargs["kind"] == "client" and spans[0].status == "error"
+    assert spans[0].end_time == 1_500_000_000
+
+
+def test_missing_opentelemetry_is_reported_when_a_hook_is_created(monkeypatch):
+    monkeypatch.setitem(sys.modules, "opentelemetry", None)
+    with pytest.raises(ImportError):
+        OpenTelemetryHook()
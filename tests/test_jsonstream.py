@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from assemblyai.cache import MemoryCache
+from assemblyai.client import AsyncClient, Client
+from assemblyai.columnar import WordArray
+from assemblyai.instrumentation import Instrumentation, Metrics
+from assemblyai.jsonstream import ObjectStream
+
+BODY = {
+    "id": "t1",
+    "text": "héllo wörld",
+    "confidence": 0.125,
+    "words": [{"text": "héllo", "start": 10, "end": 1250, "confidence": 0.5, "speaker": None},
+              {"text": "wörld", "start": 1250, "end": 123456, "confidence": 1e-3, "speaker": "A"}],
+    "chapters": [],
+    "entities": [{"text": "x", "start": 1, "end": 2}, [1, 2.5, -3e10]],
+    "nested": {"a": [1, {"b": None}], "c": "]},"},
+}
+WORDS = [{"text": f"w{i}", "start": i * 100, "end": i * 100 + 90, "confidence": 0.9, "speaker": None} for i in range(500)]
+
+
+def parse(data, chunk_size, stream_keys=("words",), **kwargs):
+    stream = ObjectStream(stream_keys=stream_keys, **kwargs)
+    events = []
+    for i in range(0, len(data), chunk_size):
+        events.extend(stream.feed(data[i:i + chunk_size]))
+    events.extend(stream.close())
+    return events, stream.fields
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("separators", [(",", ":"), (", ", ": ")])
+def test_any_chunking_decodes_like_json_loads(chunk_size, separators):
+    data = json.dumps(BODY, ensure_ascii=False, separators=separators, indent=None).encode()
+    events, fields = parse(data, chunk_size)
+    assert events == [("words", w) for w in BODY["words"]]
+    assert fields == {k: v for k, v in BODY.items() if k != "words"}
+
+
+def test_pretty_printed_bodies():
+    data = json.dumps(BODY, indent=2).encode()
+    events, fields = parse(data, 5, stream_keys=("words", "entities"))
+    assert [value for _, value in events] == BODY["words"] + BODY["entities"]
+    assert "entities" not in fields and fields["nested"] == BODY["nested"]
+
+
+def test_buffer_is_trimmed_while_streaming():
+    data = json.dumps({"id": "t", "words": WORDS}).encode()
+    stream = ObjectStream(stream_keys=("words",), compact_after=256)
+    events = []
+    for i in range(0, len(data), 100):
+        events.extend(stream.feed(data[i:i + 100]))
+        assert len(stream._buffer) < 512
+    events.extend(stream.close())
+    assert [w for _, w in events] == WORDS and stream.fields == {"id": "t"}
+
+
+def test_empty_object():
+    assert parse(b" { } ", 1) == ([], {})
+
+
+@pytest.mark.parametrize("data", [b'{"id": "t", "words": [1, 2', b'{"id": ', b'[1, 2]', b'{"id" "t"}', b'{"a": 1 "b": 2}', b'{"a": [1 2]}'])
+def test_invalid_or_incomplete_bodies_raise(data):
+    with pytest.raises(ValueError):
+        parse(data, 3)
+
+
+def completed(fake, words=WORDS):
+    transcript_id = fake.add_transcript({"audio_url": "https://example.org/a.mp3"})
+    utterances = [{"start": 0, "end": 1000, "text": "w0", "confidence": 0.9, "speaker": "A", "words": words[:1]}]
+    fake.complete(transcript_id, text="text", words=words, utterances=utterances)
+    return transcript_id
+
+
+def test_iter_get_yields_words_then_the_transcript(fake, client):
+    transcript_id = completed(fake)
+    events = list(client.transcript.iter_get(transcript_id))
+    assert [key for key, _ in events] == ["words"] * 500 + ["utterances", "transcript"]
+    assert events[3][1].text == "w3"
+    transcript = events[-1][1]
+    assert transcript.id == transcript_id and transcript.text == "text" and not transcript.words
+
+
+def test_get_streaming_matches_get(fake, client):
+    transcript_id = completed(fake)
+    expected = client.transcript.get(transcript_id)
+    assert client.transcript.get_streaming(transcript_id) == expected
+
+    words, utterances = [], []
+    transcript = client.transcript.get_streaming(transcript_id, on_word=words.append, on_utterance=utterances.append)
+    assert words == expected.words and utterances == expected.utterances and not transcript.words
+
+    compact = client.transcript.get_streaming(transcript_id, compact_words=True)
+    assert isinstance(compact.words, WordArray) and list(compact.words) == expected.words
+
+
+def test_streamed_transcripts_are_cached(fake):
+    client = Client("key", transport=fake.transport(), cache=MemoryCache())
+    transcript_id = completed(fake)
+    streamed = client.transcript.get_streaming(transcript_id)
+    assert client.transcript.get(transcript_id) == streamed
+    assert client.transcript.get_streaming(transcript_id) == streamed
+    assert fake.requests[("GET", "transcript/{id}")] == 1
+
+
+def test_decoding_is_timed_once_per_body(fake):
+    metrics = Metrics()
+    client = Client("key", transport=fake.transport(), instrumentation=Instrumentation(metrics))
+    transcript_id = completed(fake)
+    client.transcript.get_streaming(transcript_id)
+    assert metrics.decode["Transcript"].count == 1
+    assert metrics.decode_bytes["Transcript"] == len(client.request(f"transcript/{transcript_id}", "GET").content)
+
+
+def test_async_iter_get(fake):
+    transcript_id = completed(fake)
+
+    async def main():
+        client = AsyncClient("key", transport=fake.transport())
+        try:
+            return [pair async for pair in client.transcript.iter_get(transcript_id, fields=("words",))], await client.transcript.get(transcript_id)
+        finally:
+            await client.aclose()
+
+    events, expected = asyncio.run(main())
+    assert [value for key, value in events if key == "words"] == expected.words
+    assert events[-1][0] == "transcript" and events[-1][1].utterances == expected.utterances
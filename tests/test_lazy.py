@@ -0,0 +1,92 @@
+import copy
+import pickle
+import threading
+
+import pytest
+
+from assemblyai.decoding import decode
+from assemblyai.lazy import LAZY_FIELDS, LazyTranscript, decode_lazy
+from assemblyai.model import Transcript, UtteredWord
+
+DATA = {
+    "id": "t1",
+    "status": "completed",
+    "text": "hello world",
+    "words": [{"text": "hello", "start": 0, "end": 500, "confidence": 0.9, "speaker": None},
+              {"text": "world", "start": 500, "end": 900, "confidence": 0.8, "speaker": None}],
+    "utterances": None,
+    "entities": [{"entity_type": "location", "text": "world", "start": 500, "end": 900}],
+}
+
+
+@pytest.fixture
+def transcript():
+    return decode_lazy(DATA)
+
+
+def test_heavy_fields_are_decoded_on_first_access(transcript):
+    assert isinstance(transcript, LazyTranscript) and transcript.text == "hello world"
+    assert sorted(transcript.pending_fields) == ["entities", "utterances", "words"]
+
+    assert transcript.words[0] == UtteredWord(text="hello", start=0, end=500, confidence=0.9, speaker=None)
+    assert transcript.utterances is None
+    assert sorted(transcript.pending_fields) == ["entities"]
+
+
+def test_fields_missing_from_the_response_default_to_none(transcript):
+    assert transcript.auto_highlights_result is None
+    assert "auto_highlights_result" not in transcript.pending_fields
+
+
+def test_equals_the_eagerly_decoded_transcript():
+    data = {**DATA, **{name: None for name in LAZY_FIELDS if name not in DATA}}
+    assert decode_lazy(data) == decode(Transcript, data)
+    assert decode_lazy(data) != decode(Transcript, {**data, "text": "other"})
+
+
+def test_assigned_fields_replace_the_raw_value(transcript):
+    transcript.words = []
+    assert transcript.words == [] and "words" not in transcript.pending_fields
+
+
+def test_pickle_keeps_undecoded_fields(transcript):
+    transcript.entities
+    restored = pickle.loads(pickle.dumps(transcript))
+    assert sorted(restored.pending_fields) == ["utterances", "words"]
+    assert restored == transcript
+    assert restored.words[1].text == "world"
+
+
+def test_copies_do_not_share_raw_values(transcript):
+    copied = copy.copy(transcript)
+    assert copied.words[0].text == "hello"
+    # Decoding a field of the copy leaves it undecoded, and readable, in the original.
+    assert "words" in transcript.pending_fields
+    assert transcript.words == copied.words
+    assert copy.deepcopy(transcript) == transcript
+
+
+def test_threads_decode_each_field_once(transcript):
+    barrier = threading.Barrier(8)
+    results = []
+
+    def read():
+        barrier.wait()
+        results.append(transcript.words)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8 and all(words is results[0] for words in results)
+
+
+def test_get_returns_lazy_transcripts(fake, client):
+    transcript_id = fake.add_transcript({"audio_url": "https://example.org/a.mp3"})
+    fake.complete(transcript_id, words=DATA["words"])
+
+    transcript = client.transcript.get(transcript_id, lazy=True)
+    assert isinstance(transcript, LazyTranscript) and "words" in transcript.pending_fields
+    assert [w.text for w in transcript.words] == ["hello", "world"]
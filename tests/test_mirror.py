@@ -0,0 +1,87 @@
+import httpx
+import pytest
+
+from assemblyai.mirror import TranscriptMirror
+from assemblyai.model import TranscriptStatus
+
+GET = ("GET", "transcript/{id}")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "transcripts.db")
+
+
+def add(fake, count):
+    return [fake.add_transcript({"audio_url": f"https://example.org/{i}.mp3", "created": f"2024-01-01T00:{i // 60:02d}:{i % 60:02d}"})
+            for i in range(count)]
+
+
+def test_interrupted_sync_resumes_from_its_checkpoint(fake, client, path):
+    ids = add(fake, 25)
+    for transcript_id in ids[:20]:
+        fake.complete(transcript_id, text=f"text of {transcript_id}")
+
+    with TranscriptMirror(client.transcript, path, page_size=5) as mirror:
+        stats = mirror.sync(max_pages=2)
+        assert not stats.complete and stats.listed == 10
+    with TranscriptMirror(client.transcript, path, page_size=5) as mirror:
+        stats = mirror.sync()
+        # The 15 transcripts listed now, and the 5 unfinished ones of the first sync.
+        assert stats.resumed and stats.complete and stats.listed == 15 and stats.fetched == 20
+        assert len(mirror) == 25 and len(mirror.ids(TranscriptStatus.completed)) == 20
+        assert mirror.get(ids[0]).text == f"text of {ids[0]}"
+        assert mirror.get("unknown") is None
+
+
+def test_later_syncs_list_new_transcripts_and_refetch_unfinished_ones(fake, client, path):
+    ids = add(fake, 6)
+    for transcript_id in ids[:4]:
+        fake.complete(transcript_id)
+
+    with TranscriptMirror(client.transcript, path) as mirror:
+        mirror.sync()
+        fake.requests.clear()
+        stats = mirror.sync()
+        assert stats.listed == 0 and stats.fetched == 2
+        assert fake.requests[GET] == 2
+
+        new = add(fake, 1)
+        for transcript_id in ids[4:] + new:
+            fake.complete(transcript_id, text="late")
+        stats = mirror.sync()
+        assert stats.listed == 1 and stats.fetched == 3
+        assert mirror.pending_ids() == [] and mirror.get(ids[5]).text == "late"
+
+
+def test_listing_only(fake, client, path):
+    transcript_id, = add(fake, 1)
+    with TranscriptMirror(client.transcript, path) as mirror:
+        assert mirror.sync(fetch=False).fetched == 0
+        assert mirror.get(transcript_id).status == TranscriptStatus.queued
+        assert mirror.pending_ids() == [transcript_id]
+
+
+def test_transient_failures_are_left_for_the_next_sync(fake, client, path):
+    ids = add(fake, 3)
+    with TranscriptMirror(client.transcript, path, max_concurrency=1) as mirror:
+        mirror.sync(fetch=False)
+        fake.fail_next(*GET, count=client.policy.retries + 1, status=503)
+        stats = mirror.fetch_pending()
+        assert stats.failed == 1 and stats.fetched == 2 and "503" in stats.last_error
+
+        fake.fail_next(*GET, count=client.policy.retries + 1, exception=httpx.ConnectError("refused"))
+        stats = mirror.fetch_pending()
+        assert stats.failed == 1 and "ConnectError" in stats.last_error
+        assert mirror.fetch_pending().fetched == 3
+
+
+def test_other_errors_are_raised(fake, client, path):
+    add(fake, 3)
+    with TranscriptMirror(client.transcript, path, max_concurrency=1) as mirror:
+        mirror.sync(fetch=False)
+        fake.fail_next(*GET, status=401)
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            mirror.fetch_pending()
+        assert error.value.response.status_code == 401
+        assert mirror.fetch_pending().fetched == 3
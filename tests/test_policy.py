@@ -0,0 +1,163 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from assemblyai.client import AsyncClient, Client
+from assemblyai.model import Transcript
+from assemblyai.policy import RequestPolicy
+from assemblyai.pool import ConnectionPool
+
+GET = ("GET", "transcript/{id}")
+
+
+@pytest.fixture
+def transcript_id(fake):
+    return fake.add_transcript({"audio_url": "https://example.org/a.mp3"})
+
+
+def test_get_is_retried_after_5xx(fake, client, transcript_id):
+    fake.fail_next(*GET, count=2, status=503)
+    assert client.transcript.get(transcript_id).id == transcript_id
+    assert fake.requests[GET] == 3
+    assert client.policy.stats.retried == 2
+
+
+def test_get_is_retried_after_a_dropped_connection(fake, client, transcript_id):
+    fake.fail_next(*GET, exception=httpx.ReadError("connection reset"))
+    assert client.transcript.get(transcript_id).id == transcript_id
+    assert fake.requests[GET] == 2
+
+
+def test_retries_are_bounded(fake, client, transcript_id):
+    fake.fail_next(*GET, count=10, status=500)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.transcript.get(transcript_id)
+    assert fake.requests[GET] == client.policy.retries + 1
+
+
+def test_create_is_not_retried_after_5xx(fake, client):
+    fake.fail_next("POST", "transcript", status=503)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.transcript.create(Transcript(audio_url="https://example.org/a.mp3"))
+    assert fake.requests[("POST", "transcript")] == 1
+
+
+def test_create_is_retried_after_429(fake, client):
+    fake.fail_next("POST", "transcript", status=429)
+    client.transcript.create(Transcript(audio_url="https://example.org/a.mp3"))
+    assert fake.requests[("POST", "transcript")] == 2
+    assert client.policy.stats.throttled == 1
+
+
+def test_429_waits_for_retry_after(fake, client, transcript_id):
+    fake.fail_next(*GET, status=429, headers={"Retry-After": "0.3"})
+    started = time.monotonic()
+    client.transcript.get(transcript_id)
+    assert time.monotonic() - started >= 0.3
+
+
+def test_429_holds_back_every_client_of_the_policy(fake, transcript_id):
+    policy = RequestPolicy()
+    throttled = Client("key", transport=fake.transport(), policy=policy)
+    other = Client("key", transport=fake.transport(), policy=policy)
+    fake.fail_next(*GET, status=429, headers={"Retry-After": "0.4"})
+
+    thread = threading.Thread(target=throttled.transcript.get, args=(transcript_id,))
+    thread.start()
+    while fake.requests[GET] == 0:
+        time.sleep(0.01)
+    started = time.monotonic()
+    other.transcript.get(transcript_id)
+    thread.join()
+    assert time.monotonic() - started >= 0.3
+
+
+def test_upload_retries_honor_retry_after(fake, client):
+    fake.fail_next("POST", "upload", status=429, headers={"Retry-After": "0.3"})
+    started = time.monotonic()
+    upload = client.upload.upload_bytes(b"audio" * 100)
+    assert time.monotonic() - started >= 0.3
+    assert upload.upload_url
+    assert client.policy.stats.throttled == 1
+
+
+def test_upload_is_retried_after_5xx_up_to_its_retries(fake, client):
+    fake.fail_next("POST", "upload", count=2, status=503)
+    with pytest.raises(httpx.HTTPStatusError):
+        client.upload.upload_bytes(b"audio", retries=1, backoff=0.01)
+    assert fake.requests[("POST", "upload")] == 2
+
+
+def test_concurrency_limit(fake, transcript_id):
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def handle(request):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.005)
+        try:
+            return fake.handle(request)
+        finally:
+            with lock:
+                active[0] -= 1
+
+    client = Client("key", transport=httpx.MockTransport(handle), policy=RequestPolicy(max_concurrency=3))
+    assert len(list(client.map(client.transcript.get, [transcript_id] * 40, workers=10))) == 40
+    assert peak[0] <= 3
+
+
+def test_streamed_response_holds_its_slot_until_closed(local_api):
+    local_api.text = "x" * 1_000_000
+    with ConnectionPool(trust_env=False) as pool, Client("key", policy=RequestPolicy(max_concurrency=1), pool=pool) as client:
+        client.base_url = local_api.base_url
+        response = client.request("transcript/t1", "GET", stream=True)
+        second = threading.Thread(target=client.transcript.get, args=("t2",))
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+
+        response.read()
+        response.close()
+        second.join(2)
+        assert not second.is_alive()
+
+
+def test_cancelled_rate_limit_wait_releases_its_slot():
+    policy = RequestPolicy(requests_per_second=5, max_concurrency=1)
+
+    async def main():
+        await policy.aacquire()
+        policy.release()
+        # The bucket is empty now, so the next acquire holds the slot while it waits for a token.
+        waiting = asyncio.ensure_future(policy.aacquire())
+        await asyncio.sleep(0.05)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        await asyncio.wait_for(policy.aacquire(), 1)
+        policy.release()
+
+    asyncio.run(main())
+    assert policy.concurrency._in_use == 0
+
+
+def test_cancelled_requests_keep_the_policy_usable(fake, transcript_id):
+    policy = RequestPolicy(requests_per_second=20, max_concurrency=2)
+
+    async def main():
+        client = AsyncClient("key", transport=fake.transport(), policy=policy)
+        tasks = [asyncio.ensure_future(client.transcript.get(transcript_id)) for _ in range(10)]
+        await asyncio.sleep(0.1)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        transcript = await asyncio.wait_for(client.transcript.get(transcript_id), 2)
+        await client.aclose()
+        return transcript
+
+    assert asyncio.run(main()).id == transcript_id
+    assert policy.concurrency._in_use == 0
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+from concurrent.futures import CancelledError
+
+import pytest
+
+from assemblyai.client import AsyncClient
+from assemblyai.model import TranscriptStatus
+from assemblyai.poller import AdaptiveBackoff, AsyncTranscriptPoller, TranscriptPoller
+
+FAST = AdaptiveBackoff(min_interval=0.01, max_interval=0.05)
+
+
+def add(fake, count):
+    return [fake.add_transcript({"audio_url": f"https://example.org/{i}.mp3"}) for i in range(count)]
+
+
+def test_wait_resolves_completed_and_errored_transcripts(fake, client):
+    done, failed = add(fake, 2)
+    fake.complete(done, text="hello")
+    fake.fail(failed)
+
+    with TranscriptPoller(client.transcript, backoff=FAST) as poller:
+        results = poller.wait([done, failed], timeout=5)
+
+    assert results[done].status == TranscriptStatus.completed and results[done].text == "hello"
+    assert results[failed].status == TranscriptStatus.error
+
+
+def test_transcripts_completing_while_polled(fake, client):
+    ids = add(fake, 3)
+    timers = [threading.Timer(0.05 * (i + 1), fake.complete, args=(transcript_id,)) for i, transcript_id in enumerate(ids)]
+    for timer in timers:
+        timer.start()
+
+    with TranscriptPoller(client.transcript, backoff=FAST) as poller:
+        results = poller.wait(ids, timeout=5)
+
+    assert all(results[i].status == TranscriptStatus.completed for i in ids)
+    assert poller.pending == []
+
+
+def test_many_due_transcripts_are_checked_with_one_listing(fake, client):
+    ids = add(fake, 20)
+    for transcript_id in ids[:10]:
+        fake.complete(transcript_id)
+
+    with TranscriptPoller(client.transcript, backoff=FAST, list_threshold=5) as poller:
+        futures = [poller.track(i) for i in ids]
+        poller.poll_once()
+
+    assert all(f.done() for f in futures[:10]) and not any(f.done() for f in futures[10:])
+    # Only the transcripts the listing found finished are downloaded.
+    assert fake.requests[("GET", "transcript/{id}")] == 10
+    assert fake.requests[("GET", "transcript")] >= 1
+
+
+def test_wait_times_out(fake, client):
+    ids = add(fake, 1)
+    with TranscriptPoller(client.transcript, backoff=FAST) as poller, pytest.raises(TimeoutError):
+        poller.wait(ids, timeout=0.1)
+
+
+def test_untrack_cancels_the_future(fake, client):
+    transcript_id, = add(fake, 1)
+    poller = TranscriptPoller(client.transcript, backoff=FAST)
+    errors = []
+
+    def wait():
+        try:
+            poller.wait([transcript_id])
+        except CancelledError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while fake.requests[("GET", "transcript/{id}")] == 0:
+        waiter.join(0.01)
+    poller.untrack(transcript_id)
+    waiter.join(2)
+
+    assert not waiter.is_alive() and len(errors) == 1
+    assert poller.pending == []
+    poller.close()
+
+
+def test_poller_keeps_one_executor_until_closed(fake, client):
+    ids = add(fake, 2)
+    poller = TranscriptPoller(client.transcript, backoff=FAST)
+    poller.track(ids[0])
+    poller.poll_once()
+    executor = poller._pool
+    poller.track(ids[1])
+    poller.poll_once()
+    assert executor is not None and poller._pool is executor
+
+    poller.close()
+    assert poller._pool is None
+    fake.complete(ids[1])
+    # A closed poller starts a new executor when used again.
+    assert poller.wait([ids[1]], timeout=5)[ids[1]].status == TranscriptStatus.completed
+    poller.close()
+
+
+def test_wait_for_completion(fake, client):
+    transcript_id, = add(fake, 1)
+    threading.Timer(0.05, fake.complete, args=(transcript_id,), kwargs={"text": "done"}).start()
+    # The default backoff checks at most once per second.
+    assert client.transcript.wait_for_completion(transcript_id, timeout=5).text == "done"
+
+
+def test_async_poller(fake):
+    ids = add(fake, 3)
+    fake.complete(ids[0])
+    fake.fail(ids[1])
+
+    async def main():
+        client = AsyncClient("key", transport=fake.transport())
+        poller = AsyncTranscriptPoller(client.transcript, backoff=FAST)
+        asyncio.get_running_loop().call_later(0.05, fake.complete, ids[2])
+        results = await poller.wait(ids, timeout=5)
+
+        untracked = poller.track("other")
+        poller.untrack("other")
+        await client.aclose()
+        return results, untracked
+
+    results, untracked = asyncio.run(main())
+    assert [results[i].status for i in ids] == [TranscriptStatus.completed, TranscriptStatus.error, TranscriptStatus.completed]
+    assert untracked.cancelled()
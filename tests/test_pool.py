@@ -0,0 +1,67 @@
+import asyncio
+
+from assemblyai.client import AsyncClient, Client
+from assemblyai.pool import AsyncConnectionPool, ConnectionPool
+
+
+def test_sequential_requests_reuse_one_connection(local_api):
+    with ConnectionPool(trust_env=False) as pool:
+        with Client("key", pool=pool) as client:
+            client.base_url = local_api.base_url
+            for i in range(10):
+                client.transcript.get(f"t{i}")
+
+        stats = pool.stats
+        assert (stats.requests, stats.connections_opened, stats.connections_reused, stats.untraced, stats.errors) == (10, 1, 9, 0, 0)
+        assert stats.reuse_ratio == 0.9
+        assert len(set(local_api.connections)) == 1
+
+
+def test_clients_of_several_keys_share_the_pool_connections(local_api):
+    with ConnectionPool(trust_env=False) as pool:
+        clients = [Client(key, pool=pool) for key in ("key-a", "key-b", "key-c")]
+        for client in clients:
+            client.base_url = local_api.base_url
+            client.transcript.get("t")
+        for client in clients:
+            client.close()
+
+        # Closing the clients leaves the shared pool open.
+        with Client("key-d", pool=pool) as client:
+            client.base_url = local_api.base_url
+            client.transcript.get("t")
+
+        assert pool.stats.connections_opened == 1
+        assert pool.stats.connections_reused == 3
+
+
+def test_stats_is_a_snapshot(local_api):
+    with ConnectionPool(trust_env=False) as pool:
+        with Client("key", pool=pool) as client:
+            client.base_url = local_api.base_url
+            before = pool.stats
+            client.transcript.get("t")
+        assert before.requests == 0 and pool.stats.requests == 1
+
+
+def test_mock_transport_requests_are_untraced(fake, client):
+    transcript_id = fake.add_transcript({"audio_url": "https://example.org/a.mp3"})
+    client.transcript.get(transcript_id)
+
+    stats = client.pool.stats
+    assert (stats.requests, stats.untraced, stats.connections_opened, stats.connections_reused) == (1, 1, 0, 0)
+    assert stats.reuse_ratio == 0.0
+
+
+def test_async_pool_reuses_connections(local_api):
+    async def main():
+        async with AsyncConnectionPool(trust_env=False) as pool:
+            client = AsyncClient("key", pool=pool)
+            client.base_url = local_api.base_url
+            for i in range(5):
+                await client.transcript.get(f"t{i}")
+            await client.aclose()
+            return pool.stats
+
+    stats = asyncio.run(main())
+    assert (stats.requests, stats.connections_opened, stats.connections_reused) == (5, 1, 4)
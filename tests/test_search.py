@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from assemblyai.model import Transcript, TranscriptStatus, UtteredWord
+from assemblyai.search import SearchHit, SearchIndex, tokenize
+
+
+def transcript(transcript_id, text, speakers="A"):
+    words = [UtteredWord(start=i * 1000, end=i * 1000 + 900, text=word, confidence=0.9, speaker=speakers[i % len(speakers)])
+             for i, word in enumerate(text.split())]
+    return Transcript(id=transcript_id, status=TranscriptStatus.completed, words=words)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SearchIndex(str(tmp_path / "index"))
+    yield index
+    index.close()
+
+
+def test_tokenize():
+    assert tokenize("Don't stop, it's-fine_ok 42!") == ["don't", "stop", "it's", "fine", "ok", "42"]
+
+
+def test_terms_and_phrases(index):
+    index.add(transcript("t1", "The abundance mindset is an abundance of mind", speakers="AB"))
+    index.add(transcript("t2", "A scarcity mindset"))
+    assert index.search("abundance") == []
+    index.commit()
+
+    assert [(h.transcript_id, h.start, h.position) for h in index.search("Abundance")] == [("t1", 1000, 1), ("t1", 5000, 5)]
+    assert index.phrase("abundance mindset") == [SearchHit("t1", 1000, 2900, 1, "B")]
+    assert index.search('"scarcity mindset"') == [SearchHit("t2", 1000, 2900, 1, "A")]
+    # Every part of a query must occur in the transcript of a hit.
+    assert [h.transcript_id for h in index.search("mindset scarcity")] == ["t2"]
+    assert index.search("mindset missing") == []
+    assert index.search('""') == []
+
+
+def test_filters_and_limit(index):
+    index.add_all([transcript("t1", "one two one two", speakers="AB"), transcript("t2", "two one")])
+    index.commit()
+    assert [h.position for h in index.search("one", speaker="A", transcript_ids=["t1"])] == [0, 2]
+    assert [h.transcript_id for h in index.search("two", speaker="B")] == ["t1", "t1"]
+    assert index.search("one", speaker="C") == []
+    assert len(index.search("one", limit=2)) == 2
+
+
+def test_only_completed_transcripts_with_words_are_added(index):
+    assert not index.add(Transcript(id="t1", status=TranscriptStatus.processing))
+    assert not index.add(Transcript(id="t2", status=TranscriptStatus.completed, words=[]))
+    assert index.commit() is None and len(index) == 0
+
+
+def test_adding_again_replaces_a_transcript(index):
+    index.add(transcript("t1", "old words"))
+    index.commit()
+    index.add(transcript("t1", "new words"))
+    index.add(transcript("t1", "newer words"))
+    index.commit()
+    assert index.search("old") == [] and index.search("new") == []
+    assert [h.transcript_id for h in index.search("words")] == ["t1"]
+
+
+def test_index_reopens_from_disk(tmp_path):
+    directory = str(tmp_path / "index")
+    with SearchIndex(directory) as index:
+        index.add(transcript("t1", "hello world"))
+    with SearchIndex(directory) as index:
+        assert "t1" in index and len(index) == 1
+        assert index.phrase("hello world") == [SearchHit("t1", 0, 1900, 0, "A")]
+
+
+def test_compact_merges_segments(tmp_path):
+    directory = str(tmp_path / "index")
+    with SearchIndex(directory, segment_words=2) as index:
+        for i in range(5):
+            index.add(transcript(f"t{i}", f"shared word{i}", speakers="AB"[i % 2]))
+        index.add(transcript("t0", "replaced"))
+        index.commit()
+        before = [(h.transcript_id, h.speaker) for h in index.search("shared")]
+        assert len(os.listdir(directory)) > 2
+
+        index.compact()
+        assert [(h.transcript_id, h.speaker) for h in index.search("shared")] == sorted(before)
+        assert index.search("word0") == [] and [h.transcript_id for h in index.search("replaced")] == ["t0"]
+        assert len([name for name in os.listdir(directory) if name.endswith(".idx")]) == 1
+
+
+def test_missing_segments_are_skipped(tmp_path):
+    directory = str(tmp_path / "index")
+    with SearchIndex(directory) as index:
+        index.add(transcript("t1", "first"))
+        first = index.commit()
+        index.add(transcript("t2", "second"))
+    os.remove(os.path.join(directory, first))
+
+    with SearchIndex(directory) as index:
+        assert "t1" not in index and len(index) == 1
+        assert index.search("first") == [] and [h.transcript_id for h in index.search("second")] == ["t2"]
+
+
+def test_fetch_and_add(fake, client, index):
+    ids = [fake.add_transcript({"audio_url": f"https://example.org/{i}.mp3"}) for i in range(3)]
+    for transcript_id in ids:
+        fake.complete(transcript_id, words=[{"start": 0, "end": 500, "text": transcript_id, "confidence": 0.9, "speaker": None}])
+    assert index.fetch_and_add(client.transcript, ids) == 3
+    index.commit()
+    assert index.fetch_and_add(client.transcript, ids) == 0
+    assert [h.transcript_id for h in index.search(ids[1])] == [ids[1]]
@@ -0,0 +1,144 @@
+import array
+import asyncio
+import io
+import json
+import wave
+
+import httpx
+import pytest
+
+from assemblyai.client import AsyncClient, Client
+from assemblyai.model import Transcript, TranscriptStatus
+from assemblyai.splitting import AudioSource, Segment, merge, plan_segments, wav_header
+from assemblyai.streaming import AudioFormat
+
+RATE = 8000
+SECONDS = 20
+# One word per half second, spoken over the whole half second: word v spans v * 500 to v * 500 + 499 ms.
+EXPECTED = [f"w{v}" for v in range(1, SECONDS * 2 - 1)]
+
+
+@pytest.fixture
+def samples():
+    return array.array("h", (f * 1000 // RATE // 500 for f in range(RATE * SECONDS)))
+
+
+@pytest.fixture
+def wav_path(tmp_path, samples):
+    path = str(tmp_path / "a.wav")
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(samples.tobytes())
+    return path
+
+
+def transcribe(audio, features=True):
+    """Fake transcription of a segment: a word per run of equal samples, skipping words cut by the segment edges."""
+    with wave.open(io.BytesIO(audio)) as w:
+        samples = array.array("h", w.readframes(w.getnframes()))
+    first, last = {}, {}
+    for i, value in enumerate(samples):
+        first.setdefault(value, i)
+        last[value] = i
+    words = [{"start": first[v] * 1000 // RATE, "end": last[v] * 1000 // RATE, "text": f"w{v}", "confidence": 0.9, "speaker": "A"}
+             for v in sorted(first) if first[v] > 0 and last[v] < len(samples) - 1]
+    fields = {"words": words, "text": " ".join(w["text"] for w in words), "audio_duration": len(samples) / RATE}
+    if features:
+        fields["utterances"] = [{"start": words[i]["start"], "end": words[min(i + 4, len(words) - 1)]["end"], "text": "", "confidence": 0.9,
+                                 "speaker": "A", "words": words[i:i + 5]} for i in range(0, len(words), 5)]
+        fields["entities"] = [{"entity_type": "location", "text": w["text"], "start": w["start"], "end": w["end"]} for w in words[::3]]
+        fields["chapters"] = [{"start": words[0]["start"], "end": words[-1]["end"], "summary": "s", "gist": "g", "headline": "h"}]
+    else:
+        fields.update(utterances=None, entities=None, chapters=None, sentiment_analysis_results=None)
+    return fields
+
+
+def transcribing(fake, features=True):
+    """A transport on the fake API that completes each transcript as soon as it is created."""
+    def handle(request):
+        response = fake.handle(request)
+        if request.method == "POST" and request.url.path.endswith("/transcript"):
+            body = json.loads(response.content)
+            upload_id = body["audio_url"].rsplit("/", 1)[1]
+            fake.complete(body["id"], **transcribe(fake.uploads[upload_id], features))
+        return response
+
+    return httpx.MockTransport(handle)
+
+
+def check_words(transcript):
+    assert [w.text for w in transcript.words] == EXPECTED
+    assert all(w.start == int(w.text[1:]) * 500 for w in transcript.words)
+    assert transcript.text.split() == EXPECTED
+    assert transcript.audio_duration == SECONDS
+
+
+def test_create_split_merges_the_segment_transcripts(fake, wav_path):
+    client = Client("key", transport=transcribing(fake))
+    transcript = client.transcript.create_split(wav_path, Transcript(speaker_labels=True), segment_ms=6000, overlap_ms=1000)
+
+    assert transcript.status == TranscriptStatus.completed and transcript.id is None
+    assert fake.requests[("POST", "transcript")] == 4
+    check_words(transcript)
+    assert [w.text for u in transcript.utterances for w in u.words] == EXPECTED
+    assert len({e.text for e in transcript.entities}) == len(transcript.entities)
+    assert all(a.end <= b.start for a, b in zip(transcript.chapters, transcript.chapters[1:]))
+
+
+def test_create_split_without_features(fake, wav_path):
+    # Segment transcripts of a plain Transcript() have no utterances, entities or chapters.
+    client = Client("key", transport=transcribing(fake, features=False))
+    transcript = client.transcript.create_split(wav_path, segment_ms=6000, overlap_ms=1000)
+
+    check_words(transcript)
+    assert transcript.utterances is None and transcript.entities is None and transcript.chapters is None
+
+
+def test_create_split_of_raw_pcm(fake, tmp_path, samples):
+    path = str(tmp_path / "a.pcm")
+    with open(path, "wb") as f:
+        f.write(samples.tobytes())
+    client = Client("key", transport=transcribing(fake))
+
+    with pytest.raises(ValueError):
+        client.transcript.create_split(path)
+    check_words(client.transcript.create_split(path, audio_format=AudioFormat(RATE, 2, 1), segment_ms=7000, overlap_ms=1500))
+
+
+def test_async_create_split(fake, wav_path):
+    async def main():
+        client = AsyncClient("key", transport=transcribing(fake, features=False))
+        try:
+            return await client.transcript.create_split(wav_path, segment_ms=5000, overlap_ms=1000)
+        finally:
+            await client.aclose()
+
+    check_words(asyncio.run(main()))
+
+
+def test_plan_segments(wav_path):
+    source = AudioSource.open(wav_path)
+    segments = plan_segments(source, 6000, 1000)
+    assert [(s.start_ms, s.end_ms) for s in segments] == [(0, 6000), (5000, 11000), (10000, 16000), (15000, 20000)]
+    assert sum(s.frames for s in segments) - 3 * RATE == source.frames
+
+    with pytest.raises(ValueError):
+        plan_segments(source, 1000, 1000)
+    with pytest.raises(ValueError):
+        plan_segments(AudioSource(wav_path, AudioFormat(1, 2, 1), 10, True), 1500, 1000)
+
+
+def test_wav_header_checks_the_size_limit():
+    assert len(wav_header(AudioFormat(RATE, 2, 1), RATE)) == 44
+    with pytest.raises(ValueError):
+        wav_header(AudioFormat(RATE, 2, 1), 1 << 31)
+
+
+def test_merge_requires_completed_transcripts():
+    segments = [Segment(0, 0, RATE, 0, 1000)]
+    with pytest.raises(ValueError):
+        merge([Transcript(id="t", status=TranscriptStatus.processing)], segments)
+    with pytest.raises(ValueError):
+        merge([], segments)
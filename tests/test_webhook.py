@@ -0,0 +1,195 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+
+import httpx
+import pytest
+
+from assemblyai.model import Transcript, TranscriptStatus
+from assemblyai.poller import AdaptiveBackoff, TranscriptPoller
+from assemblyai.webhook import WebhookReceiver
+
+
+@pytest.fixture
+def receiver(client):
+    receiver = WebhookReceiver(client.transcript, fallback_after=None)
+    yield receiver
+    receiver.close()
+
+
+def create(client, webhook_url=None):
+    return client.transcript.create(Transcript(audio_url="https://example.org/a.mp3", webhook_url=webhook_url)).id
+
+
+def test_served_webhooks_resolve_expected_transcripts(fake, client):
+    receiver = WebhookReceiver(client.transcript, fallback_after=None, auth_header=("x-webhook-secret", "s3cret"))
+    host, port = receiver.serve()
+    fake.webhook_sender = lambda url, payload: httpx.post(url, json=payload, headers={"x-webhook-secret": "s3cret"})
+    try:
+        transcript_id = create(client, webhook_url=f"http://{host}:{port}/webhook")
+        received = []
+        future = receiver.expect(transcript_id, callback=received.append)
+        fake.complete(transcript_id, text="hello")
+
+        transcript = future.result(timeout=5)
+        assert transcript.text == "hello" and received == [transcript]
+        assert receiver.pending == []
+    finally:
+        receiver.close()
+
+
+def test_errored_transcripts_resolve_too(fake, client, receiver):
+    transcript_id = create(client)
+    future = receiver.expect(transcript_id)
+    fake.fail(transcript_id)
+    assert receiver.handle({"transcript_id": transcript_id, "status": "error"})
+    assert future.result(timeout=5).status == TranscriptStatus.error
+
+
+def test_webhook_before_expect_is_buffered(fake, client, receiver):
+    transcript_id = create(client)
+    fake.complete(transcript_id, text="early")
+    assert not receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+
+    assert receiver.expect(transcript_id).result(timeout=5).text == "early"
+
+
+def test_buffered_webhooks_are_bounded(client):
+    receiver = WebhookReceiver(client.transcript, fallback_after=None, max_unmatched=2)
+    for transcript_id in ("a", "b", "c"):
+        receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+    assert list(receiver._unmatched) == ["b", "c"]
+    receiver.close()
+
+
+def test_non_final_statuses_are_ignored(fake, client, receiver):
+    transcript_id = create(client)
+    future = receiver.expect(transcript_id)
+    assert not receiver.handle({"transcript_id": transcript_id, "status": "processing"})
+    assert not future.done() and receiver.pending == [transcript_id]
+
+
+def test_handle_request_checks_auth_and_body(client):
+    receiver = WebhookReceiver(client.transcript, fallback_after=None, auth_header=("x-webhook-secret", "s3cret"))
+    body = json.dumps({"transcript_id": "t", "status": "completed"}).encode()
+    assert receiver.handle_request(body, {}) == 401
+    assert receiver.handle_request(b"not json", {"x-webhook-secret": "s3cret"}) == 400
+    assert receiver.handle_request(b"[]", {"x-webhook-secret": "s3cret"}) == 400
+    assert receiver.handle_request(body, {"x-webhook-secret": "s3cret"}) == 200
+    receiver.close()
+
+
+def test_asgi_app(fake, client, receiver):
+    transcript_id = create(client)
+    future = receiver.expect(transcript_id)
+    fake.complete(transcript_id, text="via asgi")
+    body = json.dumps({"transcript_id": transcript_id, "status": "completed"}).encode()
+    sent = []
+
+    async def call():
+        messages = [{"type": "http.request", "body": body[:10], "more_body": True}, {"type": "http.request", "body": body[10:]}]
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        await receiver({"type": "http", "method": "POST", "headers": []}, receive, send)
+
+    asyncio.run(call())
+    assert sent[0]["status"] == 200
+    assert future.result(timeout=5).text == "via asgi"
+
+
+def test_transcripts_without_webhook_fall_back_to_polling(fake, client):
+    poller = TranscriptPoller(client.transcript, backoff=AdaptiveBackoff(min_interval=0.01))
+    receiver = WebhookReceiver(client.transcript, fallback_after=0.05, fallback_interval=0.01, poller=poller)
+    receiver.start()
+    try:
+        transcript_id = create(client)
+        future = receiver.expect(transcript_id)
+        fake.complete(transcript_id, text="polled")
+        assert future.result(timeout=5).text == "polled"
+    finally:
+        receiver.close()
+
+
+def test_webhook_arriving_while_polling_resolves_once(fake, client):
+    poller = TranscriptPoller(client.transcript, backoff=AdaptiveBackoff(min_interval=10))
+    receiver = WebhookReceiver(client.transcript, fallback_after=0.0, fallback_interval=0.01, poller=poller)
+    receiver.start()
+    try:
+        transcript_id = create(client)
+        received = []
+        future = receiver.expect(transcript_id, callback=received.append)
+        while poller.pending != [transcript_id]:
+            time.sleep(0.01)
+        fake.complete(transcript_id, text="pushed")
+        assert receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+
+        assert future.result(timeout=5).text == "pushed"
+        assert len(received) == 1 and poller.pending == []
+    finally:
+        receiver.close()
+
+
+def test_receiver_can_be_restarted(fake, client, receiver):
+    receiver.start()
+    receiver.stop()
+    transcript_id = create(client)
+    future = receiver.expect(transcript_id)
+    fake.complete(transcript_id)
+    assert receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+    assert future.result(timeout=5).status == TranscriptStatus.completed
+
+
+def test_failing_callbacks_are_logged(fake, client, receiver, caplog):
+    transcript_id = create(client)
+    received = []
+
+    def fail(transcript):
+        raise RuntimeError("callback failed")
+
+    future = receiver.expect(transcript_id, callback=fail)
+    receiver.expect(transcript_id, callback=received.append)
+    fake.complete(transcript_id)
+    with caplog.at_level(logging.ERROR, logger="assemblyai.webhook"):
+        receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+        future.result(timeout=5)
+        receiver.stop()
+
+    assert len(received) == 1
+    assert any(r.exc_info and isinstance(r.exc_info[1], RuntimeError) for r in caplog.records)
+
+
+def test_lifespan_shutdown_does_not_block_the_event_loop(fake, client):
+    release = threading.Event()
+    receiver = WebhookReceiver(client.transcript, fallback_after=None)
+    transcript_id = create(client)
+    receiver.expect(transcript_id, callback=lambda transcript: release.wait(5))
+    fake.complete(transcript_id)
+    receiver.handle({"transcript_id": transcript_id, "status": "completed"})
+
+    async def lifespan():
+        messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message["type"])
+
+        shutdown = asyncio.ensure_future(receiver({"type": "lifespan"}, receive, send))
+        # The loop keeps running while shutdown waits for the blocked callback.
+        await asyncio.sleep(0.1)
+        assert not shutdown.done()
+        release.set()
+        await asyncio.wait_for(shutdown, 5)
+        return sent
+
+    assert asyncio.run(lifespan()) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    receiver.close()